@@ -0,0 +1,48 @@
+"""Benchmark the shared mlflow client against a new client per call.
+
+Run against a tracking server, e.g., `mlflow server --port 5000`:
+
+    python benchmarks/clients.py --tracking-uri http://127.0.0.1:5000
+"""
+
+# %% IMPORTS
+
+import argparse
+import json
+import time
+
+import mlflow
+
+from {{cookiecutter.package}}.services import shared_client
+
+# %% PARSERS
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("--tracking-uri", default="http://127.0.0.1:5000", help="Tracking server.")
+parser.add_argument("-n", "--calls", type=int, default=500, help="Number of calls per client.")
+
+# %% BENCHMARKS
+
+
+def main() -> None:
+    """Log metrics with a new client per call, then with the shared client."""
+    args = parser.parse_args()
+    mlflow.set_tracking_uri(args.tracking_uri)
+    experiment = mlflow.set_experiment("benchmarks")
+    run_id = shared_client().create_run(experiment_id=experiment.experiment_id).info.run_id
+    clients = {
+        "new_client": lambda: mlflow.MlflowClient(tracking_uri=args.tracking_uri),
+        "shared_client": lambda: shared_client(tracking_uri=args.tracking_uri),
+    }
+    stats = {}
+    for name, client in clients.items():
+        start = time.perf_counter()
+        for step in range(args.calls):
+            client().log_metric(run_id, key=name, value=step, step=step)
+        elapsed = time.perf_counter() - start
+        stats[name] = {"calls_per_second": args.calls / elapsed, "seconds": elapsed}
+    print(json.dumps(stats, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark the memory of a training job in lean and default modes.
+
+Each mode runs in a fresh process on the same synthetic dataset:
+
+    python benchmarks/lean.py --rows 1000000
+
+Results on Linux (peak RSS in MB, default vs lean):
+- 1M rows: 506 vs 436 (-70)
+- 2M rows: 630 vs 526 (-104)
+"""
+
+# %% IMPORTS
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# %% PARSERS
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("-n", "--rows", type=int, default=1_000_000, help="Rows of the dataset.")
+parser.add_argument("--run", choices=["lean", "default"], help=argparse.SUPPRESS)
+parser.add_argument("--directory", help=argparse.SUPPRESS)
+
+# %% BENCHMARKS
+
+
+def dataset(directory: str, rows: int) -> None:
+    """Write a synthetic dataset following the example schemas.
+
+    Args:
+        directory (str): directory of the inputs.csv and targets.csv files.
+        rows (int): number of rows.
+    """
+    rng = np.random.default_rng(42)
+    index = pd.RangeIndex(rows, name="index")
+    inputs = pd.DataFrame(
+        {
+            "A": rng.random(rows),
+            "B": rng.integers(0, 1000, rows),
+            "C": [f"string_{i % 1000}" for i in range(rows)],
+            "D": rng.integers(0, 1000, rows),
+        },
+        index=index,
+    )
+    inputs.to_csv(os.path.join(directory, "inputs.csv"))
+    targets = pd.DataFrame({"target": rng.integers(0, 2, rows)}, index=index)
+    targets.to_csv(os.path.join(directory, "targets.csv"))
+
+
+def run(directory: str, lean: bool) -> dict[str, float]:
+    """Run a training job and measure its memory.
+
+    Args:
+        directory (str): directory of the dataset and of the mlflow store.
+        lean (bool): run the job in lean mode.
+
+    Returns:
+        dict[str, float]: peak memory of the run, and memory held by its outcome (in MB).
+    """
+    import psutil
+
+    from {{cookiecutter.package}}.io import ExampleReader
+    from {{cookiecutter.package}}.jobs import TrainingJob
+    from {{cookiecutter.package}}.jobs._stages import peak_rss
+    from {{cookiecutter.package}}.services import MlflowService
+
+    uri = os.path.join(directory, "mlruns")
+    job = TrainingJob(
+        inputs=ExampleReader(path=os.path.join(directory, "inputs.csv")),
+        targets=ExampleReader(path=os.path.join(directory, "targets.csv")),
+        mlflow_service=MlflowService(tracking_uri=uri, registry_uri=uri),
+        lean=lean,
+    )
+    with job as runner:
+        runner.run()
+    held = psutil.Process().memory_info().rss / 2**20  # memory kept after the run
+    return {"peak_rss": peak_rss(), "rss_after_run": held}
+
+
+def main() -> None:
+    """Run the training job in each mode, then compare their memory."""
+    args = parser.parse_args()
+    if args.run is not None:  # child process of a mode
+        print(json.dumps(run(directory=args.directory, lean=args.run == "lean")))
+        return
+    stats = {}
+    with tempfile.TemporaryDirectory(prefix="lean-") as directory:
+        dataset(directory=directory, rows=args.rows)
+        for mode in ["default", "lean"]:
+            command = [sys.executable, __file__, "--run", mode, "--directory", directory]
+            process = subprocess.run(command, stdout=subprocess.PIPE, text=True, check=True)
+            stats[mode] = json.loads(process.stdout.splitlines()[-1])
+    stats["saved_mb"] = {key: stats["default"][key] - stats["lean"][key] for key in stats["lean"]}
+    print(json.dumps(stats, indent=4))
+
+
+if __name__ == "__main__":
+    main()
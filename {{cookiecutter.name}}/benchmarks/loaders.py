@@ -0,0 +1,65 @@
+"""Benchmark the predictions of a builtin model adapter on small requests.
+
+The adapter used to rebuild the output columns on each prediction:
+
+    python benchmarks/loaders.py --rows 1
+"""
+
+# %% IMPORTS
+
+import argparse
+import json
+import timeit
+import typing as T
+
+import numpy as np
+import pandas as pd
+
+from {{cookiecutter.package}}.io.schemas import Outputs, OutputsSchema
+from {{cookiecutter.package}}.registries import BuiltinLoader
+
+# %% PARSERS
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("-n", "--rows", type=int, default=1, help="Rows per prediction.")
+parser.add_argument("-r", "--repeat", type=int, default=1000, help="Predictions per benchmark.")
+
+# %% MODELS
+
+
+class Model:
+    """Stand-in for an mlflow pyfunc model, to time the adapter only."""
+
+    def predict(self, data: pd.DataFrame) -> T.Any:
+        return np.zeros(len(data), dtype=np.uint32)
+
+
+# %% BENCHMARKS
+
+
+def main() -> None:
+    """Time the previous prediction path, then the adapter predict and predict_array."""
+    args = parser.parse_args()
+    inputs = pd.DataFrame({"A": np.ones(args.rows)})
+    adapter = BuiltinLoader.Adapter(model=T.cast(T.Any, Model()))
+
+    def previous() -> Outputs:
+        """Predict as before: rebuild the columns and copy the outputs on each call."""
+        outputs = adapter.model.predict(data=inputs)
+        columns = list(OutputsSchema.to_schema().columns)
+        return Outputs(outputs, columns=columns, index=inputs.index)
+
+    functions = {
+        "previous": previous,
+        "predict": lambda: adapter.predict(inputs=inputs),
+        "predict_array": lambda: adapter.predict_array(inputs=inputs),
+    }
+    stats = {}
+    for name, function in functions.items():
+        seconds = timeit.timeit(function, number=args.repeat) / args.repeat
+        stats[name] = {"us_per_call": seconds * 1e6}
+    print(json.dumps(stats, indent=4))
+
+
+if __name__ == "__main__":
+    main()
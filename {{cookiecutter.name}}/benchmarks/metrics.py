@@ -0,0 +1,143 @@
+"""Benchmark the mlflow metric adapter with arrays against dataframes.
+
+The adapter used to rebuild the targets and outputs dataframes on each call:
+
+    python benchmarks/metrics.py --rows 100000
+
+Time full `mlflow.evaluate` calls with the metric as an extra metric:
+
+    python benchmarks/metrics.py --rows 100000 --repeat 5 --evaluate
+"""
+
+# %% IMPORTS
+
+import argparse
+import json
+import tempfile
+import timeit
+import typing as T
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from {{cookiecutter.package}}.io.schemas import Outputs, OutputsSchema, Targets, TargetsSchema
+from {{cookiecutter.package}}.metrics import Metric
+from {{cookiecutter.package}}.metrics._base import Scores
+
+# %% PARSERS
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("-n", "--rows", type=int, default=100_000, help="Rows per evaluation.")
+parser.add_argument("-r", "--repeat", type=int, default=100, help="Evaluations per benchmark.")
+parser.add_argument("--evaluate", action="store_true", help="Time mlflow.evaluate calls.")
+
+# %% METRICS
+
+
+class MeanAbsoluteError(Metric):
+    """Mean absolute error, scored on dataframes or on batches of arrays."""
+
+    KIND: T.Literal["MeanAbsoluteError"] = "MeanAbsoluteError"
+
+    name: str = "mae"
+    greater_is_better: bool = False
+
+    def score(self, targets: Targets, outputs: Outputs) -> float:
+        errors = targets[TargetsSchema.target] - outputs[OutputsSchema.prediction]
+        return float(errors.abs().mean())
+
+    def scores(self, targets: npt.NDArray, outputs: npt.NDArray) -> Scores:
+        return np.abs(targets - outputs).mean(axis=1)
+
+
+# %% BENCHMARKS
+
+
+def evaluate(metric: Metric, data: pd.DataFrame, repeat: int) -> dict[str, T.Any]:
+    """Time mlflow.evaluate with the metric before and after the adapter change.
+
+    Args:
+        metric (Metric): metric to pass as an extra metric.
+        data (pd.DataFrame): dataset with target and prediction columns.
+        repeat (int): evaluations per benchmark.
+
+    Returns:
+        dict[str, T.Any]: timings of each path.
+    """
+    import mlflow
+    from mlflow.metrics import MetricValue
+
+    def eval_fn(predictions: pd.Series, targets: pd.Series) -> MetricValue:
+        """Evaluation function as before: rebuild the dataframes on each call."""
+        score_targets = Targets({TargetsSchema.target: targets}, index=targets.index)
+        score_outputs = Outputs({OutputsSchema.prediction: predictions}, index=predictions.index)
+        score = metric.score(targets=score_targets, outputs=score_outputs)
+        return MetricValue(aggregate_results={metric.name: -score})
+
+    metrics = {
+        "frames": mlflow.metrics.make_metric(
+            eval_fn=eval_fn, name=metric.name, greater_is_better=metric.greater_is_better
+        ),
+        "arrays": metric.to_mlflow(),
+    }
+    stats: dict[str, T.Any] = {}
+    with tempfile.TemporaryDirectory() as tracking:
+        mlflow.set_tracking_uri(f"file://{tracking}")
+        mlflow.set_experiment(experiment_name="benchmark")
+        for name, mlflow_metric in metrics.items():
+
+            def call() -> float:
+                """Evaluate the static dataset in a new run."""
+                with mlflow.start_run():
+                    results = mlflow.evaluate(
+                        data=data,
+                        targets=TargetsSchema.target,
+                        predictions=OutputsSchema.prediction,
+                        extra_metrics=[mlflow_metric],
+                    )
+                return results.metrics[metric.name]
+
+            score = call()  # warm up and check the path
+            seconds = timeit.timeit(call, number=repeat) / repeat
+            stats[name] = {"ms_per_call": seconds * 1000, "score": score}
+    stats["speedup"] = stats["frames"]["ms_per_call"] / stats["arrays"]["ms_per_call"]
+    return stats
+
+
+def main() -> None:
+    """Time the evaluation function with arrays, then with dataframes."""
+    args = parser.parse_args()
+    rng = np.random.default_rng(42)
+    targets = pd.Series(rng.integers(0, 100, args.rows))
+    predictions = pd.Series(rng.integers(0, 100, args.rows))
+    metric = MeanAbsoluteError()
+    if args.evaluate:
+        data = pd.DataFrame(
+            {TargetsSchema.target: targets, OutputsSchema.prediction: predictions}
+        )
+        print(json.dumps(evaluate(metric, data=data, repeat=args.repeat), indent=4))
+        return
+    eval_fn = metric.to_mlflow().eval_fn
+
+    def frames() -> float:
+        """Score as before: rebuild the dataframes on each call."""
+        score_targets = Targets({TargetsSchema.target: targets}, index=targets.index)
+        score_outputs = Outputs({OutputsSchema.prediction: predictions}, index=predictions.index)
+        return metric.score(targets=score_targets, outputs=score_outputs)
+
+    def arrays() -> float:
+        """Score with the adapter: pass views of the arrays."""
+        return -eval_fn(predictions, targets).aggregate_results[metric.name]
+
+    assert np.isclose(frames(), arrays()), "Both paths should give the same score!"
+    stats = {}
+    for name, function in {"frames": frames, "arrays": arrays}.items():
+        seconds = timeit.timeit(function, number=args.repeat) / args.repeat
+        stats[name] = {"ms_per_call": seconds * 1000}
+    stats["speedup"] = stats["frames"]["ms_per_call"] / stats["arrays"]["ms_per_call"]
+    print(json.dumps(stats, indent=4))
+
+
+if __name__ == "__main__":
+    main()
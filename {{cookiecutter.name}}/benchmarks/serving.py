@@ -0,0 +1,104 @@
+"""Benchmark a serving job with concurrent prediction requests.
+
+Start a serving job, then send the requests to its predict route:
+
+    python benchmarks/serving.py data/input.csv --requests 1000 --concurrency 32
+"""
+
+# %% IMPORTS
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import urllib.parse
+
+import pandas as pd
+
+from {{cookiecutter.package}}.jobs._serving import Stats, latencies
+
+# %% PARSERS
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+parser.add_argument("inputs", help="CSV file of the inputs sent (with an index column).")
+parser.add_argument(
+    "-u", "--url", default="http://127.0.0.1:8000/predict", help="URL of the predict route."
+)
+parser.add_argument("-n", "--requests", type=int, default=1000, help="Total number of requests.")
+parser.add_argument(
+    "-c", "--concurrency", type=int, default=32, help="Number of concurrent clients."
+)
+parser.add_argument("--rows", type=int, default=1, help="Number of rows per request.")
+
+# %% BENCHMARKS
+
+
+async def load_test(url: str, body: bytes, requests: int, concurrency: int) -> Stats:
+    """Send concurrent prediction requests to a server and measure its latencies.
+
+    Each client sends its requests one after the other on a keep-alive connection.
+
+    Args:
+        url (str): URL of the predict route (e.g., http://127.0.0.1:8000/predict).
+        body (bytes): JSON body of each request.
+        requests (int): total number of requests.
+        concurrency (int): number of concurrent clients.
+
+    Returns:
+        Stats: requests, errors, p50/p99 latencies (in ms), and throughput (requests per second).
+    """
+    parts = urllib.parse.urlsplit(url)
+    request = (
+        f"POST {parts.path or '/'} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    durations: list[float] = []
+    errors = 0
+
+    async def client(count: int) -> None:
+        """Send a number of requests on a connection."""
+        nonlocal errors
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                writer.write(request)
+                await writer.drain()
+                status = await reader.readline()
+                length = 0
+                while (header := await reader.readline()) not in (b"\r\n", b""):
+                    key, _, value = header.decode().partition(":")
+                    if key.strip().lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                if b" 200 " in status:
+                    durations.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+        finally:
+            writer.close()
+
+    counts = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    start = time.perf_counter()
+    await asyncio.gather(*(client(count) for count in counts if count))
+    stats = latencies(durations=durations, elapsed=time.perf_counter() - start)
+    stats["errors"] = errors
+    return stats
+
+
+def main() -> int:
+    """Measure the latencies and throughput of a server."""
+    args = parser.parse_args()
+    inputs = pd.read_csv(args.inputs, index_col="index", nrows=args.rows)
+    body = inputs.to_json(orient="split").encode()
+    stats = asyncio.run(
+        load_test(url=args.url, body=body, requests=args.requests, concurrency=args.concurrency)
+    )
+    json.dump(stats, sys.stdout, indent=4)
+    return int(stats["errors"] > 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,8 @@
 from .example import ExampleReader, ExampleWriter
 from .configs import Config
+from ._base import Sampler, digest, share_reads
 
 ReaderKind = ExampleReader
 WriterKind = ExampleWriter
 
-__all__ = ["Config", "ExampleReader", "ExampleWriter"]
+__all__ = ["Config", "Sampler", "ExampleReader", "ExampleWriter", "digest", "share_reads"]
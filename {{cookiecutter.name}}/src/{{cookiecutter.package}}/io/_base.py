@@ -3,18 +3,125 @@
 # %% IMPORTS
 
 import abc
+import collections
+import hashlib
 import typing as T
 import numpy as np
 import numpy.typing as npt
 import pandas as pd
 import pydantic as pdt
 import pandera.typing as papd
-import mlflow.data.pandas_dataset as lineage
 import pandera as pa
 
+if T.TYPE_CHECKING:  # mlflow is imported lazily
+    import mlflow.data.pandas_dataset as lineage
+
 
 # %% TYPINGS
-Lineage: T.TypeAlias = lineage.PandasDataset
+Lineage: T.TypeAlias = "lineage.PandasDataset"
+
+# %% HELPERS
+
+
+def digest(data: pd.DataFrame, chunksize: int = 100_000) -> str:
+    """Compute a content digest of a dataframe.
+
+    Rows are hashed with vectorized pandas operations, one chunk at a time.
+
+    Args:
+        data (pd.DataFrame): dataframe to digest.
+        chunksize (int): number of rows hashed per chunk.
+
+    Returns:
+        str: hexadecimal digest of the dataframe.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr(data.dtypes.to_dict()).encode())
+    for start in range(0, len(data), chunksize):
+        chunk = data.iloc[start : start + chunksize]
+        hashes = pd.util.hash_pandas_object(chunk, index=True)
+        hasher.update(hashes.to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+# %% SAMPLERS
+
+# Generic type for a dataframe to sample
+TFrame = T.TypeVar("TFrame", bound=pd.DataFrame)
+
+
+class Sampler(pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
+    """Sample a bounded number of rows from a dataframe.
+
+    Use a sampler to bound the cost of an operation on a dataset.
+    e.g., model signature inference or input example serialization.
+
+    Parameters:
+        size (int): maximum number of rows to sample.
+        method (str): first rows (head), random rows, or stratified rows on a column.
+        column (str | None): column of the strata for the stratified method.
+        random_state (int): random seed of the random and stratified methods.
+    """
+
+    size: int = pdt.Field(default=1000, gt=0)
+    method: T.Literal["head", "random", "stratified"] = "head"
+    column: str | None = None
+    random_state: int = 42
+
+    def sample(self, data: TFrame) -> TFrame:
+        """Sample the rows of a dataframe.
+
+        The stratified method falls back to random rows if the column is not in the data.
+        Its rows are allocated to the strata by largest remainder: i.e., exactly `size` rows.
+
+        Args:
+            data (TFrame): dataframe to sample.
+
+        Returns:
+            TFrame: sample of the dataframe (the dataframe itself if small enough).
+        """
+        if len(data) <= self.size:
+            return data
+        if self.method == "head":
+            return T.cast(TFrame, data.head(self.size))
+        if self.method == "stratified" and self.column in data.columns:
+            strata = data[self.column].reset_index(drop=True)  # by row position
+            counts = strata.value_counts(sort=False)
+            quotas = counts * self.size / counts.sum()
+            sizes = np.floor(quotas).astype(int)
+            remainders = (quotas - sizes).sort_values(ascending=False, kind="stable")
+            sizes[remainders.index[: self.size - sizes.sum()]] += 1
+            shuffled = strata.sample(frac=1.0, random_state=self.random_state)
+            keep = shuffled.groupby(shuffled).cumcount() < shuffled.map(sizes)
+            return T.cast(TFrame, data.iloc[np.sort(keep.index[keep])])
+        return T.cast(TFrame, data.sample(n=self.size, random_state=self.random_state))
+
+
+# %% CACHES
+
+# Datasets read by the jobs of a batch, by reader config, least recently used first
+_SHARED: collections.OrderedDict[str, pd.DataFrame] | None = None
+# Maximum memory of the shared datasets (in bytes)
+_SHARED_BYTES = 2**30
+# Fingerprints of the datasets shared by the jobs of a batch, by reader config
+_FINGERPRINTS: dict[str, str] = {}
+
+
+def share_reads(enable: bool = True, max_bytes: int = 2**30) -> None:
+    """Share the datasets read between the next jobs of the process.
+
+    e.g., for a batch of jobs reading the same inputs and targets.
+    The least recently used datasets are evicted above the memory limit.
+
+    Args:
+        enable (bool): enable (and clear) or disable the shared datasets.
+        max_bytes (int): maximum memory of the shared datasets (in bytes).
+    """
+    global _SHARED, _SHARED_BYTES
+    _SHARED = collections.OrderedDict() if enable else None
+    _SHARED_BYTES = max_bytes
+    _FINGERPRINTS.clear()
+
 
 # %% READERS
 
@@ -27,11 +134,13 @@ class Reader(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
 
     Parameters:
         limit (int, optional): maximum number of rows to read. Defaults to None.
+        sampler (Sampler | None): sampler of the lineage profile (whole dataset if None).
     """
 
     KIND: str
 
     limit: int | None = None
+    sampler: Sampler | None = Sampler()
 
     @abc.abstractmethod
     def read(self) -> pd.DataFrame:
@@ -41,6 +150,68 @@ class Reader(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
             pd.DataFrame: dataframe representation.
         """
 
+    def read_shared(self) -> pd.DataFrame:
+        """Read a dataframe, or copy it from the datasets shared by the jobs of a batch.
+
+        Returns:
+            pd.DataFrame: dataframe representation.
+        """
+        if _SHARED is None:
+            return self.read()
+        key = self._key()
+        if key in _SHARED:
+            _SHARED.move_to_end(key)
+            return _SHARED[key].copy()  # the jobs can modify their data
+        data = self.read()
+        _SHARED[key] = data
+        sizes = {key: int(data.memory_usage(deep=True).sum()) for key, data in _SHARED.items()}
+        while len(_SHARED) > 1 and sum(sizes.values()) > _SHARED_BYTES:
+            evicted, _ = _SHARED.popitem(last=False)
+            del sizes[evicted]
+        return data.copy()
+
+    def fingerprint(self, data: pd.DataFrame) -> str:
+        """Compute the content digest of the dataframe read, once per shared dataset.
+
+        Override this method to derive the digest from the source metadata instead.
+        e.g., the size and modification time of a file.
+
+        Args:
+            data (pd.DataFrame): dataframe read.
+
+        Returns:
+            str: content digest of the dataset.
+        """
+        if _SHARED is None:
+            return digest(data)
+        key = self._key()
+        if key not in _FINGERPRINTS:
+            _FINGERPRINTS[key] = digest(data)
+        return _FINGERPRINTS[key]
+
+    def _key(self) -> str:
+        """Get the key of the reader in the shared datasets.
+
+        Returns:
+            str: reader kind and config.
+        """
+        return f"{self.KIND}:{self.model_dump_json()}"
+
+    def read_chunks(self, chunksize: int) -> T.Iterator[pd.DataFrame]:
+        """Read a dataframe from a dataset, one chunk of rows at a time.
+
+        Override this method to stream the dataset instead of reading it at once.
+
+        Args:
+            chunksize (int): number of rows per chunk.
+
+        Returns:
+            T.Iterator[pd.DataFrame]: chunks of the dataframe.
+        """
+        data = self.read()
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start : start + chunksize]
+
     @abc.abstractmethod
     def lineage(
         self,
@@ -48,14 +219,18 @@ class Reader(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
         data: pd.DataFrame,
         targets: str | None = None,
         predictions: str | None = None,
+        digest: str | None = None,
     ) -> Lineage:
         """Generate lineage information.
 
+        With a sampler, the schema and profile are computed on a sample of the dataframe.
+
         Args:
             name (str): dataset name.
             data (pd.DataFrame): reader dataframe.
             targets (str | None): name of the target column.
             predictions (str | None): name of the prediction column.
+            digest (str | None): content digest of the dataset (e.g., from fingerprint).
 
         Returns:
             Lineage: lineage information.
@@ -82,6 +257,16 @@ class Writer(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
             data (pd.DataFrame): dataframe representation.
         """
 
+    def write_chunks(self, chunks: T.Iterable[pd.DataFrame]) -> None:
+        """Write a dataframe to a dataset, one chunk of rows at a time.
+
+        Override this method to stream the chunks instead of writing them at once.
+
+        Args:
+            chunks (T.Iterable[pd.DataFrame]): chunks of the dataframe.
+        """
+        self.write(data=pd.concat(list(chunks)))
+
 
 # %% SCHEMAS
 
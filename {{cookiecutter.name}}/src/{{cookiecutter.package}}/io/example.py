@@ -1,7 +1,8 @@
+import hashlib
 import os
 import typing as T
 import pandas as pd
-from ._base import Reader, Lineage, lineage
+from ._base import Reader, Lineage
 from ._base import Writer
 
 
@@ -44,15 +45,35 @@ class ExampleReader(Reader):
             data = data.head(self.limit)
         return data
 
+    def read_chunks(self, chunksize: int) -> T.Iterator[pd.DataFrame]:
+        if not os.path.exists(self.path):
+            self.create_input()
+            self.create_target()
+        yield from pd.read_csv(
+            self.path, index_col="index", chunksize=chunksize, nrows=self.limit
+        )
+
+    def fingerprint(self, data: pd.DataFrame) -> str:
+        # the file metadata changes with its content: no need to hash the data
+        stat = os.stat(self.path)
+        text = f"{self.path}:{stat.st_size}:{stat.st_mtime_ns}:{self.limit}"
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
     def lineage(
         self,
         name: str,
         data: pd.DataFrame,
         targets: str | None = None,
         predictions: str | None = None,
+        digest: str | None = None,
     ) -> Lineage:
+        import mlflow.data.pandas_dataset as lineage
+
+        if self.sampler is not None:  # profile a sample of the data
+            digest = digest or self.fingerprint(data)
+            data = self.sampler.sample(data)
         return lineage.from_pandas(
-            data, name=name, targets=targets, predictions=predictions
+            data, name=name, targets=targets, predictions=predictions, digest=digest
         )
 
 
@@ -64,6 +85,7 @@ class ExampleWriter(Writer):
     """
 
     KIND: T.Literal["ExampleWriter"] = "ExampleWriter"
+    path: str
 
     def write(self, data: pd.DataFrame) -> None:
         """Write a dataframe to a dataset.
@@ -72,3 +94,14 @@ class ExampleWriter(Writer):
             data (pd.DataFrame): dataframe representation.
         """
         data.to_csv(self.path, index=False)
+
+    def write_chunks(self, chunks: T.Iterable[pd.DataFrame]) -> None:
+        """Append the chunks of a dataframe to a dataset.
+
+        Args:
+            chunks (T.Iterable[pd.DataFrame]): chunks of the dataframe.
+        """
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(self.path, index=False, mode="w" if header else "a", header=header)
+            header = False
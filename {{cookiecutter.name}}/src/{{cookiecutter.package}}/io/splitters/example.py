@@ -1,7 +1,6 @@
 import typing as T
 from .._base import Splitter, TrainTestSplits, Index
 from ..schemas import Inputs, Targets
-from sklearn import model_selection
 import numpy as np
 
 
@@ -19,6 +18,8 @@ class ExampleSplitter(Splitter):
         targets: Targets,
         groups: Index | None = None,
     ) -> TrainTestSplits:
+        from sklearn import model_selection
+
         index = np.arange(len(inputs))
         train_index, test_index = model_selection.train_test_split(
             index,
@@ -1,7 +1,10 @@
 from .training import TrainingJob
 from .tuning import TuningJob
+from .inference import InferenceJob
+from .serving import ServingJob
 from ._base import Job
+from ._batch import Batch
 
-JobKind = TrainingJob | TuningJob 
+JobKind = TrainingJob | TuningJob | InferenceJob | ServingJob
 
-__all__ = ["TrainingJob", "TuningJob", "JobKind", "Job" ]
+__all__ = ["TrainingJob", "TuningJob", "InferenceJob", "ServingJob", "JobKind", "Job", "Batch" ]
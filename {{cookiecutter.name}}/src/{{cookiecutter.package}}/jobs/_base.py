@@ -3,18 +3,16 @@
 # %% IMPORTS
 
 import abc
+import contextlib as ctx
 import types as TS
 import typing as T
 
 import pydantic as pdt
-from ..services import MlflowService, LoggerService, AlertsService
+from ..services import MlflowService, LoggerService, AlertsService, Service
+from ._stages import Profiler, peak_rss
 import platform
-import psutil
-import torch
 import os
-import mlflow
 import json
-import pyperclip
 
 # %% TYPES
 
@@ -34,6 +32,8 @@ class Job(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
         logger_service (LoggerService): manage the logger system.
         alerts_service (AlertsService): manage the alerts system.
         mlflow_service (MlflowService): manage the mlflow system.
+        profiler (Profiler | None): measure the time and memory of the job steps.
+        lean (bool): release the intermediate data early and return a compact summary.
     """
 
     KIND: str
@@ -41,6 +41,8 @@ class Job(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
     logger_service: LoggerService = LoggerService()
     alerts_service: AlertsService = AlertsService()
     mlflow_service: MlflowService = MlflowService()
+    profiler: Profiler | None = None
+    lean: bool = False
 
     def __enter__(self) -> T.Self:
         """Enter the job context.
@@ -66,24 +68,57 @@ class Job(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
     ) -> T.Literal[False]:
         """Exit the job context.
 
+        The services are all stopped, even if one of them fails to stop.
+        While the job raises, an error of the mlflow service is logged instead.
+
         Args:
             exc_type (T.Type[BaseException] | None): ignored.
-            exc_value (BaseException | None): ignored.
+            exc_value (BaseException | None): exception raised by the job, if any.
             exc_traceback (TS.TracebackType | None): ignored.
 
         Returns:
             T.Literal[False]: always propagate exceptions.
         """
         logger = self.logger_service.logger()
-        logger.debug("\033[91m[STOP]\033[0m Mlflow service: {}", self.mlflow_service)
-        self.mlflow_service.stop()
-        logger.debug("\033[91m[STOP]\033[0m Alerts service: {}", self.alerts_service)
-        self.alerts_service.stop()
-        logger.debug("\033[91m[STOP]\033[0m Logger service: {}", self.logger_service)
-        self.logger_service.stop()
+        with ctx.ExitStack() as stack:  # stop each service, even if another one fails
+            stack.callback(self.logger_service.stop)
+            stack.callback(
+                logger.debug, "\033[91m[STOP]\033[0m Logger service: {}", self.logger_service
+            )
+            stack.callback(self.alerts_service.stop)
+            stack.callback(
+                logger.debug, "\033[91m[STOP]\033[0m Alerts service: {}", self.alerts_service
+            )
+            logger.debug("\033[91m[STOP]\033[0m Mlflow service: {}", self.mlflow_service)
+            try:
+                self.mlflow_service.stop()
+            except Exception as error:
+                if exc_value is None:
+                    raise
+                # keep the error of the job: the logging error is likely a consequence
+                logger.error("Mlflow service not stopped cleanly: {!r}", error)
         print("Logger services stopped")
         return False  # re-raise
 
+    def summary(self, **fields: T.Any) -> Locals:
+        """Summarize the outcome of a job run in lean mode.
+
+        Args:
+            fields (T.Any): compact outcomes of the job (e.g., scores, model version).
+
+        Returns:
+            Locals: job kind, peak resident memory (in MB), and outcomes.
+        """
+        return {"KIND": self.KIND, "peak_rss": peak_rss(), **fields}
+
+    def services(self) -> tuple[Service, ...]:
+        """Get the services of the job, in their start order.
+
+        Returns:
+            tuple[Service, ...]: services of the job.
+        """
+        return (self.logger_service, self.alerts_service, self.mlflow_service)
+
     @abc.abstractmethod
     def run(self) -> Locals:
         """Run the job in context.
@@ -93,6 +128,10 @@ class Job(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
         """
 
     def get_system_info(self) -> dict:
+        # heavy modules: only imported when the system is queried
+        import psutil
+        import torch
+
         return {
             "os": platform.system(),
             "os_version": platform.version(),
@@ -106,6 +145,9 @@ class Job(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
         }
     
     def log_system_info(self, logger, artifact_uri): 
+        import mlflow
+        import pyperclip
+
         system_information = self.get_system_info()
         logger.info("System Info: {}", system_information)
 
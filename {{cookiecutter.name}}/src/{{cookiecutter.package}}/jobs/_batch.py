@@ -0,0 +1,151 @@
+"""Run a batch of jobs in long-lived processes."""
+
+# %% IMPORTS
+
+import concurrent.futures as cf
+import contextlib as ctx
+import functools
+import multiprocessing.util
+import time
+import traceback
+import typing as T
+
+from ._base import Job
+from ..io import share_reads
+from ..services import LoggerService, Service
+
+# %% TYPES
+
+# Outcome of a job in a batch
+Summary = dict[str, T.Any]
+
+# %% WORKERS
+
+# Services started in the process, reused by the next jobs with the same services
+_STARTED: tuple[Service, ...] = ()
+
+
+def _initialize(max_bytes: int = 2**30) -> None:
+    """Share the datasets read between the jobs of a worker process.
+
+    Args:
+        max_bytes (int): maximum memory of the shared datasets (in bytes).
+    """
+    share_reads(enable=True, max_bytes=max_bytes)
+
+
+def _initialize_worker(max_bytes: int = 2**30) -> None:
+    """Initialize a worker process, and stop its services when it exits.
+
+    Args:
+        max_bytes (int): maximum memory of the shared datasets (in bytes).
+    """
+    _initialize(max_bytes=max_bytes)
+    # worker processes exit without atexit: use a multiprocessing finalizer
+    multiprocessing.util.Finalize(None, _stop, exitpriority=10)
+
+
+def _switch(services: tuple[Service, ...]) -> None:
+    """Start the services of a job, unless they are already started.
+
+    Args:
+        services (tuple[Service, ...]): services of the next job.
+    """
+    global _STARTED
+    if services == _STARTED:
+        for service in services:
+            if isinstance(service, LoggerService):  # drop the sinks of the previous job
+                service.start()
+        return
+    _stop()
+    for service in services:
+        service.start()
+    _STARTED = services
+
+
+def _stop() -> None:
+    """Stop the services started in the process, even if one of them fails to stop."""
+    global _STARTED
+    services, _STARTED = _STARTED, ()
+    with ctx.ExitStack() as stack:  # stopped in reverse order
+        for service in services:
+            stack.callback(service.stop)
+
+
+def _run(index: int, job: Job) -> Summary:
+    """Run a job of a batch with the services of the process.
+
+    The local variables of the job are dropped to release its data.
+
+    Args:
+        index (int): index of the job in the batch.
+        job (Job): job to run.
+
+    Returns:
+        Summary: outcome of the job.
+    """
+    start = time.perf_counter()
+    error = None
+    try:
+        _switch(services=job.services())
+        job.run()
+    except Exception:
+        error = traceback.format_exc()
+    return {
+        "index": index,
+        "kind": job.KIND,
+        "duration": time.perf_counter() - start,
+        "error": error,
+    }
+
+
+# %% BATCHES
+
+
+class Batch:
+    """Run a batch of jobs, reusing the started services and the datasets read.
+
+    With max_jobs=1, the jobs run one after the other in the current process.
+    Otherwise, they run in a pool of long-lived worker processes.
+    A failed job is reported in its summary and does not stop the batch.
+
+    Parameters:
+        max_jobs (int): maximum number of jobs running at once.
+        max_shared_bytes (int): maximum memory of the datasets shared per process (in bytes).
+    """
+
+    def __init__(self, max_jobs: int = 1, max_shared_bytes: int = 2**30) -> None:
+        """Initialize the batch runner.
+
+        Args:
+            max_jobs (int): maximum number of jobs running at once.
+            max_shared_bytes (int): maximum memory of the datasets shared per process (in bytes).
+
+        Raises:
+            ValueError: if max_jobs is lower than 1.
+        """
+        if max_jobs < 1:
+            raise ValueError(f"Max jobs must be at least 1, got: {max_jobs}")
+        self.max_jobs = max_jobs
+        self.max_shared_bytes = max_shared_bytes
+
+    def run(self, jobs: T.Sequence[Job]) -> list[Summary]:
+        """Run the jobs of the batch.
+
+        Args:
+            jobs (T.Sequence[Job]): jobs to run.
+
+        Returns:
+            list[Summary]: outcomes of the jobs, in the batch order.
+        """
+        if self.max_jobs == 1:
+            _initialize(max_bytes=self.max_shared_bytes)
+            try:
+                return [_run(index=index, job=job) for index, job in enumerate(jobs)]
+            finally:
+                _stop()
+                share_reads(enable=False)
+        initializer = functools.partial(_initialize_worker, max_bytes=self.max_shared_bytes)
+        with cf.ProcessPoolExecutor(max_workers=self.max_jobs, initializer=initializer) as pool:
+            futures = [pool.submit(_run, index, job) for index, job in enumerate(jobs)]
+            return [future.result() for future in futures]
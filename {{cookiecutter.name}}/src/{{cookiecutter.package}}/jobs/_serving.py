@@ -0,0 +1,272 @@
+"""Serve model predictions over HTTP with micro-batches of concurrent requests."""
+
+# %% IMPORTS
+
+import asyncio
+import collections
+import concurrent.futures as cf
+import json
+import time
+import typing as T
+
+import numpy as np
+import pandas as pd
+
+# %% TYPES
+
+# Predict the outputs of a batch of inputs
+Predict = T.Callable[[pd.DataFrame], pd.DataFrame]
+# Validate the inputs of a request (raise if invalid)
+Check = T.Callable[[pd.DataFrame], pd.DataFrame]
+# Inputs of a request and the future of its outputs
+Request = tuple[pd.DataFrame, "asyncio.Future[pd.DataFrame]"]
+# Statistics of a server or a load test
+Stats = dict[str, float]
+
+# %% HELPERS
+
+
+def latencies(durations: T.Sequence[float], elapsed: float) -> Stats:
+    """Summarize the latencies and throughput of requests.
+
+    Args:
+        durations (T.Sequence[float]): durations of the requests (in seconds).
+        elapsed (float): duration of the period measured (in seconds).
+
+    Returns:
+        Stats: requests, p50/p99 latencies (in ms), and throughput (requests per second).
+    """
+    p50, p99 = np.percentile(durations, [50, 99]) * 1000 if len(durations) else (0.0, 0.0)
+    return {
+        "requests": len(durations),
+        "latency_p50_ms": float(p50),
+        "latency_p99_ms": float(p99),
+        "throughput_rps": len(durations) / elapsed if elapsed else 0.0,
+    }
+
+
+# %% BATCHERS
+
+
+class MicroBatcher:
+    """Combine the concurrent requests into micro-batches predicted in a worker pool.
+
+    A batch is predicted once it has max_batch_size rows, or max_wait seconds
+    after its first request, whichever comes first.
+
+    Parameters:
+        predict (Predict): predict the outputs of a batch of inputs.
+        max_batch_size (int): maximum number of rows per batch.
+        max_wait (float): maximum delay to fill a batch (in seconds).
+        workers (int): number of batches predicted at once.
+        batches (int): number of batches predicted.
+        rows (int): number of rows predicted.
+    """
+
+    def __init__(
+        self, predict: Predict, max_batch_size: int = 64, max_wait: float = 0.005, workers: int = 1
+    ) -> None:
+        """Initialize the micro-batcher.
+
+        Args:
+            predict (Predict): predict the outputs of a batch of inputs.
+            max_batch_size (int): maximum number of rows per batch.
+            max_wait (float): maximum delay to fill a batch (in seconds).
+            workers (int): number of batches predicted at once.
+        """
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.workers = workers
+        self.batches = 0
+        self.rows = 0
+        self.queue: asyncio.Queue[Request] = asyncio.Queue()
+        self.executor = cf.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="predict")
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, inputs: pd.DataFrame) -> pd.DataFrame:
+        """Predict the outputs of a request in the next batch.
+
+        Args:
+            inputs (pd.DataFrame): inputs of the request.
+
+        Returns:
+            pd.DataFrame: outputs of the request.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((inputs, future))
+        return await future
+
+    async def run(self) -> None:
+        """Collect the requests into batches, until cancelled."""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.workers)
+        try:
+            while True:
+                batch = [await self.queue.get()]
+                rows = len(batch[0][0])
+                deadline = loop.time() + self.max_wait
+                while rows < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+                    except TimeoutError:
+                        break
+                    batch.append(request)
+                    rows += len(request[0])
+                await slots.acquire()  # collect the next batch while this one is predicted
+                task = asyncio.create_task(self._predict(batch=batch, slots=slots))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+        finally:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _predict(self, batch: list[Request], slots: asyncio.Semaphore) -> None:
+        """Predict a batch in the worker pool and dispatch the outputs to its requests.
+
+        Args:
+            batch (list[Request]): requests of the batch.
+            slots (asyncio.Semaphore): slots of the worker pool.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            frames = [inputs for inputs, _ in batch]
+            inputs = frames[0] if len(frames) == 1 else pd.concat(frames)
+            outputs = await loop.run_in_executor(self.executor, self.predict, inputs)
+            self.batches += 1
+            self.rows += len(inputs)
+            start = 0
+            for frame, future in batch:
+                if not future.done():  # the client can be gone
+                    future.set_result(outputs.iloc[start : start + len(frame)])
+                start += len(frame)
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        finally:
+            slots.release()
+
+
+# %% SERVERS
+
+
+class Server:
+    """Serve the predictions of a micro-batcher over HTTP (keep-alive supported).
+
+    Routes:
+        POST /predict: inputs and outputs as JSON dataframes (orient="split").
+        GET /stats: latencies, throughput, and batches of the server.
+        GET /health: always OK once the model is loaded.
+
+    The inputs of each request are checked before joining a batch, so an invalid
+    request is rejected alone instead of failing the other requests of its batch.
+
+    Parameters:
+        batcher (MicroBatcher): micro-batcher of the predictions.
+        check (Check | None): validate the inputs of a request (None to skip).
+        durations (collections.deque[float]): durations of the last requests (in seconds).
+    """
+
+    def __init__(
+        self, batcher: MicroBatcher, check: Check | None = None, window: int = 100_000
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            batcher (MicroBatcher): micro-batcher of the predictions.
+            check (Check | None): validate the inputs of a request (None to skip).
+            window (int): number of last requests kept for the latencies.
+        """
+        self.batcher = batcher
+        self.check = check
+        self.durations: collections.deque[float] = collections.deque(maxlen=window)
+        self.start = time.perf_counter()
+
+    async def serve(self, host: str, port: int, duration: float | None = None) -> None:
+        """Serve the requests, for a duration or until cancelled.
+
+        Args:
+            host (str): host of the server.
+            port (int): port of the server.
+            duration (float | None): seconds before stopping the server (None to serve forever).
+        """
+        self.start = time.perf_counter()
+        batcher = asyncio.create_task(self.batcher.run())
+        try:
+            async with await asyncio.start_server(self.handle, host=host, port=port):
+                await asyncio.sleep(float("inf") if duration is None else duration)
+        finally:
+            batcher.cancel()
+
+    def stats(self) -> Stats:
+        """Get the statistics of the server.
+
+        Returns:
+            Stats: latencies and throughput of the requests, and size of the batches.
+        """
+        elapsed = time.perf_counter() - self.start
+        stats = latencies(durations=self.durations, elapsed=elapsed)
+        stats["batches"] = self.batcher.batches
+        stats["batch_size_mean"] = self.batcher.rows / (self.batcher.batches or 1)
+        return stats
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Handle the HTTP requests of a connection.
+
+        Args:
+            reader (asyncio.StreamReader): reader of the connection.
+            writer (asyncio.StreamWriter): writer of the connection.
+        """
+        try:
+            while line := await reader.readline():
+                method, path, _ = line.decode().split(" ", 2)
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    key, _, value = header.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, content = await self.route(method=method, path=path, body=body)
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(content)}\r\n\r\n".encode()
+                    + content
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # client gone or malformed request
+        finally:
+            writer.close()
+
+    async def route(self, method: str, path: str, body: bytes) -> tuple[str, bytes]:
+        """Route an HTTP request.
+
+        Args:
+            method (str): method of the request.
+            path (str): path of the request.
+            body (bytes): body of the request.
+
+        Returns:
+            tuple[str, bytes]: status and JSON content of the response.
+        """
+        if method == "GET" and path == "/health":
+            return "200 OK", b'{"status": "ok"}'
+        if method == "GET" and path == "/stats":
+            return "200 OK", json.dumps(self.stats()).encode()
+        if method != "POST" or path != "/predict":
+            return "404 Not Found", b'{"error": "not found"}'
+        start = time.perf_counter()
+        try:
+            inputs = pd.DataFrame(**json.loads(body))
+            if self.check is not None:
+                inputs = self.check(inputs)
+            outputs = await self.batcher.submit(inputs=inputs)
+        except Exception as error:
+            return "400 Bad Request", json.dumps({"error": str(error)}).encode()
+        self.durations.append(time.perf_counter() - start)
+        return "200 OK", outputs.to_json(orient="split").encode()
+
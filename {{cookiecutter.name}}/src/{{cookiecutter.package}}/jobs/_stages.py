@@ -0,0 +1,366 @@
+"""Run the steps of a job as declared stages with cached outputs."""
+
+# %% IMPORTS
+
+import contextlib as ctx
+import hashlib
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+import types as TS
+import typing as T
+
+import loguru
+import pydantic as pdt
+
+from ..services import shared_client
+
+try:  # not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+# %% TYPES
+
+# Output of a stage
+Value = T.TypeVar("Value")
+# Measures of a stage
+Profile = dict[str, T.Any]
+
+# %% CACHES
+
+
+class StageCache(pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
+    """Cache the stage outputs on disk, keyed by the hash of their inputs and config.
+
+    Parameters:
+        path (str): directory of the cached stage outputs.
+    """
+
+    path: str = "outcomes/stages"
+
+    def load(self, key: str) -> tuple[bool, T.Any]:
+        """Load the output of a stage from the cache.
+
+        Args:
+            key (str): key of the stage.
+
+        Returns:
+            tuple[bool, T.Any]: True and the output if the key is cached, else False and None.
+        """
+        file = os.path.join(self.path, f"{key}.pkl")
+        if not os.path.exists(file):
+            return False, None
+        with open(file, "rb") as reader:
+            return True, pickle.load(reader)
+
+    def save(self, key: str, value: T.Any) -> None:
+        """Save the output of a stage in the cache.
+
+        Args:
+            key (str): key of the stage.
+            value (T.Any): output of the stage.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        file = os.path.join(self.path, f"{key}.pkl")
+        with open(f"{file}.tmp", "wb") as writer:
+            pickle.dump(value, writer, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{file}.tmp", file)  # no partial output on interruption
+
+
+class Checkpoints:
+    """Checkpoint the stage outputs in the artifacts of a run, to resume it after a crash.
+
+    The checkpoints are written to a local cache and logged as run artifacts.
+    The local cache is a temporary directory, removed when the checkpoints are closed.
+
+    Parameters:
+        run_id (str): ID of the run storing the checkpoints.
+        path (str): artifact path of the checkpoints in the run.
+        cache (StageCache): local cache of the checkpoints.
+    """
+
+    def __init__(self, run_id: str, path: str = "checkpoints", resume: bool = False) -> None:
+        """Initialize the checkpoints of a run.
+
+        Args:
+            run_id (str): ID of the run storing the checkpoints.
+            path (str): artifact path of the checkpoints in the run.
+            resume (bool): download the checkpoints of a previous attempt of the run.
+        """
+        import mlflow
+
+        self.run_id = run_id
+        self.path = path
+        self.directory = tempfile.TemporaryDirectory(prefix="checkpoints-")
+        self.cache = StageCache(path=self.directory.name)
+        if resume:
+            try:
+                if shared_client().list_artifacts(run_id, path):  # else no checkpoint yet
+                    mlflow.artifacts.download_artifacts(
+                        run_id=run_id, artifact_path=path, dst_path=self.cache.path
+                    )
+            except Exception as error:  # e.g., auth, network, or corrupted artifacts
+                loguru.logger.warning("Checkpoints of run {} not restored: {!r}", run_id, error)
+            self.cache = StageCache(path=os.path.join(self.cache.path, path))
+
+    def load(self, key: str) -> tuple[bool, T.Any]:
+        """Load the output of a stage from the checkpoints.
+
+        Args:
+            key (str): key of the stage.
+
+        Returns:
+            tuple[bool, T.Any]: True and the output if the key is checkpointed, else False and None.
+        """
+        return self.cache.load(key=key)
+
+    def save(self, key: str, value: T.Any) -> None:
+        """Save the output of a stage in the checkpoints of the run.
+
+        Args:
+            key (str): key of the stage.
+            value (T.Any): output of the stage.
+        """
+        self.cache.save(key=key, value=value)
+        file = os.path.join(self.cache.path, f"{key}.pkl")
+        shared_client().log_artifact(self.run_id, file, artifact_path=self.path)
+
+    def close(self) -> None:
+        """Remove the local cache of the checkpoints (the run artifacts are kept)."""
+        self.directory.cleanup()
+
+    def __enter__(self) -> T.Self:
+        """Use the checkpoints until the end of the context.
+
+        Returns:
+            T.Self: the checkpoints.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: T.Type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_traceback: TS.TracebackType | None,
+    ) -> T.Literal[False]:
+        """Remove the local cache of the checkpoints at the end of the context.
+
+        Args:
+            exc_type (T.Type[BaseException] | None): ignored.
+            exc_value (BaseException | None): ignored.
+            exc_traceback (TS.TracebackType | None): ignored.
+
+        Returns:
+            T.Literal[False]: always propagate exceptions.
+        """
+        self.close()
+        return False
+
+
+# %% PROFILERS
+
+
+class Profiler(pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
+    """Measure the time, memory, and rows of the job stages.
+
+    Parameters:
+        tracemalloc (bool): trace the python allocations of each stage (slower).
+        artifact (str): name of the profile artifact logged in the run.
+    """
+
+    tracemalloc: bool = True
+    artifact: str = "profile.json"
+
+
+def peak_rss() -> float:
+    """Get the peak resident memory of the process.
+
+    Returns:
+        float: peak resident memory (in MB), or NaN if not available.
+    """
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # bytes vs KB
+
+
+# %% STAGES
+
+
+class Stages:
+    """Run the stages of a job, reusing the cached outputs of the unchanged stages.
+
+    The key of a stage is the hash of its name, config, and upstream stage keys.
+    A change only recomputes the stages downstream of it.
+
+    Parameters:
+        cache (StageCache | None): cache of the stage outputs (disabled if None).
+        profiler (Profiler | None): profiler of the stages (disabled if None).
+        checkpoints (Checkpoints | None): checkpoints of the run (disabled if None).
+        keys (dict[str, str]): keys of the stages run.
+        hits (dict[str, bool]): cache hit of the stages run.
+        profiles (list[Profile]): measures of the stages run.
+    """
+
+    def __init__(
+        self,
+        cache: StageCache | None = None,
+        profiler: Profiler | None = None,
+        checkpoints: Checkpoints | None = None,
+    ) -> None:
+        """Initialize the stages of a job.
+
+        Args:
+            cache (StageCache | None): cache of the stage outputs (disabled if None).
+            profiler (Profiler | None): profiler of the stages (disabled if None).
+            checkpoints (Checkpoints | None): checkpoints of the run (disabled if None).
+        """
+        self.cache = cache
+        self.profiler = profiler
+        self.checkpoints = checkpoints
+        self.keys: dict[str, str] = {}
+        self.hits: dict[str, bool] = {}
+        self.profiles: list[Profile] = []
+
+    @ctx.contextmanager
+    def step(self, name: str) -> T.Generator[Profile, None, None]:
+        """Measure a step of the job (wall/CPU time, peak RSS, allocations, and rows).
+
+        The caller can set the number of rows processed in the yielded profile.
+        Steps are not nested. Without a profiler, nothing is measured.
+
+        Args:
+            name (str): name of the step.
+
+        Yields:
+            T.Generator[Profile, None, None]: profile of the step.
+        """
+        profile: Profile = {"name": name, "rows": None}
+        if self.profiler is None:
+            yield profile
+            return
+        tracing = self.profiler.tracemalloc and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            rss = peak_rss()
+            wall, cpu = time.perf_counter(), time.process_time()
+            yield profile
+            profile["wall_time"] = time.perf_counter() - wall
+            profile["cpu_time"] = time.process_time() - cpu
+            profile["peak_rss"] = peak_rss()
+            profile["peak_rss_delta"] = profile["peak_rss"] - rss
+            if tracing:
+                current, peak = tracemalloc.get_traced_memory()
+                profile["tracemalloc_delta"] = current / 2**20
+                profile["tracemalloc_peak"] = peak / 2**20
+            self.profiles.append(profile)
+        finally:
+            if tracing:
+                tracemalloc.stop()
+
+    def metrics(self) -> dict[str, float]:
+        """Flatten the profiles of the steps into metrics.
+
+        Returns:
+            dict[str, float]: metrics named profile_<step>_<measure>.
+        """
+        return {
+            f"profile_{profile['name']}_{key}": float(value)
+            for profile in self.profiles
+            for key, value in profile.items()
+            if key != "name" and value is not None
+        }
+
+    def key(self, name: str, config: T.Any = None, upstream: T.Iterable[str] = ()) -> str:
+        """Compute the key of a stage.
+
+        Args:
+            name (str): name of the stage.
+            config (T.Any): config of the stage (e.g., pydantic models).
+            upstream (T.Iterable[str]): names of the stages it depends on.
+
+        Returns:
+            str: key of the stage.
+        """
+        fields = {
+            "name": name,
+            "config": config,
+            "upstream": [self.keys[stage] for stage in upstream],
+        }
+        text = json.dumps(fields, sort_keys=True, default=_to_json)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def source(self, name: str, value: Value, digest: str) -> Value:
+        """Declare the output of a source stage, keyed by its content digest.
+
+        Args:
+            name (str): name of the stage.
+            value (Value): output of the stage (e.g., dataframe read).
+            digest (str): content digest of the output.
+
+        Returns:
+            Value: output of the stage.
+        """
+        self.keys[name] = self.key(name=name, config=digest)
+        return value
+
+    def run(
+        self,
+        name: str,
+        func: T.Callable[[], Value],
+        config: T.Any = None,
+        upstream: T.Iterable[str] = (),
+        cache: bool = True,
+        checkpoint: bool = False,
+    ) -> Value:
+        """Run a stage, or reuse its output from the cache or the checkpoints.
+
+        Args:
+            name (str): name of the stage.
+            func (T.Callable[[], Value]): compute the output of the stage.
+            config (T.Any): config of the stage (e.g., pydantic models).
+            upstream (T.Iterable[str]): names of the stages it depends on.
+            cache (bool): share the output between runs (False for side effects on the run).
+            checkpoint (bool): checkpoint the output in the run (e.g., for expensive stages).
+
+        Returns:
+            Value: output of the stage.
+        """
+        key = self.keys[name] = self.key(name=name, config=config, upstream=upstream)
+        cache_ = self.cache if cache else None
+        checkpoints = self.checkpoints if checkpoint else None
+        with self.step(name) as profile:
+            hit, value = cache_.load(key=key) if cache_ is not None else (False, None)
+            resumed = False
+            if checkpoints is not None and not hit:
+                resumed, value = checkpoints.load(key=key)
+            self.hits[name] = hit or resumed
+            if not self.hits[name]:
+                value = func()
+                if cache_ is not None:
+                    cache_.save(key=key, value=value)
+            if checkpoints is not None and not resumed:
+                checkpoints.save(key=key, value=value)
+            shape = getattr(value, "shape", ())
+            profile["rows"] = shape[0] if shape else None  # None for scalars (0-d)
+        return T.cast(Value, value)
+
+
+def _to_json(value: T.Any) -> T.Any:
+    """Convert pydantic models and other values to JSON.
+
+    Args:
+        value (T.Any): value to convert.
+
+    Returns:
+        T.Any: JSON compatible value.
+    """
+    if isinstance(value, pdt.BaseModel):
+        return {"KIND": getattr(value, "KIND", None), **value.model_dump(mode="json")}
+    return str(value)
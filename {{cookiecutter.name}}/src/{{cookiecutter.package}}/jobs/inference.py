@@ -0,0 +1,179 @@
+"""Define a job for generating batch predictions from a registered model."""
+
+# %% IMPORTS
+
+import queue
+import threading
+import time
+import typing as T
+
+import pandas as pd
+import pydantic as pdt
+
+from ._base import Job, Locals
+from ._stages import Stages, peak_rss
+from ..services import MlflowService
+from ..io import ReaderKind, WriterKind
+from ..io.schemas import InputsSchema
+from ..registries import LoaderKind, CustomLoader
+
+# %% TYPES
+
+# End of a stream of chunks
+_DONE = object()
+
+# %% JOBS
+
+
+class InferenceJob(Job):
+    """Generate batch predictions from a registered model, one chunk at a time.
+
+    The inputs are read, predicted, and written in separate threads connected by
+    bounded queues, so the three stages overlap without loading all the data.
+
+    Parameters:
+        run_config (services.MlflowService.RunConfig): mlflow run config.
+        inputs (datasets.ReaderKind): reader for the inputs data.
+        outputs (datasets.WriterKind): writer for the outputs data.
+        alias_or_version (str | int): alias or version of the registered model.
+        loader (registries.LoaderKind): registry loader for the model.
+        chunksize (int): number of rows per chunk.
+        queue_size (int): maximum number of chunks waiting between two stages.
+    """
+
+    KIND: T.Literal["InferenceJob"] = "InferenceJob"
+
+    # Run
+    run_config: MlflowService.RunConfig = MlflowService.RunConfig(name="Inference")
+    # Data
+    inputs: ReaderKind = pdt.Field(..., discriminator="KIND")
+    outputs: WriterKind = pdt.Field(..., discriminator="KIND")
+    # Model
+    alias_or_version: str | int = "Champion"
+    # Loader
+    loader: LoaderKind = pdt.Field(CustomLoader(), discriminator="KIND")
+    # Stream
+    chunksize: int = pdt.Field(default=10_000, gt=0)
+    queue_size: int = pdt.Field(default=4, gt=0)
+
+    @T.override
+    def run(self) -> Locals:
+        import mlflow  # imported when the job runs
+
+        # services
+        # - logger
+        logger = self.logger_service.logger()
+        logger.info("With logger: {}", logger)
+        with self.mlflow_service.run_context(run_config=self.run_config) as run:
+            logger.info("With run context: {}", run.info)
+            # stages
+            stages = Stages(profiler=self.profiler)
+            # model
+            # - uri
+            if isinstance(self.alias_or_version, int):
+                model_uri = f"models:/{self.mlflow_service.registry_name}/{self.alias_or_version}"
+            else:
+                model_uri = f"models:/{self.mlflow_service.registry_name}@{self.alias_or_version}"
+            # - loader
+            logger.info("Load model: {} with {}", model_uri, self.loader)
+            with stages.step("load"):
+                model = self.loader.load_cached(uri=model_uri)
+            logger.debug("- Model cache: {}", self.loader.cache_stats())
+            # stream
+            logger.info("Stream inputs: {} -> {}", self.inputs, self.outputs)
+            inputs_queue: queue.Queue[T.Any] = queue.Queue(maxsize=self.queue_size)
+            outputs_queue: queue.Queue[T.Any] = queue.Queue(maxsize=self.queue_size)
+            errors: list[BaseException] = []
+            stop = threading.Event()
+            stats = {"chunks": 0, "rows": 0, "inputs_depth": 0, "outputs_depth": 0}
+            start = time.perf_counter()
+
+            def read() -> None:
+                """Read the chunks of inputs into the inputs queue."""
+                try:
+                    for chunk in self.inputs.read_chunks(chunksize=self.chunksize):
+                        if stop.is_set():
+                            break
+                        inputs_queue.put(chunk)
+                except BaseException as error:
+                    errors.append(error)
+                finally:
+                    inputs_queue.put(_DONE)
+
+            def predict() -> None:
+                """Predict the chunks of the inputs queue into the outputs queue."""
+                try:
+                    while (chunk := inputs_queue.get()) is not _DONE:
+                        if stop.is_set():
+                            continue  # drain the queue to unblock the reader
+                        outputs = model.predict(inputs=InputsSchema.check(chunk))
+                        outputs_queue.put(outputs)
+                        stats["chunks"] += 1
+                        stats["rows"] += len(chunk)
+                        stats["inputs_depth"] += inputs_queue.qsize()
+                        stats["outputs_depth"] += outputs_queue.qsize()
+                        rate = stats["rows"] / (time.perf_counter() - start)
+                        logger.debug(
+                            "- Chunk {}: {} rows, {:.1f} rows/sec, queue depths: {}/{}",
+                            stats["chunks"],
+                            len(chunk),
+                            rate,
+                            inputs_queue.qsize(),
+                            outputs_queue.qsize(),
+                        )
+                except BaseException as error:
+                    errors.append(error)
+                    stop.set()
+                    while inputs_queue.get() is not _DONE:
+                        pass
+                finally:
+                    outputs_queue.put(_DONE)
+
+            def chunks() -> T.Iterator[pd.DataFrame]:
+                """Yield the chunks of the outputs queue to the writer."""
+                while (outputs := outputs_queue.get()) is not _DONE:
+                    if not stop.is_set():
+                        yield outputs
+
+            threads = [
+                threading.Thread(target=read, name="read", daemon=True),
+                threading.Thread(target=predict, name="predict", daemon=True),
+            ]
+            for thread in threads:
+                thread.start()
+            with stages.step("stream") as step:
+                try:
+                    self.outputs.write_chunks(chunks=chunks())
+                except BaseException:
+                    stop.set()
+                    for _ in chunks():  # drain the queue to unblock the predictor
+                        pass
+                    raise
+                finally:
+                    for thread in threads:
+                        thread.join()
+                step["rows"] = stats["rows"]
+            if errors:
+                raise errors[0]
+            duration = time.perf_counter() - start
+            # metrics
+            metrics = {
+                "inference_rows": stats["rows"],
+                "inference_chunks": stats["chunks"],
+                "inference_rows_per_sec": stats["rows"] / duration if duration else 0.0,
+                "inference_inputs_queue_depth": stats["inputs_depth"] / (stats["chunks"] or 1),
+                "inference_outputs_queue_depth": stats["outputs_depth"] / (stats["chunks"] or 1),
+            }
+            logger.info("Inference stats: {}", metrics)
+            mlflow.log_metrics(metrics)
+            # profile
+            if self.profiler is not None:
+                logger.info("Log profile: {}", self.profiler.artifact)
+                mlflow.log_dict(stages.profiles, self.profiler.artifact)
+                mlflow.log_metrics(stages.metrics())
+            # memory
+            mlflow.log_metric("peak_rss", peak_rss())
+        logger.info("Inference job finished")
+        if self.lean:
+            return self.summary(run_id=run.info.run_id, model_uri=model_uri, **metrics)
+        return locals()
@@ -0,0 +1,113 @@
+"""Define a job for serving online predictions from a registered model."""
+
+# %% IMPORTS
+
+import asyncio
+import typing as T
+
+import pandas as pd
+import pydantic as pdt
+
+from ._base import Job, Locals
+from ._serving import MicroBatcher, Server
+from ._stages import Stages, peak_rss
+from ..services import MlflowService
+from ..io.schemas import InputsSchema
+from ..registries import LoaderKind, CustomLoader
+
+# %% JOBS
+
+
+class ServingJob(Job):
+    """Serve online predictions from a registered model on a local HTTP server.
+
+    The concurrent requests are combined into micro-batches, predicted in a worker pool.
+    The latencies and throughput are logged when the server stops.
+
+    Parameters:
+        run_config (services.MlflowService.RunConfig): mlflow run config.
+        alias_or_version (str | int): alias or version of the registered model.
+        loader (registries.LoaderKind): registry loader for the model.
+        host (str): host of the server.
+        port (int): port of the server.
+        max_batch_size (int): maximum number of rows per batch.
+        max_wait (float): maximum delay to fill a batch (in seconds).
+        workers (int): number of batches predicted at once.
+        duration (float | None): seconds before stopping the server (None to serve forever).
+    """
+
+    KIND: T.Literal["ServingJob"] = "ServingJob"
+
+    # Run
+    run_config: MlflowService.RunConfig = MlflowService.RunConfig(name="Serving")
+    # Model
+    alias_or_version: str | int = "Champion"
+    # Loader
+    loader: LoaderKind = pdt.Field(CustomLoader(), discriminator="KIND")
+    # Server
+    host: str = "127.0.0.1"
+    port: int = 8000
+    # Batcher
+    max_batch_size: int = pdt.Field(default=64, gt=0)
+    max_wait: float = pdt.Field(default=0.005, ge=0)
+    workers: int = pdt.Field(default=1, gt=0)
+    duration: float | None = None
+
+    @T.override
+    def run(self) -> Locals:
+        import mlflow  # imported when the job runs
+
+        # services
+        # - logger
+        logger = self.logger_service.logger()
+        logger.info("With logger: {}", logger)
+        with self.mlflow_service.run_context(run_config=self.run_config) as run:
+            logger.info("With run context: {}", run.info)
+            # stages
+            stages = Stages(profiler=self.profiler)
+            # model
+            # - uri
+            if isinstance(self.alias_or_version, int):
+                model_uri = f"models:/{self.mlflow_service.registry_name}/{self.alias_or_version}"
+            else:
+                model_uri = f"models:/{self.mlflow_service.registry_name}@{self.alias_or_version}"
+            # - loader
+            logger.info("Load model: {} with {}", model_uri, self.loader)
+            with stages.step("load"):
+                model = self.loader.load_cached(uri=model_uri)
+
+            def predict(inputs: pd.DataFrame) -> pd.DataFrame:
+                """Predict a batch of inputs with the model (checked per request)."""
+                return model.predict(inputs=inputs)
+
+            # server
+            batcher = MicroBatcher(
+                predict=predict,
+                max_batch_size=self.max_batch_size,
+                max_wait=self.max_wait,
+                workers=self.workers,
+            )
+            server = Server(batcher=batcher, check=InputsSchema.check)
+            logger.info("Serve model: http://{}:{}/predict", self.host, self.port)
+            with stages.step("serve") as step:
+                try:
+                    serve = server.serve(host=self.host, port=self.port, duration=self.duration)
+                    asyncio.run(serve)
+                except KeyboardInterrupt:
+                    logger.info("Server interrupted")
+                step["rows"] = batcher.rows
+            # metrics
+            metrics = {f"serving_{key}": value for key, value in server.stats().items()}
+            logger.info("Serving stats: {}", metrics)
+            mlflow.log_metrics(metrics)
+            # profile
+            if self.profiler is not None:
+                logger.info("Log profile: {}", self.profiler.artifact)
+                mlflow.log_dict(stages.profiles, self.profiler.artifact)
+                mlflow.log_metrics(stages.metrics())
+            # memory
+            mlflow.log_metric("peak_rss", peak_rss())
+        logger.info("Serving job finished")
+        if self.lean:
+            return self.summary(run_id=run.info.run_id, model_uri=model_uri, **metrics)
+        return locals()
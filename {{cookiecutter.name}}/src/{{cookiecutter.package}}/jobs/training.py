@@ -2,17 +2,18 @@
 
 # %% IMPORTS
 
+import contextlib as ctx
 import typing as T
 import os
-import mlflow
 import pydantic as pdt
 
 from ._base import Locals, Job
+from ._stages import Checkpoints, StageCache, Stages, peak_rss
 
 from ..services import MlflowService
 from ..signers import SignerKind, ExampleSigner
 from ..models import ModelKind, ExampleModel
-from ..metrics import MetricsKind, ExampleMetric
+from ..metrics import MetricsKind, ExampleMetric, Bootstrap
 from ..io import ReaderKind
 
 from ..io.splitters import SplitterKind
@@ -32,10 +33,13 @@ class TrainingJob(Job):
         targets (datasets.ReaderKind): reader for the targets data.
         model (models.ModelKind): machine learning model to train.
         metrics (metrics_.MetricsKind): metric list to compute.
+        bootstrap (metrics_.Bootstrap | None): confidence intervals of the metrics.
         splitter (splitters.SplitterKind): data sets splitter.
         saver (registries.SaverKind): model saver.
         signer (signers.SignerKind): model signer.
         registry (registries.RegisterKind): model register.
+        cache (StageCache | None): cache of the stage outputs to skip unchanged stages.
+        checkpoint (bool): checkpoint the expensive stages in the run (forced by --resume).
     """
 
     KIND: T.Literal["TrainingJob"] = "TrainingJob"
@@ -49,6 +53,7 @@ class TrainingJob(Job):
     model: ModelKind = pdt.Field(ExampleModel(), discriminator="KIND")
     # # Metrics
     metrics: MetricsKind = [ExampleMetric()]
+    bootstrap: Bootstrap | None = None
     # Splitter
     splitter: SplitterKind = pdt.Field(TrainTestSplitter(), discriminator="KIND")
     # # Saver
@@ -58,6 +63,9 @@ class TrainingJob(Job):
     # # Registrer
     # # - avoid shadowing pydantic `register` pydantic function
     registry: RegisterKind = pdt.Field(MlflowRegister(), discriminator="KIND")
+    # # Cache
+    cache: StageCache | None = None
+    checkpoint: bool = False
 
     @T.override
     def run(self) -> Locals:
@@ -68,38 +76,81 @@ class TrainingJob(Job):
         # # - mlflow
         client = self.mlflow_service.client()
         logger.info("With client: {}", client.tracking_uri)
-        with self.mlflow_service.run_context(run_config=self.run_config) as run:
+        log_queue = self.mlflow_service.queue()  # sent in the background
+        with (
+            self.mlflow_service.run_context(run_config=self.run_config) as run,
+            ctx.ExitStack() as stack,
+        ):
+            run_id = run.info.run_id
             self.log_system_info(logger, run.info.artifact_uri)
             logger.info("With run context: {}", run.info)
+            # stages
+            resume = self.run_config.run_id is not None
+            checkpoints = (
+                stack.enter_context(Checkpoints(run_id=run_id, resume=resume))
+                if self.checkpoint
+                else None
+            )
+            stages = Stages(cache=self.cache, profiler=self.profiler, checkpoints=checkpoints)
+            logger.info("With stages cache: {}", self.cache)
+            logger.info("With checkpoints: {} (resume: {})", self.checkpoint, resume)
             # data
             # - inputs
             logger.info("Read inputs: {}", self.inputs)
-            inputs_ = self.inputs.read()  # unchecked!
-            inputs = InputsSchema.check(inputs_)
+            with stages.step("read_inputs") as step:
+                inputs_ = self.inputs.read_shared()  # unchecked!
+                inputs_fingerprint = self.inputs.fingerprint(inputs_)
+                stages.source("read_inputs", inputs_, digest=inputs_fingerprint)
+                step["rows"] = len(inputs_)
+            inputs = stages.run(
+                "check_inputs", lambda: InputsSchema.check(inputs_), upstream=["read_inputs"]
+            )
             logger.debug("- Inputs shape: {}", inputs.shape)
             # - targets
             logger.info("Read targets: {}", self.targets)
-            targets_ = self.targets.read()  # unchecked!
-            targets = TargetsSchema.check(targets_)
+            with stages.step("read_targets") as step:
+                targets_ = self.targets.read_shared()  # unchecked!
+                targets_fingerprint = self.targets.fingerprint(targets_)
+                stages.source("read_targets", targets_, digest=targets_fingerprint)
+                step["rows"] = len(targets_)
+            targets = stages.run(
+                "check_targets", lambda: TargetsSchema.check(targets_), upstream=["read_targets"]
+            )
             logger.debug("- Targets shape: {}", targets.shape)
+            if self.lean:  # raw data: consumed by the checks
+                del inputs_, targets_
             # lineage
             # - inputs
             logger.info("Log lineage: inputs")
-            inputs_lineage = self.inputs.lineage(data=inputs, name="inputs")
-            mlflow.log_input(dataset=inputs_lineage, context=self.run_config.name)
+            with stages.step("lineage_inputs") as step:
+                inputs_lineage = self.inputs.lineage(
+                    data=inputs, name="inputs", digest=inputs_fingerprint
+                )
+                log_queue.log_input(run_id, dataset=inputs_lineage, context=self.run_config.name)
+                step["rows"] = len(inputs)
             logger.debug("- Inputs lineage: {}", inputs_lineage.to_dict())
             # - targets
             logger.info("Log lineage: targets")
-            targets_lineage = self.targets.lineage(
-                data=targets, name="targets", targets=TargetsSchema.target
-            )
-            mlflow.log_input(dataset=targets_lineage, context=self.run_config.name)
+            with stages.step("lineage_targets") as step:
+                targets_lineage = self.targets.lineage(
+                    data=targets,
+                    name="targets",
+                    targets=TargetsSchema.target,
+                    digest=targets_fingerprint,
+                )
+                log_queue.log_input(run_id, dataset=targets_lineage, context=self.run_config.name)
+                step["rows"] = len(targets)
             logger.debug("- Targets lineage: {}", targets_lineage.to_dict())
+            if self.lean:  # lineage: consumed by the logs
+                del inputs_lineage, targets_lineage
             # splitter
             logger.info("With splitter: {}", self.splitter)
             # - index
-            train_index, test_index = next(
-                self.splitter.split(inputs=inputs, targets=targets)
+            train_index, test_index = stages.run(
+                "split",
+                lambda: next(self.splitter.split(inputs=inputs, targets=targets)),
+                config=self.splitter,
+                upstream=["check_inputs", "check_targets"],
             )
             # - inputs
             inputs_train = T.cast(Inputs, inputs.iloc[train_index])
@@ -111,39 +162,129 @@ class TrainingJob(Job):
             targets_test = T.cast(Targets, targets.iloc[test_index])
             logger.debug("- Targets train shape: {}", targets_train.shape)
             logger.debug("- Targets test shape: {}", targets_test.shape)
+            if self.lean:  # targets: consumed by the split
+                del targets
             # model
             logger.info("Fit model: {}", self.model)
-            self.model.fit(inputs=inputs_train, targets=targets_train)
+            model = stages.run(
+                "fit",
+                lambda: self.model.model_copy(deep=True).fit(
+                    inputs=inputs_train, targets=targets_train
+                ),
+                config=self.model,
+                upstream=["check_inputs", "check_targets", "split"],
+                checkpoint=True,
+            )
+            if self.lean:  # train sets: consumed by the fit
+                del inputs_train, targets_train
             # outputs
             logger.info("Predict outputs: {}", len(inputs_test))
-            outputs_test = self.model.predict(inputs=inputs_test)
+            outputs_test = stages.run(
+                "predict",
+                lambda: model.predict(inputs=inputs_test),
+                upstream=["check_inputs", "split", "fit"],
+                checkpoint=True,
+            )
             logger.debug("- Outputs test shape: {}", outputs_test.shape)
+            if self.lean:  # inputs test: consumed by the predict
+                del inputs_test
             # metrics
-            for i, metric in enumerate(self.metrics, start=1):
+            scores = stages.run(
+                "score",
+                lambda: [
+                    metric.score(targets=targets_test, outputs=outputs_test)
+                    for metric in self.metrics
+                ],
+                config=self.metrics,
+                upstream=["check_targets", "split", "predict"],
+            )
+            for i, (metric, score) in enumerate(zip(self.metrics, scores), start=1):
                 logger.info("{}. Compute metric: {}", i, metric.KIND)
-                score = metric.score(targets=targets_test, outputs=outputs_test)
-                client.log_metric(run_id=run.info.run_id, key=metric.name, value=score)
+                log_queue.log_metrics(run_id, {metric.name: score})
                 logger.debug("\033[93m- Metric score: {}\033[0m", score)
+            # - intervals
+            if self.bootstrap is not None:
+                logger.info("Bootstrap metrics: {}", self.bootstrap)
+                bootstrap = self.bootstrap
+                intervals = stages.run(
+                    "bootstrap",
+                    lambda: bootstrap.intervals(
+                        metrics=self.metrics, targets=targets_test, outputs=outputs_test
+                    ),
+                    config=[bootstrap, self.metrics],
+                    upstream=["check_targets", "split", "predict"],
+                    checkpoint=True,
+                )
+                for metric, (lower, upper) in zip(self.metrics, intervals):
+                    log_queue.log_metrics(
+                        run_id, {f"{metric.name}_lower": lower, f"{metric.name}_upper": upper}
+                    )
+                    logger.debug("- Metric interval: [{}, {}]", lower, upper)
+            if self.lean:  # targets test: consumed by the metrics
+                del targets_test
             # signer
             logger.info("Sign model: {}", self.signer)
-            model_signature = self.signer.sign(inputs=inputs, outputs=outputs_test)
+            model_signature = stages.run(
+                "sign",
+                lambda: self.signer.sign(inputs=inputs, outputs=outputs_test),
+                config=self.signer,
+                upstream=["check_inputs", "predict"],
+            )
             logger.debug("- Model signature: {}", model_signature.to_dict())
+            if self.lean:  # outputs: consumed by the metrics and the signer
+                del outputs_test
             # saver
             logger.info("Save model: {}", self.saver)
-            model_info = self.saver.save(
-                model=self.model, signature=model_signature, input_example=inputs
+            model_info = stages.run(
+                "save",
+                lambda: self.saver.save(
+                    model=model, signature=model_signature, input_example=inputs
+                ),
+                config=self.saver,
+                upstream=["fit", "sign"],
+                cache=False,  # logged in the run
+                checkpoint=True,
             )
             logger.debug("- Model URI: {}", model_info.model_uri)
+            if self.lean:  # inputs: consumed by the saver (input example)
+                del inputs
             # register
             logger.info("Register model: {}", self.registry)
-            model_version = self.registry.register(
-                name=self.mlflow_service.registry_name, model_uri=model_info.model_uri
+            model_version = stages.run(
+                "register",
+                lambda: self.registry.register(
+                    name=self.mlflow_service.registry_name, model_uri=model_info.model_uri
+                ),
+                config=[self.registry, self.mlflow_service.registry_name],
+                upstream=["save"],
+                cache=False,  # new version in the registry
+                checkpoint=True,
             )
             logger.debug("- Model version: {}", model_version)
+            # stages
+            hits = [name for name, hit in stages.hits.items() if hit]
+            logger.info("Stages cache hits: {}/{} {}", len(hits), len(stages.hits), hits)
+            log_queue.log_dict(run_id, stages.hits, "stages.json")
+            # profile
+            if self.profiler is not None:
+                logger.info("Log profile: {}", self.profiler.artifact)
+                log_queue.log_dict(run_id, stages.profiles, self.profiler.artifact)
+                log_queue.log_metrics(run_id, stages.metrics())
+            # memory
+            log_queue.log_metrics(run_id, {"peak_rss": peak_rss()})
+            logger.debug("- Logging queue: {}", log_queue.stats())
             # notify
             self.alerts_service.notify(
                 title="Training Job Finished",
                 message=f"Model version: {model_version.version}",
             )
         logger.info("Training job finished")
+        if self.lean:
+            return self.summary(
+                run_id=run.info.run_id,
+                model_uri=model_info.model_uri,
+                model_version=model_version.version,
+                scores={metric.name: score for metric, score in zip(self.metrics, scores)},
+                cache_hits=hits,
+            )
         return locals()
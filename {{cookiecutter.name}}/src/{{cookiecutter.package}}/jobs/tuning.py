@@ -4,10 +4,10 @@
 
 import typing as T
 
-import mlflow
 import pydantic as pdt
 
 from ._base import Job, Locals
+from ._stages import Stages, peak_rss
 from ..services import MlflowService
 from ..io import ReaderKind
 from ..models import ModelKind, ExampleModel
@@ -63,33 +63,57 @@ class TuningJob(Job):
         # - logger
         logger = self.logger_service.logger()
         logger.info("With logger: {}", logger)
+        # - mlflow
+        log_queue = self.mlflow_service.queue()  # sent in the background
         with self.mlflow_service.run_context(run_config=self.run_config) as run:
+            run_id = run.info.run_id
             self.log_system_info(logger, run.info.artifact_uri)
             logger.info("With run context: {}", run.info)
+            # stages
+            stages = Stages(profiler=self.profiler)
             # data
             # - inputs
             logger.info("Read inputs: {}", self.inputs)
-            inputs_ = self.inputs.read()  # unchecked!
-            inputs = InputsSchema.check(inputs_)
+            with stages.step("read_inputs") as step:
+                inputs_ = self.inputs.read_shared()  # unchecked!
+                inputs_fingerprint = self.inputs.fingerprint(inputs_)
+                inputs = InputsSchema.check(inputs_)
+                step["rows"] = len(inputs)
             logger.debug("- Inputs shape: {}", inputs.shape)
             # - targets
             logger.info("Read targets: {}", self.targets)
-            targets_ = self.targets.read()  # unchecked!
-            targets = TargetsSchema.check(targets_)
+            with stages.step("read_targets") as step:
+                targets_ = self.targets.read_shared()  # unchecked!
+                targets_fingerprint = self.targets.fingerprint(targets_)
+                targets = TargetsSchema.check(targets_)
+                step["rows"] = len(targets)
             logger.debug("- Targets shape: {}", targets.shape)
+            if self.lean:  # raw data: consumed by the checks
+                del inputs_, targets_
             # lineage
             # - inputs
             logger.info("Log lineage: inputs")
-            inputs_lineage = self.inputs.lineage(data=inputs, name="inputs")
-            mlflow.log_input(dataset=inputs_lineage, context=self.run_config.name)
+            with stages.step("lineage_inputs") as step:
+                inputs_lineage = self.inputs.lineage(
+                    data=inputs, name="inputs", digest=inputs_fingerprint
+                )
+                log_queue.log_input(run_id, dataset=inputs_lineage, context=self.run_config.name)
+                step["rows"] = len(inputs)
             logger.debug("- Inputs lineage: {}", inputs_lineage.to_dict())
             # - targets
             logger.info("Log lineage: targets")
-            targets_lineage = self.targets.lineage(
-                data=targets, name="targets", targets=TargetsSchema.target
-            )
-            mlflow.log_input(dataset=targets_lineage, context=self.run_config.name)
+            with stages.step("lineage_targets") as step:
+                targets_lineage = self.targets.lineage(
+                    data=targets,
+                    name="targets",
+                    targets=TargetsSchema.target,
+                    digest=targets_fingerprint,
+                )
+                log_queue.log_input(run_id, dataset=targets_lineage, context=self.run_config.name)
+                step["rows"] = len(targets)
             logger.debug("- Targets lineage: {}", targets_lineage.to_dict())
+            if self.lean:  # lineage: consumed by the logs
+                del inputs_lineage, targets_lineage
             # model
             logger.info("With model: {}", self.model)
             # metric
@@ -98,18 +122,40 @@ class TuningJob(Job):
             logger.info("With splitter: {}", self.splitter)
             # searcher
             logger.info("Run searcher: {}", self.searcher)
-            results, best_score, best_params = self.searcher.search(
-                model=self.model,
-                metric=self.metric,
-                inputs=inputs,
-                targets=targets,
-                cv=self.splitter,
-            )
+            with stages.step("search") as step:
+                results, best_score, best_params = self.searcher.search(
+                    model=self.model,
+                    metric=self.metric,
+                    inputs=inputs,
+                    targets=targets,
+                    cv=self.splitter,
+                )
+                step["rows"] = len(inputs)
+            if self.lean:  # data: consumed by the searcher
+                del inputs, targets
             logger.debug("- Results: {}", results.shape)
             logger.debug("- Best Score: {}", best_score)
             logger.debug("\033[93m- Best Params: {}\033[0m", best_params)
+            if results.attrs:  # e.g., compute saved by the pruner
+                logger.debug("- Search stats: {}", results.attrs)
+                log_queue.log_metrics(run_id, results.attrs)
+            # profile
+            if self.profiler is not None:
+                logger.info("Log profile: {}", self.profiler.artifact)
+                log_queue.log_dict(run_id, stages.profiles, self.profiler.artifact)
+                log_queue.log_metrics(run_id, stages.metrics())
+            # memory
+            log_queue.log_metrics(run_id, {"peak_rss": peak_rss()})
+            logger.debug("- Logging queue: {}", log_queue.stats())
             # notify
             self.alerts_service.notify(
                 title="Tuning Job Finished", message=f"Best score: {best_score}"
             )
+        if self.lean:
+            return self.summary(
+                run_id=run.info.run_id,
+                best_score=best_score,
+                best_params=best_params,
+                n_candidates=len(results),
+            )
         return locals()
@@ -1,11 +1,19 @@
 from .example import ExampleMetric, Threshold
 import typing as T
 import pydantic as pdt
-from ._base import Metric
+from ._base import Metric, Bootstrap, Interval
 
 MetricKind = ExampleMetric
 MetricsKind: T.TypeAlias = list[
     T.Annotated[MetricKind, pdt.Field(discriminator="KIND")]
 ]
 
-__all__ = ["MetricKind", "MetricsKind", "Metric", "ExampleMetric", "Threshold"]
\ No newline at end of file
+__all__ = [
+    "MetricKind",
+    "MetricsKind",
+    "Metric",
+    "ExampleMetric",
+    "Threshold",
+    "Bootstrap",
+    "Interval",
+]
\ No newline at end of file
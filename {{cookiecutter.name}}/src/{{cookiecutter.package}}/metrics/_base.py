@@ -1,25 +1,37 @@
 from __future__ import annotations
 
 import abc
+import concurrent.futures as cf
 import typing as T
 
-import mlflow
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 import pydantic as pdt
-from mlflow.metrics import MetricValue
 
+if T.TYPE_CHECKING:  # mlflow is imported lazily
+    import mlflow
+    from mlflow.metrics import MetricValue
 
 from ..io.schemas import Inputs, Targets, Outputs, OutputsSchema, TargetsSchema
-from ..models import Model
+from ..models import Model, PredictionCache
 
 # %% TYPINGS
 
-MlflowMetric: T.TypeAlias = MetricValue
-MlflowThreshold: T.TypeAlias = mlflow.models.MetricThreshold
+MlflowMetric: T.TypeAlias = "MetricValue"
+MlflowThreshold: T.TypeAlias = "mlflow.models.MetricThreshold"
 MlflowModelValidationFailedException: T.TypeAlias = (
-    mlflow.models.evaluation.validation.ModelValidationFailedException
+    "mlflow.models.evaluation.validation.ModelValidationFailedException"
 )
 
+# Scores of a metric over a batch of resamples
+Scores: T.TypeAlias = npt.NDArray[np.float64]
+# Confidence interval of a metric
+Interval = tuple[
+    T.Annotated[float, "lower bound"],
+    T.Annotated[float, "upper bound"],
+]
+
 # %% METRICS
 
 
@@ -51,27 +63,67 @@ class Metric(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
             float: single result from the metric computation.
         """
 
-    def scorer(self, model: Model, inputs: Inputs, targets: Targets) -> float:
+    def scores(self, targets: npt.NDArray, outputs: npt.NDArray) -> Scores:
+        """Score a batch of outputs against a batch of targets.
+
+        Override this method with batched numpy operations for fast resampling.
+        The default implementation calls `score` once per row of the batch,
+        with plain dataframes over views of the rows (i.e., without validation).
+
+        Args:
+            targets (npt.NDArray): expected values, one resample per row.
+            outputs (npt.NDArray): predicted values, one resample per row.
+
+        Returns:
+            Scores: one result from the metric computation per row.
+        """
+        scores = np.empty(len(targets), dtype=np.float64)
+        for i, (target, output) in enumerate(zip(targets, outputs)):
+            score_targets = T.cast(
+                Targets, pd.DataFrame({TargetsSchema.target: target}, copy=False)
+            )
+            score_outputs = T.cast(
+                Outputs, pd.DataFrame({OutputsSchema.prediction: output}, copy=False)
+            )
+            scores[i] = self.score(targets=score_targets, outputs=score_outputs)
+        return scores
+
+    def scorer(
+        self,
+        model: Model,
+        inputs: Inputs,
+        targets: Targets,
+        cache: PredictionCache | None = None,
+    ) -> float:
         """Score model outputs against targets.
 
         Args:
             model (Model): model to evaluate.
             inputs (schemas.Inputs): model inputs values.
             targets (schemas.Targets): model expected values.
+            cache (PredictionCache | None): reuse the outputs of the same model and inputs.
 
         Returns:
             float: single result from the metric computation.
         """
-        outputs = model.predict(inputs=inputs)
+        if cache is None:
+            outputs = model.predict(inputs=inputs)
+        else:
+            outputs = cache.predict(model=model, inputs=inputs)
         score = self.score(targets=targets, outputs=outputs)
         return score
 
     def to_mlflow(self) -> MlflowMetric:
         """Convert the metric to an Mlflow metric.
 
+        The evaluation function passes the underlying arrays to `Metric.scores`.
+        i.e., without rebuilding or validating dataframes on every evaluation.
+
         Returns:
             MlflowMetric: the Mlflow metric.
         """
+        import mlflow
+        from mlflow.metrics import MetricValue
 
         def eval_fn(
             predictions: pd.Series[int], targets: pd.Series[int]
@@ -85,14 +137,107 @@ class Metric(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
             Returns:
                 MlflowMetric: the mlflow metric.
             """
-            score_targets = Targets({TargetsSchema.cnt: targets}, index=targets.index)
-            score_outputs = Outputs(
-                {OutputsSchema.prediction: predictions}, index=predictions.index
-            )
+            # score a batch of one resample with views of the series arrays
+            score_targets = targets.to_numpy()[np.newaxis, :]
+            score_outputs = predictions.to_numpy()[np.newaxis, :]
             sign = 1 if self.greater_is_better else -1  # reverse the effect
-            score = self.score(targets=score_targets, outputs=score_outputs)
-            return MlflowMetric(aggregate_results={self.name: score * sign})
+            score = self.scores(targets=score_targets, outputs=score_outputs)[0]
+            return MetricValue(aggregate_results={self.name: float(score) * sign})
 
         return mlflow.metrics.make_metric(
             eval_fn=eval_fn, name=self.name, greater_is_better=self.greater_is_better
         )
+
+
+# %% BOOTSTRAP
+
+# Arrays shared with the bootstrap worker processes
+_BOOTSTRAP: dict[str, T.Any] = {}
+
+
+def _bootstrap_init(
+    metrics: T.Sequence[Metric], targets: npt.NDArray, outputs: npt.NDArray
+) -> None:
+    """Share the bootstrap arrays once per worker process.
+
+    Args:
+        metrics (T.Sequence[Metric]): metrics to compute.
+        targets (npt.NDArray): expected values.
+        outputs (npt.NDArray): predicted values.
+    """
+    _BOOTSTRAP.update(metrics=metrics, targets=targets, outputs=outputs)
+
+
+def _bootstrap_chunk(seed: np.random.SeedSequence, size: int) -> npt.NDArray[np.float64]:
+    """Score a chunk of bootstrap resamples with the shared arrays.
+
+    Args:
+        seed (np.random.SeedSequence): seed of the chunk resampling.
+        size (int): number of resamples in the chunk.
+
+    Returns:
+        npt.NDArray[np.float64]: scores with shape (metrics, size).
+    """
+    metrics, targets, outputs = (_BOOTSTRAP[key] for key in ("metrics", "targets", "outputs"))
+    rng = np.random.default_rng(seed)
+    # draw all the resample indices of the chunk as one matrix
+    indices = rng.integers(0, len(targets), size=(size, len(targets)))
+    targets_, outputs_ = targets[indices], outputs[indices]
+    return np.stack([metric.scores(targets=targets_, outputs=outputs_) for metric in metrics])
+
+
+class Bootstrap(pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
+    """Estimate confidence intervals of metrics with bootstrap resampling.
+
+    Resamples are drawn as index matrices and scored in batches with `Metric.scores`.
+
+    Parameters:
+        n_resamples (int): number of bootstrap resamples.
+        confidence_level (float): confidence level of the intervals.
+        chunk_size (int): number of resamples scored per batch.
+        n_jobs (int): number of processes to score the batches.
+        random_state (int): seed of the resampling.
+    """
+
+    n_resamples: int = pdt.Field(default=1000, gt=0)
+    confidence_level: float = pdt.Field(default=0.95, gt=0, lt=1)
+    chunk_size: int = pdt.Field(default=100, gt=0)
+    n_jobs: int = pdt.Field(default=1, gt=0)
+    random_state: int = 42
+
+    def intervals(
+        self, metrics: T.Sequence[Metric], targets: Targets, outputs: Outputs
+    ) -> list[Interval]:
+        """Compute the confidence intervals of the metrics.
+
+        All the metrics are scored on the same resamples.
+
+        Args:
+            metrics (T.Sequence[Metric]): metrics to compute.
+            targets (Targets): expected values.
+            outputs (Outputs): predicted values.
+
+        Returns:
+            list[Interval]: confidence interval of each metric.
+        """
+        targets_ = targets[TargetsSchema.target].to_numpy()
+        outputs_ = outputs[OutputsSchema.prediction].to_numpy()
+        sizes = [
+            min(self.chunk_size, self.n_resamples - start)
+            for start in range(0, self.n_resamples, self.chunk_size)
+        ]
+        seeds = np.random.SeedSequence(self.random_state).spawn(len(sizes))
+        if self.n_jobs == 1:
+            _bootstrap_init(metrics=metrics, targets=targets_, outputs=outputs_)
+            chunks = list(map(_bootstrap_chunk, seeds, sizes))
+        else:
+            with cf.ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_bootstrap_init,
+                initargs=(metrics, targets_, outputs_),
+            ) as executor:
+                chunks = list(executor.map(_bootstrap_chunk, seeds, sizes))
+        scores = np.concatenate(chunks, axis=1)
+        alpha = (1 - self.confidence_level) / 2
+        lowers, uppers = np.quantile(scores, [alpha, 1 - alpha], axis=1)
+        return [(float(lower), float(upper)) for lower, upper in zip(lowers, uppers)]
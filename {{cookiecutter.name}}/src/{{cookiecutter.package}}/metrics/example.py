@@ -3,11 +3,13 @@ from __future__ import annotations
 import abc
 import typing as T
 
+import numpy as np
+import numpy.typing as npt
 import pydantic as pdt
 
 from ..io.schemas import Targets, Outputs
 
-from ._base import Metric, MlflowThreshold
+from ._base import Metric, MlflowThreshold, Scores
 
 
 class ExampleMetric(Metric):
@@ -27,6 +29,10 @@ class ExampleMetric(Metric):
     def score(self, targets: Targets, outputs: Outputs) -> float:
         return 50.00
 
+    @T.override
+    def scores(self, targets: npt.NDArray, outputs: npt.NDArray) -> Scores:
+        return np.full(len(targets), 50.00)
+
 
 # %% THRESHOLDS
 
@@ -51,6 +57,8 @@ class Threshold(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"
         Returns:
             MlflowThreshold: the mlflow threshold.
         """
-        return MlflowThreshold(
+        import mlflow
+
+        return mlflow.models.MetricThreshold(
             threshold=self.threshold, greater_is_better=self.greater_is_better
         )
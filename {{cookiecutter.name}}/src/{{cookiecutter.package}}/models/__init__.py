@@ -1,6 +1,14 @@
 from .example import ExampleModel
-from ._base import Model, ParamKey, Params, ParamValue
+from ._base import Model, ParamKey, Params, ParamValue, PredictionCache
 
 ModelKind = ExampleModel
 
-__all__ = ["ExampleModel", "ModelKind", "Model", "ParamKey", "Params", "ParamValue"]
+__all__ = [
+    "ExampleModel",
+    "ModelKind",
+    "Model",
+    "ParamKey",
+    "Params",
+    "ParamValue",
+    "PredictionCache",
+]
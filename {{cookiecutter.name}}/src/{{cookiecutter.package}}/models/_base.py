@@ -3,6 +3,8 @@
 # %% IMPORTS
 
 import abc
+import functools
+import itertools
 import typing as T
 
 import pydantic as pdt
@@ -18,15 +20,46 @@ Params = dict[ParamKey, ParamValue]
 
 # %% MODELS
 
+# Unique id of each fit in the process, to identify the fitted states
+_FITS = itertools.count(1)
+
 
 class Model(abc.ABC, pdt.BaseModel, strict=True, frozen=False, extra="forbid"):
     """Base class for a project model.
 
     Use a model to adapt AI/ML frameworks.
     e.g., to swap easily one model with another.
+
+    Declare the params in WARM_PARAMS to extend a fit instead of refitting from scratch.
     """
 
     KIND: str
+    # params that can change between fits without refitting from scratch
+    WARM_PARAMS: T.ClassVar[frozenset[ParamKey]] = frozenset()
+
+    # id of the last fit of the model (0 if not fitted)
+    _fit_id: int = pdt.PrivateAttr(default=0)
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: T.Any) -> None:
+        """Track the fits of the subclasses to identify their fitted states.
+
+        Args:
+            kwargs (T.Any): arguments of the subclass.
+        """
+        super().__pydantic_init_subclass__(**kwargs)
+        fit = cls.__dict__.get("fit")
+        if fit is None or getattr(fit, "__isabstractmethod__", False):
+            return
+
+        @functools.wraps(fit)
+        def tracked(self: Model, *args: T.Any, **kwargs: T.Any) -> T.Any:
+            """Fit the model and record a new fitted state."""
+            model = fit(self, *args, **kwargs)
+            self._fit_id = next(_FITS)
+            return model
+
+        cls.fit = tracked  # type: ignore[method-assign]
 
     def get_params(self, deep: bool = True) -> Params:
         """Get the model params.
@@ -43,6 +76,16 @@ class Model(abc.ABC, pdt.BaseModel, strict=True, frozen=False, extra="forbid"):
                 params[key] = value
         return params
 
+    def fingerprint(self) -> str:
+        """Get a fingerprint of the model state.
+
+        The fingerprint changes with the params and with each fit of the model.
+
+        Returns:
+            str: identifier of the current model state.
+        """
+        return f"{self.KIND}-{self._fit_id}-{hash(self.model_dump_json())}"
+
     def set_params(self, **params: ParamValue) -> T.Self:
         """Set the model params in place.
 
@@ -53,6 +96,22 @@ class Model(abc.ABC, pdt.BaseModel, strict=True, frozen=False, extra="forbid"):
             setattr(self, key, value)
         return self
 
+    def warm_start(self, **params: ParamValue) -> T.Self:
+        """Set the warm-startable params in place and keep the fitted state.
+
+        The next fit extends the previous fit (e.g., with more boosting rounds).
+        Override this method to enable the warm-start of the internal model.
+
+        Raises:
+            ValueError: if a param is not declared in WARM_PARAMS.
+
+        Returns:
+            T.Self: instance of the model.
+        """
+        if cold := params.keys() - self.WARM_PARAMS:
+            raise ValueError(f"Params cannot be warm-started: {sorted(cold)}")
+        return self.set_params(**params)
+
     @abc.abstractmethod
     def fit(self, inputs: schemas.Inputs, targets: schemas.Targets) -> T.Self:
         """Fit the model on the given inputs and targets.
@@ -102,3 +161,45 @@ class Model(abc.ABC, pdt.BaseModel, strict=True, frozen=False, extra="forbid"):
             T.Any: any internal model (either empty or fitted).
         """
         raise NotImplementedError()
+
+
+# %% CACHES
+
+
+class PredictionCache:
+    """Cache the outputs of a model for the same model state and inputs.
+
+    Use a cache per fold to predict only once for several metrics and scorers.
+    The inputs are identified by object, without hashing their content:
+    pass the same inputs object to each scorer, and don't modify it in place.
+
+    Parameters:
+        hits (int): number of predictions reused from the cache.
+        misses (int): number of predictions computed by the model.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty prediction cache."""
+        self.outputs: dict[tuple[str, int], schemas.Outputs] = {}
+        self.inputs: dict[int, schemas.Inputs] = {}  # keep the ids of the inputs unique
+        self.hits = 0
+        self.misses = 0
+
+    def predict(self, model: Model, inputs: schemas.Inputs) -> schemas.Outputs:
+        """Generate outputs with the model or reuse them from the cache.
+
+        Args:
+            model (Model): model to predict with.
+            inputs (schemas.Inputs): model prediction inputs.
+
+        Returns:
+            schemas.Outputs: model prediction outputs.
+        """
+        key = (model.fingerprint(), id(inputs))
+        if key in self.outputs:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.inputs[id(inputs)] = inputs
+            self.outputs[key] = model.predict(inputs=inputs)
+        return self.outputs[key]
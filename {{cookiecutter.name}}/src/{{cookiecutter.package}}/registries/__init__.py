@@ -5,6 +5,7 @@ from .example import (
     BuiltinLoader,
     BuiltinSaver,
 )
+from ._store import ChunkStore
 
 SaverKind = CustomSaver | BuiltinSaver
 LoaderKind = CustomLoader | BuiltinLoader
@@ -12,6 +13,7 @@ RegisterKind = MlflowRegister
 
 
 __all__ = [
+    "ChunkStore",
     "CustomSaver",
     "BuiltinSaver",
     "SaverKind",
@@ -3,27 +3,83 @@
 # %% IMPORTS
 
 import abc
+import collections
+import os
+import threading
+import time
 import typing as T
 
-import mlflow
+import numpy.typing as npt
 import pydantic as pdt
 
+from ..io import Sampler
+from ._store import ChunkStore, download_model
 from ..signers import Signature
 from ..io.schemas import Inputs, Outputs
 
 from ..models import Model
+from ..services import shared_client
 
+if T.TYPE_CHECKING:  # mlflow is imported lazily
+    import mlflow
 
 # %% TYPES
 
 # Results of model registry operations
-Info: T.TypeAlias = mlflow.models.model.ModelInfo
-Alias: T.TypeAlias = mlflow.entities.model_registry.ModelVersion
-Version: T.TypeAlias = mlflow.entities.model_registry.ModelVersion
+Info: T.TypeAlias = "mlflow.models.model.ModelInfo"
+Alias: T.TypeAlias = "mlflow.entities.model_registry.ModelVersion"
+Version: T.TypeAlias = "mlflow.entities.model_registry.ModelVersion"
 
 # %% HELPERS
 
 
+def resolve(uri: str) -> str:
+    """Resolve the alias or stage of a model URI to its immutable version.
+
+    e.g., models:/name@Champion -> models:/name/3
+
+    Args:
+        uri (str): URI of a model (unchanged if not an alias or a stage).
+
+    Raises:
+        ValueError: if the stage of the model has no version.
+
+    Returns:
+        str: URI of the model version.
+    """
+    if not uri.startswith("models:/"):
+        return uri  # e.g., runs:/ or local paths are immutable
+    path = uri.removeprefix("models:/")
+    if "@" in path:
+        name, alias = path.split("@", 1)
+        version = shared_client().get_model_version_by_alias(name=name, alias=alias)
+        return f"models:/{name}/{version.version}"
+    name, _, stage = path.partition("/")
+    if stage.isdigit():
+        return uri
+    versions = shared_client().get_latest_versions(name=name, stages=[stage])
+    if not versions:
+        raise ValueError(f"No model version in stage '{stage}' for model: {name}")
+    return f"models:/{name}/{versions[0].version}"
+
+
+def footprint(path: str) -> float:
+    """Get the size of a local model directory, as an estimate of its memory.
+
+    Args:
+        path (str): local path of the model.
+
+    Returns:
+        float: size of the model files (in MB).
+    """
+    total = sum(
+        os.path.getsize(os.path.join(root, file))
+        for root, _, files in os.walk(path)
+        for file in files
+    )
+    return total / 2**20
+
+
 # %% SAVERS
 class Saver(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
     """Base class for saving models in registry.
@@ -33,11 +89,15 @@ class Saver(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
 
     Parameters:
         path (str): model path inside the Mlflow store.
+        sampler (Sampler): sampler of the input example stored with the model.
+        store (ChunkStore | None): store of the large model files (in the run if None).
     """
 
     KIND: str
 
     path: str = "model"
+    sampler: Sampler = Sampler(size=10)
+    store: ChunkStore | None = None
 
     @abc.abstractmethod
     def save(
@@ -63,10 +123,19 @@ class Loader(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
 
     Separate model definition from deserialization.
     e.g., to switch between deserialization flavors.
+
+    Parameters:
+        cache_size (int): maximum number of models kept loaded in the process (0 to disable).
+        cache_memory (float | None): maximum size of the models kept loaded (in MB).
+        cache_ttl (float): seconds before resolving a model alias or stage again.
     """
 
     KIND: str
 
+    cache_size: int = pdt.Field(default=4, ge=0)
+    cache_memory: float | None = None
+    cache_ttl: float = 60.0
+
     class Adapter(abc.ABC):
         """Adapt any model for the project inference."""
 
@@ -81,6 +150,19 @@ class Loader(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
                 schemas.Outputs: validated outputs of the project model.
             """
 
+        def predict_array(self, inputs: Inputs) -> npt.NDArray[T.Any]:
+            """Generate predictions as an array, without the dataframe layout.
+
+            Override this method to skip the dataframe creation on high-throughput paths.
+
+            Args:
+                inputs (schemas.Inputs): validated inputs for the project model.
+
+            Returns:
+                npt.NDArray[T.Any]: outputs of the project model, in the row order of the inputs.
+            """
+            return self.predict(inputs=inputs).to_numpy()
+
     @abc.abstractmethod
     def load(self, uri: str) -> "Loader.Adapter":
         """Load a model from the model registry.
@@ -92,6 +174,157 @@ class Loader(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
             Loader.Adapter: model loaded.
         """
 
+    def load_cached(self, uri: str) -> "Loader.Adapter":
+        """Load a model, or reuse it from the models loaded in the process.
+
+        The models are keyed by their immutable version (aliases and stages are resolved).
+        A model is loaded once, even when requested by several threads at once.
+        Its files are downloaded to a temporary directory, removed once it is loaded.
+
+        Args:
+            uri (str): URI of a model to load.
+
+        Returns:
+            Loader.Adapter: model loaded.
+        """
+        if self.cache_size == 0:
+            return self.load(uri=uri)
+        version = _MODELS.resolve(uri=uri, ttl=self.cache_ttl)
+        key = f"{self.KIND}:{version}"
+        with _MODELS.loading(key=key):
+            adapter = _MODELS.get(key=key)
+            if adapter is None:
+                with download_model(uri=version) as path:
+                    adapter = self.load(uri=path)
+                    memory = footprint(path)
+                _MODELS.put(key=key, adapter=adapter, memory=memory)
+                _MODELS.evict(size=self.cache_size, memory=self.cache_memory)
+        return adapter
+
+    @staticmethod
+    def cache_stats() -> dict[str, float]:
+        """Get the statistics of the models loaded in the process.
+
+        Returns:
+            dict[str, float]: hits, misses, number, and size (in MB) of the models.
+        """
+        return _MODELS.stats()
+
+
+# %% CACHES
+
+
+class ModelCache:
+    """Keep the models loaded in the process, evicting the least recently used.
+
+    Parameters:
+        hits (int): number of models reused from the cache.
+        misses (int): number of models loaded from the registry.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty model cache."""
+        self.adapters: collections.OrderedDict[str, tuple[Loader.Adapter, float]] = (
+            collections.OrderedDict()
+        )
+        self.versions: dict[str, tuple[str, float]] = {}
+        self.locks: dict[str, threading.Lock] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, uri: str, ttl: float) -> str:
+        """Resolve a model URI to its immutable version, at most once per time-to-live.
+
+        Args:
+            uri (str): URI of a model.
+            ttl (float): seconds before resolving the URI again.
+
+        Returns:
+            str: URI of the model version.
+        """
+        now = time.monotonic()
+        with self.lock:
+            version, expires = self.versions.get(uri, ("", 0.0))
+        if now >= expires:
+            version = resolve(uri=uri)
+            with self.lock:
+                self.versions[uri] = (version, now + ttl)
+        return version
+
+    def loading(self, key: str) -> threading.Lock:
+        """Get the lock held while a model is loaded, to load it once.
+
+        Args:
+            key (str): key of the model.
+
+        Returns:
+            threading.Lock: lock of the model.
+        """
+        with self.lock:
+            return self.locks.setdefault(key, threading.Lock())
+
+    def get(self, key: str) -> Loader.Adapter | None:
+        """Get a loaded model and mark it as recently used.
+
+        Args:
+            key (str): key of the model.
+
+        Returns:
+            Loader.Adapter | None: model loaded, or None if not cached.
+        """
+        with self.lock:
+            if key not in self.adapters:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.adapters.move_to_end(key)
+            return self.adapters[key][0]
+
+    def put(self, key: str, adapter: Loader.Adapter, memory: float) -> None:
+        """Add a loaded model to the cache.
+
+        Args:
+            key (str): key of the model.
+            adapter (Loader.Adapter): model loaded.
+            memory (float): size of the model (in MB).
+        """
+        with self.lock:
+            self.adapters[key] = (adapter, memory)
+
+    def evict(self, size: int, memory: float | None = None) -> None:
+        """Evict the least recently used models above the limits (keeping the last one).
+
+        Args:
+            size (int): maximum number of models.
+            memory (float | None): maximum size of the models (in MB).
+        """
+        with self.lock:
+            while len(self.adapters) > max(size, 1) or (
+                memory is not None
+                and len(self.adapters) > 1
+                and sum(memory_ for _, memory_ in self.adapters.values()) > memory
+            ):
+                self.adapters.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        """Get the statistics of the cache.
+
+        Returns:
+            dict[str, float]: hits, misses, number, and size (in MB) of the models.
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "models": len(self.adapters),
+                "memory": sum(memory for _, memory in self.adapters.values()),
+            }
+
+
+# Models loaded in the process, shared by the loaders
+_MODELS = ModelCache()
+
 
 class Register(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
     """Base class for registring models to a location.
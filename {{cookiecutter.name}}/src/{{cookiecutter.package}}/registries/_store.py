@@ -0,0 +1,259 @@
+"""Store the model files as deduplicated chunks addressed by their content.
+
+A model saved with a store is not a regular mlflow model: its large files are
+replaced by a manifest of chunks. Load it with the project loaders, which
+reassemble the files first. Plain mlflow tools (e.g., `mlflow.pyfunc.load_model`
+or `mlflow models serve`) cannot open it.
+"""
+
+# %% IMPORTS
+
+from __future__ import annotations
+
+import concurrent.futures as cf
+import contextlib as ctx
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import typing as T
+import zlib
+
+import pydantic as pdt
+
+if T.TYPE_CHECKING:  # mlflow is imported lazily
+    import mlflow
+
+# %% TYPES
+
+# Model saving information
+Info: T.TypeAlias = "mlflow.models.model.ModelInfo"
+# Chunks of the model files, and the store to reassemble them
+Manifest = dict[str, T.Any]
+
+# %% CONSTANTS
+
+# Name of the manifest in the model directory
+MANIFEST = "chunks.json"
+# Files always kept in the model artifacts (e.g., read by the registry)
+KEEP = frozenset({"MLmodel", MANIFEST})
+
+# %% STORES
+
+
+class ChunkStore(pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
+    """Store the large model files as compressed chunks, addressed by their hash.
+
+    A chunk already in the store is not written again, so identical models and
+    files shared between models are stored once. The chunks are written and read
+    by a pool of threads. The store is a directory, e.g., on a shared filesystem.
+
+    Note: the models saved with a store can only be loaded by the project loaders.
+
+    Parameters:
+        path (str): directory of the chunks.
+        chunk_size (int): number of bytes per chunk.
+        min_size (int): files smaller than this are kept in the model artifacts.
+        level (int): zlib compression level of the chunks.
+        workers (int): number of threads writing/reading the chunks.
+    """
+
+    path: str = "outcomes/chunks"
+    chunk_size: int = pdt.Field(default=2**22, gt=0)
+    min_size: int = pdt.Field(default=2**20, ge=0)
+    level: int = pdt.Field(default=3, ge=0, le=9)
+    workers: int = pdt.Field(default=8, gt=0)
+
+    def put(self, directory: str) -> Manifest:
+        """Move the large files of a model directory into the store.
+
+        The files are replaced by a manifest of their chunks in the directory.
+
+        Args:
+            directory (str): local directory of the model.
+
+        Returns:
+            Manifest: chunks of the files, with the number of chunks and bytes written.
+        """
+        files: dict[str, T.Any] = {}
+        stats = {"chunks": 0, "written": 0, "bytes": 0, "bytes_written": 0}
+        claimed: set[str] = set()  # chunks written by the threads, e.g., repeated in a file
+        lock = threading.Lock()
+        with cf.ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for root, _, names in os.walk(directory):
+                for name in names:
+                    file = os.path.join(root, name)
+                    size = os.path.getsize(file)
+                    if size < self.min_size or os.path.relpath(file, directory) in KEEP:
+                        continue
+                    offsets = range(0, size, self.chunk_size)
+                    chunks = list(
+                        pool.map(lambda offset: self._write(file, offset, claimed, lock), offsets)
+                    )
+                    files[os.path.relpath(file, directory)] = {
+                        "size": size,
+                        "chunks": [hash_ for hash_, _ in chunks],
+                    }
+                    stats["chunks"] += len(chunks)
+                    stats["written"] += sum(written > 0 for _, written in chunks)
+                    stats["bytes"] += size
+                    stats["bytes_written"] += sum(written for _, written in chunks)
+                    os.remove(file)
+        manifest = {"store": self.model_dump(), "files": files, "stats": stats}
+        with open(os.path.join(directory, MANIFEST), "w") as writer:
+            json.dump(manifest, writer, indent=2)
+        return manifest
+
+    def get(self, directory: str, manifest: Manifest) -> None:
+        """Reassemble the files of a model directory from the store.
+
+        Args:
+            directory (str): local directory of the model.
+            manifest (Manifest): chunks of the files.
+        """
+        with cf.ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = []
+            for relpath, entry in manifest["files"].items():
+                file = os.path.join(directory, relpath)
+                os.makedirs(os.path.dirname(file), exist_ok=True)
+                with open(file, "wb") as writer:
+                    writer.truncate(entry["size"])
+                for index, hash_ in enumerate(entry["chunks"]):
+                    offset = index * manifest["store"]["chunk_size"]
+                    futures.append(pool.submit(self._read, file, offset, hash_))
+            for future in futures:
+                future.result()  # raise the errors of the threads
+
+    def _chunk(self, hash_: str) -> str:
+        """Get the path of a chunk in the store.
+
+        Args:
+            hash_ (str): content hash of the chunk.
+
+        Returns:
+            str: path of the chunk.
+        """
+        return os.path.join(self.path, hash_[:2], hash_)
+
+    def _write(
+        self, file: str, offset: int, claimed: set[str], lock: threading.Lock
+    ) -> tuple[str, int]:
+        """Write a chunk of a file to the store, unless the store already has it.
+
+        Args:
+            file (str): path of the file.
+            offset (int): offset of the chunk in the file.
+            claimed (set[str]): hashes of the chunks written by the other threads.
+            lock (threading.Lock): lock of the claimed hashes.
+
+        Returns:
+            tuple[str, int]: content hash of the chunk, and number of bytes written.
+        """
+        with open(file, "rb") as reader:
+            reader.seek(offset)
+            data = reader.read(self.chunk_size)
+        hash_ = hashlib.sha256(data).hexdigest()
+        path = self._chunk(hash_)
+        with lock:  # a single thread writes each new chunk
+            if hash_ in claimed or os.path.exists(path):
+                return hash_, 0
+            claimed.add(hash_)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        compressed = zlib.compress(data, level=self.level)
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), delete=False) as writer:
+            writer.write(compressed)
+        os.replace(writer.name, path)  # no partial chunk on interruption
+        return hash_, len(compressed)
+
+    def _read(self, file: str, offset: int, hash_: str) -> None:
+        """Read a chunk from the store into a file.
+
+        Args:
+            file (str): path of the file.
+            offset (int): offset of the chunk in the file.
+            hash_ (str): content hash of the chunk.
+        """
+        with open(self._chunk(hash_), "rb") as reader:
+            data = zlib.decompress(reader.read())
+        if hashlib.sha256(data).hexdigest() != hash_:
+            raise ValueError(f"Corrupted chunk in the store: {hash_}")
+        with open(file, "r+b") as writer:
+            writer.seek(offset)
+            writer.write(data)
+
+
+# %% HELPERS
+
+
+def log_model(store: ChunkStore, directory: str, artifact_path: str) -> Info:
+    """Log a model directory saved locally to the active run, with its large files chunked.
+
+    Args:
+        store (ChunkStore): store of the chunks.
+        directory (str): local directory of the saved model.
+        artifact_path (str): model path inside the Mlflow store.
+
+    Returns:
+        Info: model saving information.
+    """
+    import mlflow
+
+    manifest = store.put(directory=directory)
+    mlflow.log_artifacts(local_dir=directory, artifact_path=artifact_path)
+    mlflow.log_metrics({f"chunks_{key}": value for key, value in manifest["stats"].items()})
+    model = mlflow.models.Model.load(directory)
+    model.run_id = mlflow.active_run().info.run_id
+    model.artifact_path = artifact_path
+    return model.get_model_info()
+
+
+def read_manifest(directory: str) -> Manifest | None:
+    """Read the manifest of the chunked files of a local model directory.
+
+    Args:
+        directory (str): local directory of the model.
+
+    Returns:
+        Manifest | None: chunks of the files, or None if the model is not chunked.
+    """
+    file = os.path.join(directory, MANIFEST)
+    if not os.path.exists(file):
+        return None
+    with open(file) as reader:
+        return T.cast(Manifest, json.load(reader))
+
+
+@ctx.contextmanager
+def download_model(uri: str) -> T.Generator[str, None, None]:
+    """Yield a local directory of a model, with its chunked files reassembled.
+
+    The model is downloaded, or copied if chunked, to a temporary directory
+    removed at the end of the context: the source artifacts are never modified.
+    A local model directory without chunks is used in place.
+
+    Args:
+        uri (str): URI or local path of the model.
+
+    Yields:
+        T.Generator[str, None, None]: local directory of the regular mlflow model.
+    """
+    import mlflow
+
+    if os.path.isdir(uri) and read_manifest(directory=uri) is None:
+        yield uri
+        return
+    with tempfile.TemporaryDirectory(prefix="model-") as tmp:
+        directory = os.path.join(tmp, "model")
+        if os.path.isdir(uri):
+            shutil.copytree(uri, directory)
+        else:  # download to a new directory, even from a local artifact store
+            os.makedirs(directory)
+            directory = mlflow.artifacts.download_artifacts(artifact_uri=uri, dst_path=directory)
+        manifest = read_manifest(directory=directory)
+        if manifest is not None:
+            store = ChunkStore.model_validate(manifest["store"])
+            store.get(directory=directory, manifest=manifest)
+            os.remove(os.path.join(directory, MANIFEST))  # a regular model, in the copy only
+        yield directory
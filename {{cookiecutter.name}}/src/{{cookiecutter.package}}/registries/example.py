@@ -1,15 +1,24 @@
+from __future__ import annotations
+
+import functools
+import os
+import tempfile
 import typing as T
 
-import mlflow
-from mlflow.pyfunc import PyFuncModel
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
 
 from ..io.schemas import Inputs, Outputs, OutputsSchema
 
 from ._base import Loader, Register, Saver, Version, Info
-from mlflow.pyfunc import PythonModel, PythonModelContext
+from ._store import download_model, log_model
 from ..models import Model
 from ..signers import Signature
 
+if T.TYPE_CHECKING:  # mlflow is imported lazily
+    from mlflow.pyfunc import PyFuncModel, PythonModel, PythonModelContext
+
 class CustomLoader(Loader):
     """Loader for custom models using the Mlflow PyFunc module.
 
@@ -37,7 +46,10 @@ class CustomLoader(Loader):
 
     @T.override
     def load(self, uri: str) -> "CustomLoader.Adapter":
-        model = mlflow.pyfunc.load_model(model_uri=uri)
+        import mlflow.pyfunc
+
+        with download_model(uri=uri) as path:  # the model is loaded in memory
+            model = mlflow.pyfunc.load_model(model_uri=path)
         adapter = CustomLoader.Adapter(model=model)
         return adapter
 
@@ -53,7 +65,10 @@ class BuiltinLoader(Loader):
     KIND: T.Literal["BuiltinLoader"] = "BuiltinLoader"
 
     class Adapter(Loader.Adapter):
-        """Adapt a builtin model for the project inference."""
+        """Adapt a builtin model for the project inference.
+
+        The output columns are computed once, instead of on every prediction.
+        """
 
         def __init__(self, model: PyFuncModel) -> None:
             """Initialize the adapter from an mlflow pyfunc model.
@@ -62,16 +77,23 @@ class BuiltinLoader(Loader):
                 model (PyFuncModel): mlflow pyfunc model.
             """
             self.model = model
+            self.columns = pd.Index(OutputsSchema.to_schema().columns)
 
         @T.override
         def predict(self, inputs: Inputs) -> Outputs:
-            columns = list(OutputsSchema.to_schema().columns)
-            outputs = self.model.predict(data=inputs)  # unchecked data!
-            return Outputs(outputs, columns=columns, index=inputs.index)
+            outputs = self.predict_array(inputs=inputs)  # unchecked data!
+            return Outputs(outputs, columns=self.columns, index=inputs.index, copy=False)
+
+        @T.override
+        def predict_array(self, inputs: Inputs) -> npt.NDArray[T.Any]:
+            return np.asarray(self.model.predict(data=inputs))
 
     @T.override
     def load(self, uri: str) -> "BuiltinLoader.Adapter":
-        model = mlflow.pyfunc.load_model(model_uri=uri)
+        import mlflow.pyfunc
+
+        with download_model(uri=uri) as path:  # the model is loaded in memory
+            model = mlflow.pyfunc.load_model(model_uri=path)
         adapter = BuiltinLoader.Adapter(model=model)
         return adapter
 
@@ -85,17 +107,48 @@ class MlflowRegister(Register):
 
     @T.override
     def register(self, name: str, model_uri: str) -> Version:
+        import mlflow
+
         return mlflow.register_model(name=name, model_uri=model_uri, tags=self.tags)
 
-class CustomSaver(Saver):
-    """Saver for project models using the Mlflow PyFunc module.
+class _LazyClass:
+    """Create a class on its first access, e.g., to subclass a lazily imported class.
 
-    https://mlflow.org/docs/latest/python_api/mlflow.pyfunc.html
+    The class is created once, so it is pickled by reference like a regular class.
+
+    Parameters:
+        factory (T.Callable[[], type]): create the class.
     """
 
-    KIND: T.Literal["CustomSaver"] = "CustomSaver"
+    def __init__(self, factory: T.Callable[[], type]) -> None:
+        """Initialize the lazy class.
+
+        Args:
+            factory (T.Callable[[], type]): create the class.
+        """
+        self.factory = functools.cache(factory)
+
+    def __get__(self, instance: T.Any, owner: type | None = None) -> type:
+        """Create the class on first access, then return the same class.
 
-    class Adapter(PythonModel):  # type: ignore[misc]
+        Args:
+            instance (T.Any): instance of the owner class (ignored).
+            owner (type | None): owner class (ignored).
+
+        Returns:
+            type: the class created by the factory.
+        """
+        return self.factory()
+
+def _custom_saver_adapter() -> type[PythonModel]:
+    """Create the adapter of the custom saver, a subclass of mlflow PythonModel.
+
+    Returns:
+        type[PythonModel]: CustomSaver.Adapter class, importable by its qualified name.
+    """
+    from mlflow.pyfunc import PythonModel
+
+    class Adapter(PythonModel):
         """Adapt a custom model to the Mlflow PyFunc flavor for saving operations.
 
         https://mlflow.org/docs/latest/python_api/mlflow.pyfunc.html?#mlflow.pyfunc.PythonModel
@@ -118,7 +171,7 @@ class CustomSaver(Saver):
             """Generate predictions with a custom model for the given inputs.
 
             Args:
-                context (mlflow.PythonModelContext): mlflow context.
+                context (PythonModelContext): mlflow context.
                 model_input (Inputs): inputs for the mlflow model.
                 params (dict[str, T.Any] | None): additional parameters.
 
@@ -127,6 +180,21 @@ class CustomSaver(Saver):
             """
             return self.model.predict(inputs=model_input)
 
+    # pickled by reference: the saved models keep loading CustomSaver.Adapter
+    Adapter.__qualname__ = "CustomSaver.Adapter"
+    return Adapter
+
+class CustomSaver(Saver):
+    """Saver for project models using the Mlflow PyFunc module.
+
+    https://mlflow.org/docs/latest/python_api/mlflow.pyfunc.html
+    """
+
+    KIND: T.Literal["CustomSaver"] = "CustomSaver"
+
+    # subclass of mlflow PythonModel, created on first access to import mlflow lazily
+    Adapter: T.ClassVar[_LazyClass] = _LazyClass(_custom_saver_adapter)
+
     @T.override
     def save(
         self,
@@ -134,13 +202,25 @@ class CustomSaver(Saver):
         signature: Signature,
         input_example: Inputs,
     ) -> Info:
+        import mlflow.pyfunc
+
         adapter = CustomSaver.Adapter(model=model)
-        return mlflow.pyfunc.log_model(
-            python_model=adapter,
-            signature=signature,
-            artifact_path=self.path,
-            input_example=input_example,
-        )
+        if self.store is None:
+            return mlflow.pyfunc.log_model(
+                python_model=adapter,
+                signature=signature,
+                artifact_path=self.path,
+                input_example=self.sampler.sample(input_example),
+            )
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = os.path.join(tmp, "model")
+            mlflow.pyfunc.save_model(
+                path=directory,
+                python_model=adapter,
+                signature=signature,
+                input_example=self.sampler.sample(input_example),
+            )
+            return log_model(store=self.store, directory=directory, artifact_path=self.path)
 
 
 class BuiltinSaver(Saver):
@@ -163,11 +243,23 @@ class BuiltinSaver(Saver):
         signature: Signature,
         input_example: Inputs,
     ) -> Info:
+        import mlflow
+
         builtin_model = model.get_internal_model()
         module = getattr(mlflow, self.flavor)
-        return module.log_model(
-            builtin_model,
-            artifact_path=self.path,
-            signature=signature,
-            input_example=input_example,
-        )
\ No newline at end of file
+        if self.store is None:
+            return module.log_model(
+                builtin_model,
+                artifact_path=self.path,
+                signature=signature,
+                input_example=self.sampler.sample(input_example),
+            )
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = os.path.join(tmp, "model")
+            module.save_model(
+                builtin_model,
+                path=directory,
+                signature=signature,
+                input_example=self.sampler.sample(input_example),
+            )
+            return log_model(store=self.store, directory=directory, artifact_path=self.path)
@@ -12,11 +12,12 @@ warnings.filterwarnings(action="ignore", category=UserWarning)
 # %% IMPORTS
 
 import argparse
+import hashlib
 import json
+import os
 import sys
+import tempfile
 
-from .settings import MainSettings
-from .io import Config
 # %% PARSERS
 
 parser = argparse.ArgumentParser(description="Run an AI/ML job from YAML/JSON configs.")
@@ -29,24 +30,175 @@ parser.add_argument(
 parser.add_argument(
     "-s", "--schema", action="store_true", help="Print settings schema and exit."
 )
+parser.add_argument(
+    "-p", "--profile", action="store_true", help="Profile the time and memory of the job."
+)
+parser.add_argument(
+    "-r", "--resume", metavar="RUN_ID", help="Resume the Mlflow run of a crashed job."
+)
+
+worker_parser = argparse.ArgumentParser(
+    prog="worker", description="Run the search trials of a shared trial queue."
+)
+worker_parser.add_argument("queue", help="SQLite file of the trial queue (shared filesystem).")
+worker_parser.add_argument(
+    "--lease", type=float, default=60.0, help="Trial claim duration without heartbeat (secs)."
+)
+worker_parser.add_argument(
+    "--poll", type=float, default=1.0, help="Delay between claims on an empty queue (secs)."
+)
+worker_parser.add_argument(
+    "--idle-timeout", type=float, default=None, help="Stop after being idle (secs)."
+)
+
+batch_parser = argparse.ArgumentParser(
+    prog="batch", description="Run a batch of AI/ML jobs in long-lived processes."
+)
+batch_parser.add_argument(
+    "sources",
+    nargs="+",
+    help="Directories (one config set per file) or manifests (one config set per line).",
+)
+batch_parser.add_argument(
+    "-e", "--extras", nargs="*", default=[], help="Config strings for all the jobs."
+)
+batch_parser.add_argument(
+    "-j", "--max-jobs", type=int, default=1, help="Maximum number of jobs running at once."
+)
 
 # %% SCRIPTS
 
 
+def schema() -> dict:
+    """Get the settings schema, cached until the package or pydantic changes.
+
+    The settings import all the jobs and their heavy modules (e.g., pandas, pandera),
+    so the schema is only generated on a cache miss.
+
+    Returns:
+        dict: JSON schema of the settings.
+    """
+    import importlib.metadata
+
+    package = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(importlib.metadata.version("pydantic").encode())
+    for root, dirs, names in os.walk(package):
+        dirs.sort()
+        for name in sorted(names):
+            if name.endswith(".py"):
+                stat = os.stat(os.path.join(root, name))
+                digest.update(f"{root}/{name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(cache, __package__ or "app", f"schema-{digest.hexdigest()[:16]}.json")
+    try:
+        with open(path) as reader:
+            return json.load(reader)
+    except (OSError, ValueError):
+        pass  # missing or corrupted cache
+    from .settings import MainSettings
+
+    schema_ = MainSettings.model_json_schema()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False) as writer:
+            json.dump(schema_, writer)
+        os.replace(writer.name, path)  # no partial cache on interruption
+    except OSError:
+        pass  # read-only cache: generate the schema on each run
+    return schema_
+
+
+def config_sets(source: str) -> list[list[str]]:
+    """Expand a batch source into config sets.
+
+    A directory gives one config set per YAML/JSON file.
+    A manifest gives one config set per line (paths relative to the manifest).
+
+    Args:
+        source (str): path to a directory or a manifest.
+
+    Returns:
+        list[list[str]]: config files of each config set.
+    """
+    if os.path.isdir(source):
+        names = sorted(os.listdir(source))
+        extensions = (".yaml", ".yml", ".json")
+        return [[os.path.join(source, name)] for name in names if name.endswith(extensions)]
+    sets = []
+    root = os.path.dirname(source)
+    with open(source) as reader:
+        for line in reader:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                sets.append([os.path.join(root, file) for file in line.split()])
+    return sets
+
+
+def batch(argv: list[str]) -> int:
+    """Batch script to run many config sets with warm services and data."""
+    from .settings import MainSettings
+    from .io import Config
+    from .jobs import Batch
+
+    args = batch_parser.parse_args(argv)
+    strings = [Config.parse_string(string) for string in args.extras]
+    sets = [files for source in args.sources for files in config_sets(source)]
+    jobs = []
+    for files in sets:  # validate all the configs before running any job
+        configs = [Config.parse_file(file) for file in files]
+        object_ = Config.to_object(Config.merge_configs([*configs, *strings]))
+        jobs.append(MainSettings.model_validate(object_).job)
+    summaries = Batch(max_jobs=args.max_jobs).run(jobs=jobs)
+    for files, summary in zip(sets, summaries):
+        status = "FAILED" if summary["error"] else "OK"
+        print(f"[{status}] {summary['kind']} {' '.join(files)} ({summary['duration']:.1f}s)")
+        if summary["error"]:
+            print(summary["error"], file=sys.stderr)
+    return int(any(summary["error"] for summary in summaries))
+
+
+def worker(argv: list[str]) -> int:
+    """Worker script to run trials from a shared trial queue."""
+    from .searchers._queue import work
+
+    args = worker_parser.parse_args(argv)
+    n_trials = work(
+        path=args.queue, lease=args.lease, poll=args.poll, idle_timeout=args.idle_timeout
+    )
+    print(f"Worker stopped after {n_trials} trials.")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     """Main script for the application."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["worker"]:
+        return worker(argv[1:])
+    if argv[:1] == ["batch"]:
+        return batch(argv[1:])
     args = parser.parse_args(argv)
     if args.schema:
-        schema = MainSettings.model_json_schema()
-        json.dump(schema, sys.stdout, indent=4)
+        json.dump(schema(), sys.stdout, indent=4)
         return 0
+    # heavy modules: only imported once the arguments are valid
+    from .settings import MainSettings
+    from .io import Config
+
     files = [Config.parse_file(file) for file in args.files]
     strings = [Config.parse_string(string) for string in args.extras]
+    if args.profile:  # keep the profiler options of the configs, if any
+        strings.append(Config.parse_string("job: {profiler: {}}"))
     if len(files) == 0 and len(strings) == 0:
         raise RuntimeError("No configs provided.")
     config = Config.merge_configs([*files, *strings])
     object_ = Config.to_object(config)  # python object
     setting = MainSettings.model_validate(object_)
-    with setting.job as runner:
+    job = setting.job
+    if args.resume is not None:  # reopen the run and continue from its checkpoints
+        if "checkpoint" not in type(job).model_fields:
+            raise ValueError(f"Job {job.KIND} has no checkpoints to resume run: {args.resume}")
+        run_config = job.run_config.model_copy(update={"run_id": args.resume})
+        job = job.model_copy(update={"run_config": run_config, "checkpoint": True})
+    with job as runner:
         runner.run()
         return 0
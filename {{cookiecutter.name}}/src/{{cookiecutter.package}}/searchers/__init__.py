@@ -1,7 +1,17 @@
 from .example import ExampleSearcher
-from ._base import Searcher
+from .grid import GridSearcher
+from .halving import HalvingSearcher
+from .tpe import TPESearcher
+from ._base import Searcher, Pruner
 
-SearcherKind = ExampleSearcher
-
-__all__ = ["SearcherKind", "ExampleSearcher", "Searcher"]
+SearcherKind = ExampleSearcher | GridSearcher | HalvingSearcher | TPESearcher
 
+__all__ = [
+    "SearcherKind",
+    "ExampleSearcher",
+    "GridSearcher",
+    "HalvingSearcher",
+    "TPESearcher",
+    "Searcher",
+    "Pruner",
+]
@@ -3,15 +3,24 @@
 # %% IMPORTS
 
 import abc
+import concurrent.futures as cf
+import contextlib as ctx
+import hashlib
+import json
+import os
+import threading
+import time
 import typing as T
 
+import numpy as np
 import pandas as pd
 import pydantic as pdt
-from sklearn import model_selection
-from ..models import Model, Params, ParamKey, ParamValue
-from ..metrics import Metric
-from ..io.splitters import Splitter, TrainTestSplits
+from ..models import Model, Params, ParamKey, ParamValue, PredictionCache
+from ..metrics import Metric, MetricsKind
+from ..io.splitters import Splitter, TrainTestSplits, TrainTestIndex
 from ..io.schemas import Inputs, Targets
+from ..io import digest
+from ._queue import QueueExecutor
 
 
 
@@ -30,6 +39,523 @@ Results = tuple[
 # Cross-validation options for searchers
 CrossValidation = int | TrainTestSplits | Splitter
 
+# Record of a trial evaluation
+Trial = dict[str, T.Any]
+
+
+class Task(T.NamedTuple):
+    """Trial to evaluate: a param combination on a split.
+
+    Parameters:
+        candidate (int): index of the param combination.
+        params (Params): param combination to evaluate.
+        split (int): index of the train/test split.
+        n_samples (int | None): number of first training rows of the split to fit on (all if None).
+    """
+
+    candidate: int
+    params: Params
+    split: int
+    n_samples: int | None = None
+
+
+# Trials fitted one after the other, each one extending the previous fit
+Chain = tuple[Task, ...]
+
+
+# %% WORKERS
+
+# Search state shared once with each worker process
+_STATE: dict[str, T.Any] = {}
+
+
+def _initialize(
+    model: Model,
+    metric: Metric,
+    inputs: Inputs,
+    targets: Targets,
+    splits: list[TrainTestIndex],
+    metrics: T.Sequence[Metric] = (),
+) -> None:
+    """Share the search state with a worker process.
+
+    Args:
+        model (Model): AI/ML model to fine-tune.
+        metric (Metric): main metric to optimize.
+        inputs (Inputs): model inputs for tuning.
+        targets (Targets): model targets for tuning.
+        splits (list[TrainTestIndex]): train/test splits.
+        metrics (T.Sequence[Metric]): other metrics to report on each trial.
+    """
+    _STATE.update(
+        model=model,
+        metric=metric,
+        inputs=inputs,
+        targets=targets,
+        splits=splits,
+        metrics=metrics,
+    )
+
+
+def _evaluate(task: Task) -> Trial:
+    """Fit and score a model on a split with the shared search state.
+
+    Args:
+        task (Task): trial to evaluate.
+
+    Returns:
+        Trial: record of the trial evaluation.
+    """
+    model = _STATE["model"].model_copy(deep=True).set_params(**task.params)
+    return _fit_score(model=model, task=task)
+
+
+def _evaluate_chain(chain: Chain) -> list[Trial]:
+    """Fit and score a chain of trials, warm-starting each fit from the previous one.
+
+    Args:
+        chain (Chain): trials that differ only in their warm-startable params.
+
+    Returns:
+        list[Trial]: records of the trial evaluations.
+    """
+    model: Model = _STATE["model"].model_copy(deep=True).set_params(**chain[0].params)
+    trials = [_fit_score(model=model, task=chain[0])]
+    for task in chain[1:]:
+        warm = model.WARM_PARAMS & task.params.keys()
+        model.warm_start(**{key: task.params[key] for key in warm})
+        trials.append(_fit_score(model=model, task=task))
+    return trials
+
+
+def _fit_score(model: Model, task: Task) -> Trial:
+    """Fit and score a model on the split of a trial.
+
+    The model predicts the test inputs once for the main metric and the other metrics.
+
+    Args:
+        model (Model): model with the params of the trial.
+        task (Task): trial to evaluate.
+
+    Returns:
+        Trial: record of the trial evaluation.
+    """
+    metric = _STATE["metric"]
+    inputs, targets = _STATE["inputs"], _STATE["targets"]
+    train_index, test_index = _STATE["splits"][task.split]
+    if task.n_samples is not None:  # subset of the split rows, in their original order
+        train_index = np.sort(train_index[: task.n_samples])
+    start = time.perf_counter()
+    model.fit(inputs=inputs.iloc[train_index], targets=targets.iloc[train_index])
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    test_inputs, test_targets = inputs.iloc[test_index], targets.iloc[test_index]
+    cache = PredictionCache()  # outputs of this fit on this fold
+    score = metric.scorer(model=model, inputs=test_inputs, targets=test_targets, cache=cache)
+    scores = {
+        f"test_{other.name}": other.scorer(
+            model=model, inputs=test_inputs, targets=test_targets, cache=cache
+        )
+        for other in _STATE["metrics"]
+    }
+    score_time = time.perf_counter() - start
+    return {
+        **task._asdict(),
+        "fit_time": fit_time,
+        "score_time": score_time,
+        "test_score": score,
+        **scores,
+    }
+
+
+# %% JOURNALS
+
+
+class Journal:
+    """Append-only journal of the completed trials in a JSONL file.
+
+    Each trial is written as soon as it completes, so an interrupted search can resume.
+
+    Parameters:
+        path (str): path of the JSONL file.
+        trials (dict[str, Trial]): completed trials by key.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Load the completed trials of the journal.
+
+        Args:
+            path (str): path of the JSONL file.
+        """
+        self.path = path
+        self.trials: dict[str, Trial] = {}
+        self.lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "rb+") as file:
+                size = 0
+                for line in file:
+                    if not line.endswith(b"\n"):  # partial line of an interrupted write
+                        break
+                    size += len(line)
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self.trials[record["key"]] = record["trial"]
+                file.truncate(size)  # the next trials start on a new line
+
+    def append(self, key: str, trial: Trial) -> None:
+        """Record a completed trial at the end of the journal.
+
+        Args:
+            key (str): key of the trial.
+            trial (Trial): record of the trial evaluation.
+        """
+        line = json.dumps({"key": key, "trial": trial}, default=_to_json)
+        with self.lock:
+            self.trials[key] = trial
+            with open(self.path, "a") as writer:
+                writer.write(line + "\n")
+                writer.flush()
+                os.fsync(writer.fileno())
+
+
+def _to_json(value: T.Any) -> T.Any:
+    """Convert numpy scalars and other values to JSON.
+
+    Args:
+        value (T.Any): value to convert.
+
+    Returns:
+        T.Any: JSON compatible value.
+    """
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+# %% PRUNERS
+
+
+class Pruner(pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
+    """Prune the candidates whose intermediate fold scores are worse than the others.
+
+    The mean score of a candidate on its completed folds is compared to the mean scores
+    of the other candidates on the same folds (percentile=50 for median pruning).
+
+    Parameters:
+        percentile (float): percentile of the other candidates a candidate must beat.
+        min_candidates (int): number of other candidates to compare before pruning.
+        min_folds (int): number of completed folds of a candidate before pruning.
+    """
+
+    percentile: float = pdt.Field(default=50.0, ge=0, le=100)
+    min_candidates: int = pdt.Field(default=5, gt=0)
+    min_folds: int = pdt.Field(default=1, gt=0)
+
+    def prune(self, metric: Metric, candidate: int, scores: dict[int, dict[int, float]]) -> bool:
+        """Decide to prune the remaining folds of a candidate.
+
+        Args:
+            metric (Metric): main metric to optimize.
+            candidate (int): index of the candidate to decide on.
+            scores (dict[int, dict[int, float]]): fold scores by candidate and split.
+
+        Returns:
+            bool: True if the remaining folds of the candidate should be pruned.
+        """
+        folds = scores[candidate]
+        if len(folds) < self.min_folds:
+            return False
+        others = [
+            np.mean([other[split] for split in folds])
+            for index, other in scores.items()
+            if index != candidate and folds.keys() <= other.keys()
+        ]
+        if len(others) < self.min_candidates:
+            return False
+        score = np.mean(list(folds.values()))
+        if metric.greater_is_better:
+            return bool(score < np.percentile(others, self.percentile))
+        return bool(score > np.percentile(others, 100 - self.percentile))
+
+
+# %% POOLS
+
+
+class Pool:
+    """Run the trials of a search in a process pool.
+
+    Trials completed in the journal are reused instead of being evaluated again.
+    Pending folds of the candidates pruned by the pruner are cancelled.
+    Trials that differ only in warm-startable params are chained in the same worker.
+
+    Parameters:
+        executor (cf.Executor): process pool for the trials.
+        workers (int): number of worker processes.
+        metric (Metric): main metric to optimize.
+        fingerprint (str): fingerprint of the model, metric, data, and splits.
+        journal (Journal | None): journal of the completed trials.
+        pruner (Pruner | None): pruning policy of the candidates.
+        warm_params (frozenset[ParamKey]): params to chain the trials on.
+    """
+
+    def __init__(
+        self,
+        executor: cf.Executor,
+        workers: int,
+        metric: Metric,
+        fingerprint: str,
+        journal: Journal | None = None,
+        pruner: Pruner | None = None,
+        warm_params: frozenset[ParamKey] = frozenset(),
+    ) -> None:
+        """Initialize the pool of trials.
+
+        Args:
+            executor (cf.Executor): process pool for the trials.
+            workers (int): number of worker processes.
+            metric (Metric): main metric to optimize.
+            fingerprint (str): fingerprint of the model, metric, data, and splits.
+            journal (Journal | None): journal of the completed trials.
+            pruner (Pruner | None): pruning policy of the candidates.
+            warm_params (frozenset[ParamKey]): params to chain the trials on.
+        """
+        self.executor = executor
+        self.workers = workers
+        self.metric = metric
+        self.fingerprint = fingerprint
+        self.journal = journal
+        self.pruner = pruner
+        self.warm_params = warm_params
+        # pruning state, updated from the executor threads
+        self.lock = threading.RLock()
+        self.scores: dict[int, dict[int, float]] = {}
+        self.futures: dict[int, list[cf.Future[Trial]]] = {}
+        self.pruned: set[int] = set()
+        self.n_pruned = 0
+        self.n_completed = 0
+        self.completed_time = 0.0
+
+    def key(self, task: Task) -> str:
+        """Compute the journal key of a trial.
+
+        Args:
+            task (Task): trial to evaluate.
+
+        Returns:
+            str: key of the trial.
+        """
+        fields = {**task._asdict(), "fingerprint": self.fingerprint}
+        del fields["candidate"]  # depends on the search order
+        text = json.dumps(fields, sort_keys=True, default=_to_json)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def chain(self, tasks: T.Iterable[Task]) -> list[Chain]:
+        """Group the trials that differ only in their warm-startable params.
+
+        Each chain is ordered by warm params, so each fit extends the previous one.
+        The chains keep the order of their first trial (e.g., fold-major for pruning).
+
+        Args:
+            tasks (T.Iterable[Task]): trials to evaluate.
+
+        Returns:
+            list[Chain]: chains of trials to evaluate.
+        """
+        if not self.warm_params:
+            return [(task,) for task in tasks]
+        chains: dict[str, list[Task]] = {}
+        for task in tasks:
+            cold = {k: v for k, v in task.params.items() if k not in self.warm_params}
+            fields = {**task._asdict(), "candidate": None, "params": cold}
+            key = json.dumps(fields, sort_keys=True, default=_to_json)
+            chains.setdefault(key, []).append(task)
+        warm = sorted(self.warm_params)
+        for chain in chains.values():
+            try:
+                chain.sort(key=lambda task: [task.params.get(key) for key in warm])
+            except TypeError:  # values without ordering: keep the search order
+                pass
+        return [tuple(chain) for chain in chains.values()]
+
+    def submit_chain(self, chain: Chain) -> list[cf.Future[Trial]]:
+        """Submit a chain of trials to evaluate in the same worker.
+
+        Pruned and journaled trials are left out of the chain.
+        The trials of the chain can be pruned like the others: the chain is cancelled
+        if all its trials are pruned before it starts, else the pruned records are dropped.
+
+        Args:
+            chain (Chain): trials to evaluate one after the other.
+
+        Returns:
+            list[cf.Future[Trial]]: future records of the trial evaluations.
+        """
+        futures = [self.resolve(task) for task in chain]
+        todo = [task for task, future in zip(chain, futures) if future is None]
+        if len(todo) <= 1:
+            return [future or self.submit(task) for task, future in zip(chain, futures)]
+        keys = [self.key(task) if self.journal is not None else None for task in todo]
+        links: list[cf.Future[Trial]] = [cf.Future() for _ in todo]
+        batch = self.executor.submit(_evaluate_chain, tuple(todo))
+
+        def unlink(batch: cf.Future[list[Trial]]) -> None:
+            error = batch.exception() if not batch.cancelled() else cf.CancelledError()
+            for index, link in enumerate(links):
+                if not link.set_running_or_notify_cancel():  # pruned meanwhile
+                    continue
+                if error is not None:
+                    link.set_exception(error)
+                else:
+                    link.set_result(batch.result()[index])
+
+        def prune(link: cf.Future[Trial]) -> None:
+            if all(other.cancelled() for other in links):
+                batch.cancel()  # only effective before the chain starts
+
+        batch.add_done_callback(unlink)
+        for task, link, key in zip(todo, links, keys):
+            with self.lock:  # cancelled by the pruner with the other futures of the candidate
+                self.futures.setdefault(task.candidate, []).append(link)
+            link.add_done_callback(
+                lambda link, task=task, key=key: self.complete(task=task, future=link, key=key)
+            )
+            link.add_done_callback(prune)
+        evaluated = iter(links)
+        return [future or next(evaluated) for future in futures]
+
+    def resolve(self, task: Task) -> cf.Future[Trial] | None:
+        """Resolve a trial without evaluation, if it is pruned or in the journal.
+
+        The future of a pruned candidate is returned cancelled.
+
+        Args:
+            task (Task): trial to evaluate.
+
+        Returns:
+            cf.Future[Trial] | None: future record of the trial, or None to evaluate it.
+        """
+        future: cf.Future[Trial]
+        with self.lock:
+            if task.candidate in self.pruned:
+                self.n_pruned += 1
+                future = cf.Future()
+                future.cancel()
+                future.set_running_or_notify_cancel()  # notify waiters
+                return future
+        if self.journal is not None and (key := self.key(task)) in self.journal.trials:
+            future = cf.Future()
+            future.set_result({**self.journal.trials[key], **task._asdict()})
+            self.complete(task=task, future=future)
+            return future
+        return None
+
+    def submit(self, task: Task) -> cf.Future[Trial]:
+        """Submit a trial to the process pool, or reuse it from the journal.
+
+        The future of a pruned candidate is returned cancelled.
+
+        Args:
+            task (Task): trial to evaluate.
+
+        Returns:
+            cf.Future[Trial]: future record of the trial evaluation.
+        """
+        if (resolved := self.resolve(task)) is not None:
+            return resolved
+        key = self.key(task) if self.journal is not None else None
+        future = self.executor.submit(_evaluate, task)
+        with self.lock:
+            self.futures.setdefault(task.candidate, []).append(future)
+        future.add_done_callback(lambda future: self.complete(task=task, future=future, key=key))
+        return future
+
+    def complete(self, task: Task, future: cf.Future[Trial], key: str | None = None) -> None:
+        """Record a completed trial and prune its candidate if needed.
+
+        Args:
+            task (Task): trial evaluated.
+            future (cf.Future[Trial]): future record of the trial evaluation.
+            key (str | None): journal key to record the trial (None to skip).
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+        trial = future.result()
+        if self.journal is not None and key is not None:
+            self.journal.append(key=key, trial=trial)
+        with self.lock:
+            self.n_completed += 1
+            self.completed_time += trial["fit_time"] + trial["score_time"]
+            if self.pruner is None or task.candidate in self.pruned:
+                return
+            self.scores.setdefault(task.candidate, {})[task.split] = trial["test_score"]
+            if self.pruner.prune(metric=self.metric, candidate=task.candidate, scores=self.scores):
+                self.pruned.add(task.candidate)
+                for pending in self.futures.pop(task.candidate, []):
+                    if pending.cancel():
+                        self.n_pruned += 1
+
+    def reset(self) -> None:
+        """Forget the fold scores of the previous candidates (e.g., on a new rung)."""
+        with self.lock:
+            self.scores.clear()
+
+    def stats(self) -> dict[str, float]:
+        """Report the compute saved by the pruning.
+
+        Returns:
+            dict[str, float]: pruned trials and estimated time saved (in secs).
+        """
+        with self.lock:
+            mean_time = self.completed_time / self.n_completed if self.n_completed else 0.0
+            return {
+                "pruned_candidates": len(self.pruned),
+                "pruned_trials": self.n_pruned,
+                "pruned_time_saved": self.n_pruned * mean_time,
+            }
+
+    @staticmethod
+    def wait(
+        futures: T.Iterable[cf.Future[Trial]],
+        return_when: str = cf.ALL_COMPLETED,
+        poll: float = 0.5,
+    ) -> tuple[set[cf.Future[Trial]], set[cf.Future[Trial]]]:
+        """Wait for the futures of the trials, counting the pruned ones as done.
+
+        A future cancelled by the pruner only notifies its waiters once its executor
+        dequeues it, so the wait is polled instead of blocking on the pruned trials.
+
+        Args:
+            futures (T.Iterable[cf.Future[Trial]]): futures of the trials.
+            return_when (str): cf.FIRST_COMPLETED or cf.ALL_COMPLETED.
+            poll (float): delay between two checks of the cancelled futures (in secs).
+
+        Returns:
+            tuple[set[cf.Future[Trial]], set[cf.Future[Trial]]]: done and pending futures.
+        """
+        done: set[cf.Future[Trial]] = set()
+        pending = set(futures)
+        while pending:
+            finished, pending = cf.wait(pending, timeout=poll, return_when=cf.FIRST_COMPLETED)
+            cancelled = {future for future in pending if future.cancelled()}
+            done |= finished | cancelled
+            pending -= cancelled
+            if done and return_when == cf.FIRST_COMPLETED:
+                break
+        return done, pending
+
+    @staticmethod
+    def collect(futures: T.Iterable[cf.Future[Trial]]) -> list[Trial]:
+        """Collect the trial records of the futures that were not cancelled.
+
+        Args:
+            futures (T.Iterable[cf.Future[Trial]]): done futures of the trials.
+
+        Returns:
+            list[Trial]: records of the trial evaluations.
+        """
+        return [future.result() for future in futures if not future.cancelled()]
+
+
 # %% SEARCHERS
 
 
@@ -41,11 +567,27 @@ class Searcher(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid")
 
     Parameters:
         param_grid (Grid): mapping of param key -> values.
+        n_jobs (int | None): number of worker processes (all the CPUs if None).
+        journal (str | None): JSONL file to record and resume the completed trials.
+        pruner (Pruner | None): pruning policy of the candidates on their fold scores.
+        queue (str | None): SQLite file of a shared trial queue for distributed workers.
+        queue_workers (int): number of remote workers expected to claim from the queue.
+        queue_lease (float): duration of a trial claim without heartbeat (in secs).
+        warm_start (bool): chain the trials on the warm-startable params of the model.
+        metrics (MetricsKind): other metrics to report on each trial (predicted once).
     """
 
     KIND: str
 
     param_grid: Grid
+    n_jobs: int | None = pdt.Field(default=None, gt=0)
+    journal: str | None = None
+    pruner: Pruner | None = None
+    queue: str | None = None
+    queue_workers: int = pdt.Field(default=0, ge=0)
+    queue_lease: float = pdt.Field(default=60.0, gt=0)
+    warm_start: bool = False
+    metrics: MetricsKind = []
 
     @abc.abstractmethod
     def search(
@@ -68,3 +610,209 @@ class Searcher(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid")
         Returns:
             Results: all the results of the searcher execution process.
         """
+
+    def workers(self) -> int:
+        """Get the number of worker processes.
+
+        Returns:
+            int: number of worker processes.
+        """
+        return self.n_jobs or os.cpu_count() or 1
+
+    def grid(self) -> Grid:
+        """Get the param grid without the duplicate values of each param.
+
+        Returns:
+            Grid: mapping of param key -> unique values.
+        """
+        return {
+            key: [value for i, value in enumerate(values) if value not in values[:i]]
+            for key, values in self.param_grid.items()
+        }
+
+    def candidates(self) -> list[Params]:
+        """Expand the param grid into unique param combinations.
+
+        Returns:
+            list[Params]: all the param combinations of the grid.
+        """
+        from sklearn import model_selection
+
+        return list(model_selection.ParameterGrid(self.grid()))
+
+    def splits(
+        self, cv: CrossValidation, inputs: Inputs, targets: Targets
+    ) -> list[TrainTestIndex]:
+        """Resolve the cross-fold validation into train/test splits.
+
+        Args:
+            cv (CrossValidation): choice for cross-fold validation.
+            inputs (schemas.Inputs): model inputs for tuning.
+            targets (schemas.Targets): model targets for tuning.
+
+        Returns:
+            list[TrainTestIndex]: train/test splits.
+        """
+        from sklearn import model_selection
+
+        if isinstance(cv, int):
+            return list(model_selection.KFold(n_splits=cv).split(inputs, targets))
+        if isinstance(cv, Splitter):
+            return list(cv.split(inputs=inputs, targets=targets))
+        return list(cv)
+
+    @ctx.contextmanager
+    def pool(
+        self,
+        model: Model,
+        metric: Metric,
+        inputs: Inputs,
+        targets: Targets,
+        splits: list[TrainTestIndex],
+    ) -> T.Generator[Pool, None, None]:
+        """Yield a process pool sharing the search state with its workers.
+
+        The search state is sent once per worker instead of once per trial.
+        With a queue, the state is stored once in the queue for all the workers.
+
+        Args:
+            model (Model): AI/ML model to fine-tune.
+            metric (Metric): main metric to optimize.
+            inputs (Inputs): model inputs for tuning.
+            targets (Targets): model targets for tuning.
+            splits (list[TrainTestIndex]): train/test splits.
+
+        Yields:
+            T.Generator[Pool, None, None]: process pool for the trials.
+        """
+        journal = Journal(path=self.journal) if self.journal is not None else None
+        fingerprint = ""
+        if journal is not None:
+            hasher = hashlib.sha256()
+            for config in (model, metric, *self.metrics):
+                hasher.update(config.model_dump_json().encode())
+            for data in (inputs, targets):
+                hasher.update(digest(data).encode())
+            for train_index, test_index in splits:
+                hasher.update(train_index.tobytes() + b"|" + test_index.tobytes())
+            fingerprint = hasher.hexdigest()
+        initargs = (model, metric, inputs, targets, splits, self.metrics)
+        executor: cf.Executor
+        if self.queue is None:
+            executor = cf.ProcessPoolExecutor(
+                max_workers=self.workers(), initializer=_initialize, initargs=initargs
+            )
+        else:  # the local workers claim trials next to the remote workers
+            executor = QueueExecutor(
+                path=self.queue,
+                initializer=_initialize,
+                initargs=initargs,
+                max_workers=self.workers(),
+                lease=self.queue_lease,
+            )
+        with executor:
+            yield Pool(
+                executor=executor,
+                workers=self.workers() + self.queue_workers,
+                metric=metric,
+                fingerprint=fingerprint,
+                journal=journal,
+                pruner=self.pruner,
+                warm_params=model.WARM_PARAMS if self.warm_start else frozenset(),
+            )
+
+    def evaluate(self, pool: Pool, tasks: T.Iterable[Task]) -> list[Trial]:
+        """Evaluate the tasks with a bounded number of pending trials.
+
+        Trials that differ only in warm-startable params are chained in the same worker.
+
+        Args:
+            pool (Pool): process pool for the trials.
+            tasks (T.Iterable[Task]): trials to evaluate.
+
+        Returns:
+            list[Trial]: records of the trial evaluations.
+        """
+        trials: list[Trial] = []
+        pending: set[cf.Future[Trial]] = set()
+        for chain in pool.chain(tasks):
+            if len(pending) >= 2 * pool.workers:
+                done, pending = pool.wait(pending, return_when=cf.FIRST_COMPLETED)
+                trials.extend(pool.collect(done))
+            pending.update(pool.submit_chain(chain))
+        done, _ = pool.wait(pending)
+        trials.extend(pool.collect(done))
+        return trials
+
+    def results(
+        self, metric: Metric, trials: list[Trial], stats: dict[str, float] | None = None
+    ) -> Results:
+        """Aggregate the trial records into search results.
+
+        Candidates with missing folds are marked as pruned and ranked after the others.
+
+        Args:
+            metric (Metric): main metric to optimize.
+            trials (list[Trial]): records of the trial evaluations.
+            stats (dict[str, float] | None): statistics of the pool, stored in the attrs.
+
+        Returns:
+            Results: details, best score, and best params of the search.
+        """
+        if not trials:  # e.g., no candidate to evaluate
+            empty = pd.DataFrame(columns=["params", "mean_test_score", "rank_test_score", "pruned"])
+            empty.attrs.update(stats or {})
+            return empty, *self.best(metric=metric, results=empty)
+        frame = pd.DataFrame(trials).sort_values(["candidate", "split"])
+        groups = frame.groupby("candidate")
+        results = pd.DataFrame(
+            {
+                "mean_fit_time": groups["fit_time"].mean(),
+                "std_fit_time": groups["fit_time"].std(ddof=0),
+                "mean_score_time": groups["score_time"].mean(),
+                "std_score_time": groups["score_time"].std(ddof=0),
+            }
+        )
+        params = groups["params"].first()
+        for key in self.param_grid:
+            results[f"param_{key}"] = params.map(lambda params_: params_.get(key))
+        results["params"] = params
+        scores = frame.pivot(index="candidate", columns="split", values="test_score")
+        for split in scores.columns:
+            results[f"split{split}_test_score"] = scores[split]
+        results["mean_test_score"] = scores.mean(axis=1)
+        results["std_test_score"] = scores.std(axis=1, ddof=0)
+        for other in self.metrics:
+            results[f"mean_test_{other.name}"] = groups[f"test_{other.name}"].mean()
+        results["pruned"] = scores.notna().sum(axis=1) < len(scores.columns)
+        ranking = {"ascending": not metric.greater_is_better, "method": "min"}
+        ranks = results["mean_test_score"].where(~results["pruned"]).rank(**ranking)
+        pruned_ranks = results["mean_test_score"].where(results["pruned"]).rank(**ranking)
+        results["rank_test_score"] = ranks.fillna(pruned_ranks + ranks.count()).astype(int)
+        # keep the extra trial fields (e.g., resources) as columns
+        fields = [*Task._fields, "fit_time", "score_time", "test_score"]
+        fields += [f"test_{other.name}" for other in self.metrics]
+        for key in frame.columns.difference(fields):
+            results[key] = groups[key].first()
+        best_score, best_params = self.best(metric=metric, results=results)
+        results = results.reset_index(drop=True)
+        results.attrs.update(stats or {})
+        return results, best_score, best_params
+
+    def best(self, metric: Metric, results: pd.DataFrame) -> tuple[float, Params]:
+        """Select the best score and params from the search results.
+
+        Args:
+            metric (Metric): main metric to optimize.
+            results (pd.DataFrame): details of the search results.
+
+        Returns:
+            tuple[float, Params]: best score and best params (NaN and no params if empty).
+        """
+        if results.empty:
+            return float("nan"), {}
+        if not results["pruned"].all():
+            results = results[~results["pruned"]]
+        scores = results["mean_test_score"]
+        best = scores.idxmax() if metric.greater_is_better else scores.idxmin()
+        return float(scores[best]), T.cast(Params, results.at[best, "params"])
@@ -0,0 +1,521 @@
+"""Share search trials between machines through a queue on a shared filesystem."""
+
+# %% IMPORTS
+
+import atexit
+import concurrent.futures as cf
+import contextlib as ctx
+import multiprocessing as mp
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import typing as T
+import uuid
+
+# %% TYPES
+
+# Claimed trial: trial id, study id, and payload
+Claim = tuple[int, str, bytes]
+
+# %% QUEUES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS studies (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    status TEXT NOT NULL,
+    heartbeat REAL
+);
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    study TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    heartbeat REAL,
+    result BLOB
+);
+CREATE INDEX IF NOT EXISTS trials_status ON trials (status, study);
+"""
+
+
+class TrialQueue:
+    """Queue of trials stored in a SQLite database.
+
+    A study holds the state shared by its trials (e.g., model, data, and splits).
+    The state is pickled in a file next to the database, which only stores its name:
+    i.e., the data is not limited by the size of a SQLite blob.
+    Workers claim the pending trials, renew their heartbeats while they run,
+    and write the results back. Trials without a recent heartbeat are claimed again.
+    The coordinator renews the heartbeat of its study: the trials of a study
+    without a recent heartbeat (e.g., crashed coordinator) are not claimed anymore.
+
+    Parameters:
+        path (str): path of the SQLite database (e.g., on a shared filesystem).
+        lease (float): duration of a claim without heartbeat (in secs).
+    """
+
+    def __init__(self, path: str, lease: float = 60.0) -> None:
+        """Create the queue tables if needed.
+
+        Args:
+            path (str): path of the SQLite database (e.g., on a shared filesystem).
+            lease (float): duration of a claim without heartbeat (in secs).
+        """
+        self.path = path
+        self.lease = lease
+        with self.connect() as connection:
+            connection.executescript(SCHEMA)
+
+    @ctx.contextmanager
+    def connect(self) -> T.Generator[sqlite3.Connection, None, None]:
+        """Yield a connection to the queue database in autocommit mode.
+
+        Yields:
+            T.Generator[sqlite3.Connection, None, None]: queue database connection.
+        """
+        connection = sqlite3.connect(self.path, timeout=60.0, isolation_level=None)
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def file(self, name: str) -> str:
+        """Resolve the path of a study state file next to the database.
+
+        Args:
+            name (str): name of the state file.
+
+        Returns:
+            str: path of the state file.
+        """
+        return os.path.join(os.path.dirname(os.path.abspath(self.path)), name)
+
+    def open(self, state: T.Any) -> str:
+        """Open a new study with the state shared by its trials.
+
+        The state file is written before the study is visible to the workers.
+
+        Args:
+            state (T.Any): picklable state of the study.
+
+        Returns:
+            str: id of the study.
+        """
+        study = uuid.uuid4().hex
+        name = f"{os.path.basename(self.path)}-{study}.pkl"
+        with open(self.file(name), "wb") as writer:
+            pickle.dump(state, writer, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT INTO studies (id, state, status, heartbeat) VALUES (?, ?, 'open', ?)",
+                (study, name, time.time()),
+            )
+        return study
+
+    def beat(self, study: str) -> None:
+        """Renew the heartbeat of an open study.
+
+        Args:
+            study (str): id of the study.
+        """
+        with self.connect() as connection:
+            connection.execute(
+                "UPDATE studies SET heartbeat = ? WHERE id = ? AND status = 'open'",
+                (time.time(), study),
+            )
+
+    def close(self, study: str) -> None:
+        """Close a study, cancel its pending trials, and remove its state file.
+
+        Args:
+            study (str): id of the study.
+        """
+        with self.connect() as connection:
+            connection.execute("UPDATE studies SET status = 'closed' WHERE id = ?", (study,))
+            connection.execute(
+                "UPDATE trials SET status = 'cancelled' WHERE study = ? AND status = 'pending'",
+                (study,),
+            )
+            (name,) = connection.execute(
+                "SELECT state FROM studies WHERE id = ?", (study,)
+            ).fetchone()
+        with ctx.suppress(FileNotFoundError):  # e.g., already closed
+            os.remove(self.file(name))
+
+    def state(self, study: str) -> T.Any:
+        """Load the state shared by the trials of a study.
+
+        Args:
+            study (str): id of the study.
+
+        Raises:
+            FileNotFoundError: if the study has been closed.
+
+        Returns:
+            T.Any: state of the study.
+        """
+        with self.connect() as connection:
+            (name,) = connection.execute(
+                "SELECT state FROM studies WHERE id = ?", (study,)
+            ).fetchone()
+        with open(self.file(name), "rb") as reader:
+            return pickle.load(reader)
+
+    def enqueue(self, study: str, payload: bytes) -> int:
+        """Add a pending trial to a study.
+
+        Args:
+            study (str): id of the study.
+            payload (bytes): serialized trial.
+
+        Returns:
+            int: id of the trial.
+        """
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO trials (study, payload, status) VALUES (?, ?, 'pending')",
+                (study, payload),
+            )
+        return T.cast(int, cursor.lastrowid)
+
+    def claim(self, worker: str, study: str | None = None) -> Claim | None:
+        """Claim a pending trial, or a running trial whose lease has expired.
+
+        Only the trials of the open studies with a recent heartbeat are claimed.
+
+        Args:
+            worker (str): id of the worker.
+            study (str | None): only claim the trials of this study.
+
+        Returns:
+            Claim | None: claimed trial, or None if no trial is available.
+        """
+        now = time.time()
+        with self.connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                "SELECT t.id, t.study, t.payload FROM trials t"
+                " JOIN studies s ON s.id = t.study"
+                " WHERE s.status = 'open' AND s.heartbeat >= ? AND (? IS NULL OR t.study = ?)"
+                " AND (t.status = 'pending' OR (t.status = 'running' AND t.heartbeat < ?))"
+                " ORDER BY t.id LIMIT 1",
+                (now - self.lease, study, study, now - self.lease),
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE trials SET status = 'running', worker = ?, heartbeat = ? WHERE id = ?",
+                    (worker, now, row[0]),
+                )
+            connection.execute("COMMIT")
+        return row
+
+    def heartbeat(self, trial: int, worker: str) -> bool:
+        """Renew the lease of a running trial.
+
+        Args:
+            trial (int): id of the trial.
+            worker (str): id of the worker.
+
+        Returns:
+            bool: True if the worker still holds the trial.
+        """
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "UPDATE trials SET heartbeat = ? WHERE id = ? AND worker = ?"
+                " AND status = 'running'",
+                (time.time(), trial, worker),
+            )
+        return cursor.rowcount > 0
+
+    def running(self) -> int:
+        """Count the running trials with a recent heartbeat, i.e., the live workers.
+
+        Returns:
+            int: number of running trials within their lease.
+        """
+        with self.connect() as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM trials WHERE status = 'running' AND heartbeat >= ?",
+                (time.time() - self.lease,),
+            ).fetchone()
+        return count
+
+    def complete(self, trial: int, worker: str, result: bytes, failed: bool = False) -> None:
+        """Write the result of a trial held by the worker.
+
+        Args:
+            trial (int): id of the trial.
+            worker (str): id of the worker.
+            result (bytes): serialized result or exception.
+            failed (bool): True if the result is an exception.
+        """
+        with self.connect() as connection:
+            connection.execute(
+                "UPDATE trials SET status = ?, result = ? WHERE id = ? AND worker = ?"
+                " AND status = 'running'",
+                ("failed" if failed else "done", result, trial, worker),
+            )
+
+    def cancel(self, trials: list[int]) -> None:
+        """Cancel trials that are still pending.
+
+        Args:
+            trials (list[int]): ids of the trials.
+        """
+        with self.connect() as connection:
+            connection.executemany(
+                "UPDATE trials SET status = 'cancelled' WHERE id = ? AND status = 'pending'",
+                [(trial,) for trial in trials],
+            )
+
+    def collect(self, study: str) -> list[tuple[int, str, bytes]]:
+        """Collect the finished trials of a study once.
+
+        Args:
+            study (str): id of the study.
+
+        Returns:
+            list[tuple[int, str, bytes]]: id, status, and result of the finished trials.
+        """
+        with self.connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            rows = connection.execute(
+                "SELECT id, status, result FROM trials"
+                " WHERE study = ? AND status IN ('done', 'failed')",
+                (study,),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE trials SET status = 'collected' WHERE id = ?", [(row[0],) for row in rows]
+            )
+            connection.execute("COMMIT")
+        return rows
+
+
+# %% WORKERS
+
+
+def _dumps(value: T.Any) -> bytes:
+    """Serialize a trial result, or the representation of an unpicklable error.
+
+    Args:
+        value (T.Any): result or exception of a trial.
+
+    Returns:
+        bytes: serialized value.
+    """
+    try:
+        return pickle.dumps(value)
+    except (pickle.PicklingError, TypeError, AttributeError):  # e.g., local or open objects
+        return pickle.dumps(RuntimeError(repr(value)))
+
+
+def _heartbeat(queue: TrialQueue, trial: int, worker: str, stop: threading.Event) -> None:
+    """Renew the lease of a running trial until it stops.
+
+    Args:
+        queue (TrialQueue): queue of the trial.
+        trial (int): id of the trial.
+        worker (str): id of the worker.
+        stop (threading.Event): set when the trial stops.
+    """
+    while not stop.wait(queue.lease / 3):
+        queue.heartbeat(trial=trial, worker=worker)
+
+
+def work(
+    path: str,
+    lease: float = 60.0,
+    poll: float = 1.0,
+    idle_timeout: float | None = None,
+    study: str | None = None,
+) -> int:
+    """Claim and run the trials of a queue in the current process.
+
+    Args:
+        path (str): path of the SQLite database (e.g., on a shared filesystem).
+        lease (float): duration of a claim without heartbeat (in secs).
+        poll (float): delay between two claims when the queue is empty (in secs).
+        idle_timeout (float | None): stop after being idle for this duration (never if None).
+        study (str | None): only run the trials of this study.
+
+    Returns:
+        int: number of trials run by the worker.
+    """
+    queue = TrialQueue(path=path, lease=lease)
+    worker = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+    current, n_trials, idle_since = None, 0, time.monotonic()
+    while True:
+        claim = queue.claim(worker=worker, study=study)
+        if claim is None:
+            if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                return n_trials
+            time.sleep(poll)
+            continue
+        trial, study_, payload = claim
+        if study_ != current:  # share the study state once per study
+            try:
+                initializer, initargs = queue.state(study_)
+            except FileNotFoundError:  # the study was closed after the claim
+                continue
+            if initializer is not None:
+                initializer(*initargs)
+            current = study_
+        fn, args, kwargs = pickle.loads(payload)
+        stop = threading.Event()
+        heartbeats = threading.Thread(
+            target=_heartbeat,
+            kwargs={"queue": queue, "trial": trial, "worker": worker, "stop": stop},
+            daemon=True,
+        )
+        heartbeats.start()
+        try:
+            result, failed = fn(*args, **kwargs), False
+        except Exception as error:  # only the errors of the trial (e.g., estimator fit)
+            result, failed = error, True
+        finally:
+            stop.set()
+            heartbeats.join()
+        queue.complete(trial=trial, worker=worker, result=_dumps(result), failed=failed)
+        n_trials, idle_since = n_trials + 1, time.monotonic()
+
+
+# %% EXECUTORS
+
+
+class QueueExecutor(cf.Executor):
+    """Executor that runs functions on the workers of a trial queue.
+
+    The initializer and its arguments are stored once in the study state.
+    Local worker processes are started to run trials next to remote workers.
+    The workers are spawned, as the coordinator runs threads (e.g., the poller).
+    The study is closed on shutdown, or at the latest when the coordinator exits.
+    The pending trials fail when no worker is alive for a lease (i.e., no local process
+    and no running trial in the queue), or when the queue database cannot be polled.
+
+    Parameters:
+        path (str): path of the SQLite database (e.g., on a shared filesystem).
+        initializer (T.Callable[..., None] | None): called once per study by each worker.
+        initargs (tuple): arguments of the initializer.
+        max_workers (int): number of local worker processes.
+        lease (float): duration of a claim without heartbeat (in secs).
+        poll (float): delay between two checks of the finished trials (in secs).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        initializer: T.Callable[..., None] | None = None,
+        initargs: tuple = (),
+        max_workers: int = 0,
+        lease: float = 60.0,
+        poll: float = 0.5,
+    ) -> None:
+        """Open a study in the queue and start the local workers.
+
+        Args:
+            path (str): path of the SQLite database (e.g., on a shared filesystem).
+            initializer (T.Callable[..., None] | None): called once per study by each worker.
+            initargs (tuple): arguments of the initializer.
+            max_workers (int): number of local worker processes.
+            lease (float): duration of a claim without heartbeat (in secs).
+            poll (float): delay between two checks of the finished trials (in secs).
+        """
+        self.queue = TrialQueue(path=path, lease=lease)
+        self.study = self.queue.open(state=(initializer, initargs))
+        self.poll = poll
+        self.futures: dict[int, cf.Future] = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        atexit.register(self.queue.close, study=self.study)
+        context = mp.get_context("spawn")
+        self.workers = [
+            context.Process(
+                target=work,
+                kwargs={"path": path, "lease": lease, "poll": poll, "study": self.study},
+                daemon=True,
+            )
+            for _ in range(max_workers)
+        ]
+        for process in self.workers:
+            process.start()
+        self.poller = threading.Thread(target=self._poll, daemon=True)
+        self.poller.start()
+
+    @T.override
+    def submit(self, fn: T.Callable[..., T.Any], /, *args: T.Any, **kwargs: T.Any) -> cf.Future:
+        if not self.poller.is_alive():
+            raise RuntimeError("Cannot submit trials after the queue poller has stopped.")
+        future: cf.Future = cf.Future()
+        trial = self.queue.enqueue(study=self.study, payload=pickle.dumps((fn, args, kwargs)))
+        with self.lock:
+            self.futures[trial] = future
+        return future
+
+    @T.override
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if cancel_futures:
+            with self.lock:
+                for future in self.futures.values():
+                    future.cancel()
+        while wait and self.futures and self.poller.is_alive():  # else failed futures
+            time.sleep(self.poll)
+        self.stopped.set()
+        self.poller.join()
+        self.queue.close(study=self.study)
+        atexit.unregister(self.queue.close)
+        for process in self.workers:
+            process.terminate()
+            process.join()
+
+    def _poll(self) -> None:
+        """Resolve the futures of the finished trials, and cancel the cancelled ones.
+
+        The pending futures fail if the poller stops on a database error,
+        or if no worker is alive for a lease.
+        """
+        try:
+            self._resolve()
+        except sqlite3.Error as error:  # e.g., database locked or unreachable
+            self._fail(error)
+
+    def _fail(self, error: Exception) -> None:
+        """Set an error on all the pending futures.
+
+        Args:
+            error (Exception): error of the pending futures.
+        """
+        with self.lock:
+            futures, self.futures = list(self.futures.values()), {}
+        for future in futures:
+            if future.set_running_or_notify_cancel():  # else cancelled
+                future.set_exception(error)
+
+    def _resolve(self) -> None:
+        """Poll the queue until the executor stops."""
+        alive = time.monotonic()  # last time a worker was alive
+        while not self.stopped.wait(self.poll):
+            self.queue.beat(study=self.study)
+            if not self.futures or any(p.is_alive() for p in self.workers) or self.queue.running():
+                alive = time.monotonic()
+            elif time.monotonic() - alive > self.queue.lease:
+                self._fail(TimeoutError(f"No live worker in the queue for {self.queue.lease}s."))
+            with self.lock:
+                cancelled = [trial for trial, f in self.futures.items() if f.cancelled()]
+                for trial in cancelled:
+                    self.futures.pop(trial).set_running_or_notify_cancel()  # notify waiters
+            if cancelled:
+                self.queue.cancel(trials=cancelled)
+            for trial, status, result in self.queue.collect(study=self.study):
+                with self.lock:
+                    future = self.futures.pop(trial, None)
+                if future is None or not future.set_running_or_notify_cancel():
+                    continue
+                value = pickle.loads(result)
+                if status == "done":
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
@@ -3,7 +3,7 @@ import numpy as np
 
 
 from ._base import Searcher, CrossValidation, Results, Grid
-from ..models import Model
+from ..models import Model, PredictionCache
 from ..metrics import Metric
 from ..io.schemas import Inputs, Targets
 import pandas as pd
@@ -38,7 +38,8 @@ class ExampleSearcher(Searcher):
         searcher = MockSearcher(
             estimator=model,
             scoring=metric,
-            cv=cv
+            cv=cv,
+            metrics=self.metrics,
         )
         searcher.fit(inputs, targets)
         results = pd.DataFrame(searcher.cv_results_)
@@ -48,10 +49,17 @@ class ExampleSearcher(Searcher):
 class MockSearcher:
     """Mock the GridSearchCV class from sklearn."""
 
-    def __init__(self, estimator: Model, scoring: Metric, cv: CrossValidation):
+    def __init__(
+        self,
+        estimator: Model,
+        scoring: Metric,
+        cv: CrossValidation,
+        metrics: T.Sequence[Metric] = (),
+    ):
         self.estimator = estimator
         self.scoring = scoring
         self.cv = cv
+        self.metrics = metrics
 
 
     def fit(
@@ -61,8 +69,10 @@ class MockSearcher:
     ) -> Results:
         
         self.estimator.fit(inputs, targets)
-        prediction = self.estimator.predict(inputs)
-        self.scoring.score(targets, prediction)
+        # predict once for the main metric and the other metrics
+        cache = PredictionCache()
+        for metric in [self.scoring, *self.metrics]:
+            metric.scorer(self.estimator, inputs, targets, cache=cache)
 
         
         
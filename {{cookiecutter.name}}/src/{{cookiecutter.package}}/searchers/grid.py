@@ -0,0 +1,42 @@
+import typing as T
+
+from ._base import Searcher, CrossValidation, Results, Task
+from ..models import Model
+from ..metrics import Metric
+from ..io.schemas import Inputs, Targets
+
+
+class GridSearcher(Searcher):
+    """Grid searcher with cross-fold validation in a process pool.
+
+    Run all the (param combination x fold) trials concurrently.
+
+    Parameters:
+        param_grid (Grid): mapping of param key -> values.
+        n_jobs (int | None): number of worker processes (all the CPUs if None).
+    """
+
+    KIND: T.Literal["GridSearcher"] = "GridSearcher"
+
+    @T.override
+    def search(
+        self,
+        model: Model,
+        metric: Metric,
+        inputs: Inputs,
+        targets: Targets,
+        cv: CrossValidation,
+    ) -> Results:
+        splits = self.splits(cv=cv, inputs=inputs, targets=targets)
+        candidates = self.candidates()
+        tasks = (
+            Task(candidate=candidate, params=params, split=split)
+            for split in range(len(splits))
+            for candidate, params in enumerate(candidates)
+        )
+        with self.pool(
+            model=model, metric=metric, inputs=inputs, targets=targets, splits=splits
+        ) as pool:
+            trials = self.evaluate(pool=pool, tasks=tasks)
+            stats = pool.stats()
+        return self.results(metric=metric, trials=trials, stats=stats)
@@ -0,0 +1,164 @@
+import math
+import random
+import typing as T
+
+import numpy as np
+import pandas as pd
+import pydantic as pdt
+
+from ._base import Searcher, CrossValidation, Results, Task, Trial
+from ..models import Model, Params
+from ..metrics import Metric
+from ..io.schemas import Inputs, Targets
+
+
+class HalvingSearcher(Searcher):
+    """Successive halving searcher with cross-fold validation in a process pool.
+
+    Evaluate all the candidates with few resources, then grow the resources of the best ones.
+    The trials of each rung run in parallel, and only 1 / factor candidates survive a rung.
+    With hyperband, run several brackets that trade off the candidates and the resources.
+
+    Parameters:
+        param_grid (Grid): mapping of param key -> values.
+        n_jobs (int | None): number of worker processes (all the CPUs if None).
+        resource (str): "n_samples" for training rows, or a model param (e.g., epochs).
+        min_resources (int): resources of the first rung.
+        max_resources (int | None): resources of the last rung (training rows if None).
+        factor (int): rate of candidate reduction and resource growth between rungs.
+        hyperband (bool): run hyperband brackets instead of a single successive halving.
+        random_state (int): seed to sample the training rows and the hyperband candidates.
+    """
+
+    KIND: T.Literal["HalvingSearcher"] = "HalvingSearcher"
+
+    resource: str = "n_samples"
+    min_resources: int = pdt.Field(default=10, gt=0)
+    max_resources: int | None = pdt.Field(default=None, gt=0)
+    factor: int = pdt.Field(default=3, gt=1)
+    hyperband: bool = False
+    random_state: int = 42
+
+    @T.override
+    def search(
+        self,
+        model: Model,
+        metric: Metric,
+        inputs: Inputs,
+        targets: Targets,
+        cv: CrossValidation,
+    ) -> Results:
+        splits = self.splits(cv=cv, inputs=inputs, targets=targets)
+        if self.resource == "n_samples":
+            # shuffle the training rows once: each rung fits on a seeded random subset,
+            # the same for all the candidates, and nested in the subset of the next rung
+            rng = np.random.default_rng(self.random_state)
+            splits = [
+                (rng.permutation(train_index), test_index) for train_index, test_index in splits
+            ]
+        if self.max_resources is not None:
+            max_resources = self.max_resources
+        elif self.resource == "n_samples":
+            max_resources = min(len(train_index) for train_index, _ in splits)
+        else:
+            raise ValueError(f"Max resources required for resource: {self.resource}")
+        trials: list[Trial] = []
+        n_candidates = 0  # unique index for each rung candidate
+        with self.pool(
+            model=model, metric=metric, inputs=inputs, targets=targets, splits=splits
+        ) as pool:
+            for bracket, (candidates, resources) in enumerate(self.brackets(max_resources)):
+                survivors, rung = candidates, 0
+                while True:
+                    pool.reset()  # only prune against the candidates of this rung
+                    tasks = [
+                        self.task(candidate, params, split, resources)
+                        for split in range(len(splits))
+                        for candidate, params in enumerate(survivors, start=n_candidates)
+                    ]
+                    n_candidates += len(survivors)
+                    rung_trials = self.evaluate(pool=pool, tasks=tasks)
+                    for trial in rung_trials:
+                        trial.update(bracket=bracket, iter=rung, n_resources=resources)
+                    trials.extend(rung_trials)
+                    if len(survivors) <= 1 or resources >= max_resources:
+                        break
+                    survivors = self.promote(metric=metric, trials=rung_trials)
+                    resources = min(resources * self.factor, max_resources)
+                    rung += 1
+            stats = pool.stats()
+        results, best_score, best_params = self.results(metric=metric, trials=trials, stats=stats)
+        if results.empty:
+            return results, best_score, best_params
+        # select the best candidate from the last rung of each bracket
+        last = results.groupby("bracket")["iter"].transform("max") == results["iter"]
+        best_score, best_params = self.best(metric=metric, results=results[last])
+        return results, best_score, best_params
+
+    def brackets(self, max_resources: int) -> list[tuple[list[Params], int]]:
+        """Generate the candidates and the first rung resources of each bracket.
+
+        Args:
+            max_resources (int): resources of the last rung.
+
+        Returns:
+            list[tuple[list[Params], int]]: candidates and resources of each bracket.
+        """
+        candidates = self.candidates()
+        if not self.hyperband:
+            return [(candidates, min(self.min_resources, max_resources))]
+        rng = random.Random(self.random_state)
+        s_max = int(math.log(max_resources / self.min_resources, self.factor) + 1e-9)
+        brackets = []
+        for s in range(max(s_max, 0), -1, -1):
+            n_candidates = math.ceil((s_max + 1) / (s + 1) * self.factor**s)
+            sample = rng.sample(candidates, min(n_candidates, len(candidates)))
+            brackets.append((sample, max(max_resources // self.factor**s, 1)))
+        return brackets
+
+    def task(self, candidate: int, params: Params, split: int, resources: int) -> Task:
+        """Create a trial with the given amount of resources.
+
+        Args:
+            candidate (int): index of the param combination.
+            params (Params): param combination to evaluate.
+            split (int): index of the train/test split.
+            resources (int): amount of resources of the trial.
+
+        Returns:
+            Task: trial to evaluate.
+        """
+        if self.resource == "n_samples":
+            return Task(candidate=candidate, params=params, split=split, n_samples=resources)
+        params = {**params, self.resource: resources}
+        return Task(candidate=candidate, params=params, split=split)
+
+    def promote(self, metric: Metric, trials: list[Trial]) -> list[Params]:
+        """Select the best candidates of a rung for the next rung.
+
+        Candidates pruned on some folds are only promoted after the others.
+
+        Args:
+            metric (Metric): main metric to optimize.
+            trials (list[Trial]): records of the rung evaluations.
+
+        Returns:
+            list[Params]: param combinations of the best candidates (none if no trial).
+        """
+        if not trials:
+            return []
+        frame = pd.DataFrame(trials)
+        groups = frame.groupby("candidate")
+        scores = pd.DataFrame(
+            {"folds": groups["split"].count(), "score": groups["test_score"].mean()}
+        )
+        scores = scores.sort_values(
+            ["folds", "score"], ascending=[False, not metric.greater_is_better]
+        )
+        n_survivors = max(math.ceil(len(scores) / self.factor), 1)
+        params = groups["params"].first()
+        # remove the resource param, it is set again by the next rung
+        return [
+            {key: value for key, value in params[candidate].items() if key != self.resource}
+            for candidate in scores.index[:n_survivors]
+        ]
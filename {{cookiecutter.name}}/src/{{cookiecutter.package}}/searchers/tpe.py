@@ -0,0 +1,184 @@
+import concurrent.futures as cf
+import math
+import time
+import typing as T
+
+import numpy as np
+import numpy.typing as npt
+import pydantic as pdt
+
+from ._base import Searcher, CrossValidation, Grid, Results, Task, Trial
+from ..models import Model, Params, ParamValue
+from ..metrics import Metric
+from ..io.schemas import Inputs, Targets
+
+# %% TYPES
+
+# Param combination and mean score of a completed trial
+Observation = tuple[Params, float]
+# Indices of the values of a param combination in the grid (hashable)
+Key = tuple[int, ...]
+
+
+class TPESearcher(Searcher):
+    """Tree-structured Parzen estimator searcher with asynchronous parallel trials.
+
+    Model the param values of the good and bad trials with Parzen densities,
+    and propose the values with the highest ratio of good to bad densities.
+    A new trial is proposed as soon as a worker is free, until a budget is spent.
+
+    Parameters:
+        param_grid (Grid): mapping of param key -> values.
+        n_jobs (int | None): number of worker processes (all the CPUs if None).
+        n_trials (int): maximum number of trials to run.
+        timeout (float | None): maximum duration to propose new trials (in secs).
+        n_startup_trials (int): number of random trials before the model proposals.
+        n_ei_candidates (int): number of samples to evaluate for each proposal.
+        gamma (float): fraction of the completed trials considered as good.
+        random_state (int): seed of the proposals.
+    """
+
+    KIND: T.Literal["TPESearcher"] = "TPESearcher"
+
+    n_trials: int = pdt.Field(default=50, gt=0)
+    timeout: float | None = pdt.Field(default=None, gt=0)
+    n_startup_trials: int = pdt.Field(default=10, ge=0)
+    n_ei_candidates: int = pdt.Field(default=24, gt=0)
+    gamma: float = pdt.Field(default=0.25, gt=0, lt=1)
+    random_state: int = 42
+
+    @T.override
+    def search(
+        self,
+        model: Model,
+        metric: Metric,
+        inputs: Inputs,
+        targets: Targets,
+        cv: CrossValidation,
+    ) -> Results:
+        from sklearn import model_selection
+
+        splits = self.splits(cv=cv, inputs=inputs, targets=targets)
+        rng = np.random.default_rng(self.random_state)
+        n_trials = min(self.n_trials, len(model_selection.ParameterGrid(self.grid())))
+        deadline = math.inf if self.timeout is None else time.monotonic() + self.timeout
+        proposed: set[Key] = set()
+        observations: list[Observation] = []
+        folds: dict[int, list[Trial]] = {}
+        observed: set[int] = set()
+        trials: list[Trial] = []
+        pending: set[cf.Future[Trial]] = set()
+        with self.pool(
+            model=model, metric=metric, inputs=inputs, targets=targets, splits=splits
+        ) as pool:
+            while True:
+                # propose new trials as soon as the workers are free
+                while (
+                    len(pending) < pool.workers
+                    and len(proposed) < n_trials
+                    and time.monotonic() < deadline
+                ):
+                    key, params = self.propose(
+                        metric=metric, observations=observations, proposed=proposed, rng=rng
+                    )
+                    candidate = len(proposed)
+                    proposed.add(key)
+                    for split in range(len(splits)):
+                        task = Task(candidate=candidate, params=params, split=split)
+                        pending.add(pool.submit(task))
+                if not pending:
+                    break
+                done, pending = pool.wait(pending, return_when=cf.FIRST_COMPLETED)
+                for trial in pool.collect(done):
+                    trials.append(trial)
+                    candidate = trial["candidate"]
+                    candidate_folds = folds.setdefault(candidate, [])
+                    candidate_folds.append(trial)
+                    # observe pruned candidates early with their partial scores
+                    if candidate not in observed and (
+                        len(candidate_folds) == len(splits) or candidate in pool.pruned
+                    ):
+                        observed.add(candidate)
+                        score = float(np.mean([fold["test_score"] for fold in candidate_folds]))
+                        observations.append((trial["params"], score))
+            stats = pool.stats()
+        return self.results(metric=metric, trials=trials, stats=stats)
+
+    def propose(
+        self,
+        metric: Metric,
+        observations: list[Observation],
+        proposed: set[Key],
+        rng: np.random.Generator,
+    ) -> tuple[Key, Params]:
+        """Propose a new param combination from the completed trials.
+
+        The proposals are drawn one param at a time, without expanding the grid.
+
+        Args:
+            metric (Metric): main metric to optimize.
+            observations (list[Observation]): completed trials.
+            proposed (set[Key]): keys of the param combinations already proposed.
+            rng (np.random.Generator): random generator of the proposals.
+
+        Returns:
+            tuple[Key, Params]: key and values of a new param combination to evaluate.
+        """
+        grid = self.grid()
+        if observations and len(observations) >= self.n_startup_trials:
+            scores = np.array([score for _, score in observations])
+            order = np.argsort(-scores if metric.greater_is_better else scores)
+            n_good = max(math.ceil(self.gamma * len(observations)), 1)
+            good = [observations[i][0] for i in order[:n_good]]
+            bad = [observations[i][0] for i in order[n_good:]]
+            samples: dict[str, npt.NDArray[np.int64]] = {}
+            ratios = np.zeros(self.n_ei_candidates)
+            for key, values in grid.items():
+                lower = self.density(values, [params[key] for params in good])
+                upper = self.density(values, [params[key] for params in bad])
+                samples[key] = rng.choice(len(values), size=self.n_ei_candidates, p=lower)
+                ratios += np.log(lower[samples[key]]) - np.log(upper[samples[key]])
+            for i in np.argsort(-ratios):
+                indices = tuple(int(samples[key][i]) for key in grid)
+                if indices not in proposed:
+                    return indices, self.params(grid=grid, indices=indices)
+        # sample at random for startup trials or already proposed combinations
+        while True:  # the grid has combinations left: n_trials <= grid size
+            indices = tuple(int(rng.integers(len(values))) for values in grid.values())
+            if indices not in proposed:
+                return indices, self.params(grid=grid, indices=indices)
+
+    @staticmethod
+    def params(grid: Grid, indices: Key) -> Params:
+        """Get the param combination of a key.
+
+        Args:
+            grid (Grid): mapping of param key -> unique values.
+            indices (Key): indices of the param values in the grid.
+
+        Returns:
+            Params: mapping of param key -> value.
+        """
+        return {key: values[i] for (key, values), i in zip(grid.items(), indices)}
+
+    @staticmethod
+    def density(values: list[ParamValue], observed: list[ParamValue]) -> npt.NDArray[np.float64]:
+        """Estimate the Parzen density of the observed values over the param values.
+
+        Args:
+            values (list[ParamValue]): possible values of the param.
+            observed (list[ParamValue]): values observed in the trials.
+
+        Returns:
+            npt.NDArray[np.float64]: probability of each possible value.
+        """
+        indices = [values.index(value) for value in observed]
+        counts = np.bincount(indices, minlength=len(values)).astype(np.float64)
+        if all(isinstance(v, int | float) and not isinstance(v, bool) for v in values):
+            # ordered values: smooth the counts over the neighbor values
+            ranks = np.argsort(np.argsort(values))
+            bandwidth = max(len(values) / (len(observed) + 1), 1.0)
+            kernel = np.exp(-0.5 * ((ranks[:, None] - ranks[None, :]) / bandwidth) ** 2)
+            counts = kernel @ counts
+        density = counts + 1.0  # uniform prior over the values
+        return density / density.sum()
@@ -1,5 +1,6 @@
-from .mlflow_services import MlflowService
+from .mlflow_services import MlflowService, shared_client
 from .logger import LoggerService
 from .alert import AlertsService
+from ._base import Service
 
-__all__ = ["MlflowService", "LoggerService", "AlertsService"]
+__all__ = ["MlflowService", "LoggerService", "AlertsService", "Service", "shared_client"]
@@ -5,19 +5,345 @@
 from __future__ import annotations
 
 import contextlib as ctx
+import os
+import queue
+import threading
+import time
 import typing as T
 
-import mlflow
-import mlflow.tracking as mt
 import pydantic as pdt
 from ._base import Service
 
+if T.TYPE_CHECKING:  # mlflow is imported when the service starts
+    import mlflow
+    import mlflow.data.dataset as md
+    import mlflow.tracking as mt
+
+# %% QUEUES
+
+
+class LogQueue:
+    """Log the metrics, params, tags, and artifacts of runs from a background thread.
+
+    The metrics, params, and tags are merged into log_batch calls.
+    The artifacts and inputs are sent one by one, in the order they were queued.
+    A full queue blocks the job until the thread catches up (backpressure).
+    The errors of the thread are kept until they are raised by a check.
+
+    Parameters:
+        client (mt.MlflowClient): client of the tracking server.
+        max_size (int): maximum number of entries waiting in the queue.
+    """
+
+    # Limits of a log_batch call
+    MAX_ENTITIES = 1000
+    MAX_METRICS = 1000
+    MAX_PARAMS = 100
+    MAX_TAGS = 100
+
+    def __init__(self, client: mt.MlflowClient, max_size: int = 10_000) -> None:
+        """Initialize the queue and start its thread.
+
+        Args:
+            client (mt.MlflowClient): client of the tracking server.
+            max_size (int): maximum number of entries waiting in the queue.
+        """
+        self.client = client
+        self.queue: queue.Queue[tuple[str, str, T.Any]] = queue.Queue(maxsize=max_size)
+        self.lock = threading.Lock()  # the statistics are updated by the job and the thread
+        self.counts = {"entries": 0, "batches": 0, "calls": 0, "errors": 0, "blocked": 0}
+        self.max_depth = 0
+        self.blocked_time = 0.0
+        self.error: BaseException | None = None
+        self.thread = threading.Thread(target=self._work, name="mlflow-log", daemon=True)
+        self.thread.start()
+
+    def log_metrics(self, run_id: str, metrics: dict[str, float], step: int = 0) -> None:
+        """Queue the metrics of a run.
+
+        Args:
+            run_id (str): ID of the run.
+            metrics (dict[str, float]): metric values by name.
+            step (int): step of the metrics.
+        """
+        from mlflow.entities import Metric
+
+        timestamp = int(time.time() * 1000)
+        for key, value in metrics.items():
+            self._put("metric", run_id, Metric(key, float(value), timestamp, step))
+
+    def log_params(self, run_id: str, params: dict[str, T.Any]) -> None:
+        """Queue the params of a run.
+
+        Args:
+            run_id (str): ID of the run.
+            params (dict[str, T.Any]): param values by name.
+        """
+        from mlflow.entities import Param
+
+        for key, value in params.items():
+            self._put("param", run_id, Param(key, str(value)))
+
+    def set_tags(self, run_id: str, tags: dict[str, T.Any]) -> None:
+        """Queue the tags of a run.
+
+        Args:
+            run_id (str): ID of the run.
+            tags (dict[str, T.Any]): tag values by name.
+        """
+        from mlflow.entities import RunTag
+
+        for key, value in tags.items():
+            self._put("tag", run_id, RunTag(key, str(value)))
+
+    def log_dict(self, run_id: str, dictionary: T.Any, artifact_file: str) -> None:
+        """Queue a JSON/YAML artifact of a run.
+
+        Args:
+            run_id (str): ID of the run.
+            dictionary (T.Any): content of the artifact (not modified afterwards).
+            artifact_file (str): path of the artifact in the run.
+        """
+        self._put("call", run_id, lambda: self.client.log_dict(run_id, dictionary, artifact_file))
+
+    def log_artifact(self, run_id: str, local_path: str, artifact_path: str | None = None) -> None:
+        """Queue a file artifact of a run.
+
+        Args:
+            run_id (str): ID of the run.
+            local_path (str): path of the file (kept until the queue is flushed).
+            artifact_path (str | None): directory of the artifact in the run.
+        """
+        send = lambda: self.client.log_artifact(run_id, local_path, artifact_path)  # noqa: E731
+        self._put("call", run_id, send)
+
+    def log_input(self, run_id: str, dataset: md.Dataset, context: str | None = None) -> None:
+        """Queue the lineage of a dataset used by a run.
+
+        Args:
+            run_id (str): ID of the run.
+            dataset (md.Dataset): lineage of the dataset.
+            context (str | None): context of the dataset (e.g., training).
+        """
+        from mlflow.entities import DatasetInput, InputTag
+        from mlflow.utils.mlflow_tags import MLFLOW_DATASET_CONTEXT
+
+        tags = [InputTag(key=MLFLOW_DATASET_CONTEXT, value=context)] if context else []
+        input_ = DatasetInput(dataset=dataset._to_mlflow_entity(), tags=tags)
+        self._put("call", run_id, lambda: self.client.log_inputs(run_id, datasets=[input_]))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait for the queued entries to be sent.
+
+        Args:
+            timeout (float | None): maximum wait (in seconds), or None to wait until sent.
+
+        Returns:
+            bool: True if all the entries were sent, False if the wait timed out.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def check(self) -> None:
+        """Raise the first error of the thread since the last check.
+
+        Raises:
+            Exception: first error raised by the thread while sending the entries.
+        """
+        with self.lock:
+            error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def stats(self) -> dict[str, float]:
+        """Get the statistics of the queue.
+
+        Returns:
+            dict[str, float]: entries, batches, calls, errors, depth, and backpressure.
+        """
+        with self.lock:
+            return {
+                **self.counts,
+                "depth": self.queue.qsize(),
+                "max_depth": self.max_depth,
+                "blocked_time": self.blocked_time,
+            }
+
+    def _put(self, kind: str, run_id: str, entry: T.Any) -> None:
+        """Put an entry in the queue, waiting if it is full.
+
+        Args:
+            kind (str): metric, param, tag, or call.
+            run_id (str): ID of the run.
+            entry (T.Any): mlflow entity, or function sending the entry.
+        """
+        blocked = 0.0
+        try:
+            self.queue.put_nowait((kind, run_id, entry))
+        except queue.Full:
+            start = time.perf_counter()
+            self.queue.put((kind, run_id, entry))
+            blocked = time.perf_counter() - start
+        with self.lock:
+            if blocked:
+                self.counts["blocked"] += 1
+                self.blocked_time += blocked
+            self.counts["entries"] += 1
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def _work(self) -> None:
+        """Send the entries of the queue, merging the consecutive metrics/params/tags."""
+        while True:
+            entries = [self.queue.get()]
+            while len(entries) < self.MAX_METRICS:
+                try:
+                    entries.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            batches: dict[str, dict[str, list[T.Any]]] = {}
+            for kind, run_id, entry in entries:
+                if kind == "call":
+                    self._send(batches)  # keep the order of the entries
+                    batches = {}
+                    self._call(entry)
+                else:
+                    batch = batches.setdefault(run_id, {"metric": [], "param": [], "tag": []})
+                    batch[kind].append(entry)
+            self._send(batches)
+            for _ in entries:
+                self.queue.task_done()
+
+    def _send(self, batches: dict[str, dict[str, list[T.Any]]]) -> None:
+        """Send the metrics, params, and tags of runs within the limits of log_batch.
+
+        The params and tags are sent first, and the metrics fill the rest of each call.
+
+        Args:
+            batches (dict[str, dict[str, list[T.Any]]]): entities of each run by kind.
+        """
+        for run_id, batch in batches.items():
+            metrics, params, tags = batch["metric"], batch["param"], batch["tag"]
+            while metrics or params or tags:
+                params_, params = params[: self.MAX_PARAMS], params[self.MAX_PARAMS :]
+                tags_, tags = tags[: self.MAX_TAGS], tags[self.MAX_TAGS :]
+                n_metrics = min(self.MAX_METRICS, self.MAX_ENTITIES - len(params_) - len(tags_))
+                metrics_, metrics = metrics[:n_metrics], metrics[n_metrics:]
+                self._call(
+                    lambda: self.client.log_batch(
+                        run_id, metrics=metrics_, params=params_, tags=tags_
+                    ),
+                    kind="batches",
+                )
+
+    def _call(self, send: T.Callable[[], T.Any], kind: str = "calls") -> None:
+        """Send an entry, keeping the thread alive and the first error on errors.
+
+        Args:
+            send (T.Callable[[], T.Any]): function sending the entry.
+            kind (str): count of the entry (batches or calls).
+        """
+        try:
+            send()
+        except Exception as error:
+            with self.lock:
+                self.counts["errors"] += 1
+                self.error = self.error or error
+        else:
+            with self.lock:
+                self.counts[kind] += 1
+
+
+# Logging queues of the process, by tracking and registry URIs
+_QUEUES: dict[tuple[str, str], LogQueue] = {}
+
+# %% CLIENTS
+
+# Clients of the process, by tracking and registry URIs
+_CLIENTS: dict[tuple[str, str], mt.MlflowClient] = {}
+
+
+def shared_client(
+    tracking_uri: str | None = None, registry_uri: str | None = None
+) -> mt.MlflowClient:
+    """Return the client shared by the process for the given (or current) URIs.
+
+    A shared client reuses the HTTP connections of the tracking and registry servers.
+    Its HTTP settings are those of the process (see MlflowService).
+
+    Args:
+        tracking_uri (str | None): URI of the tracking server (current one if None).
+        registry_uri (str | None): URI of the model registry (current one if None).
+
+    Returns:
+        mt.MlflowClient: the shared mlflow client.
+    """
+    import mlflow
+
+    key = (tracking_uri or mlflow.get_tracking_uri(), registry_uri or mlflow.get_registry_uri())
+    if key not in _CLIENTS:
+        _CLIENTS[key] = mlflow.MlflowClient(tracking_uri=key[0], registry_uri=key[1])
+    return _CLIENTS[key]
+
+
+# %% HTTP
+
+# HTTP settings of the process: mlflow reads them from the environment on each request
+_HTTP: dict[str, str] = {}
+# Started services using the HTTP settings of the process (by id)
+_HTTP_SERVICES: set[int] = set()
+_HTTP_LOCK = threading.Lock()
+
+
+def _acquire_http(service: int, settings: dict[str, str]) -> None:
+    """Apply the HTTP settings of a service to the process.
+
+    The settings are shared by all the clients of the process, so the started
+    services must agree on them. They can change once these services are stopped.
+
+    Args:
+        service (int): id of the service.
+        settings (dict[str, str]): environment variables of the HTTP settings.
+
+    Raises:
+        ValueError: if another started service uses different HTTP settings.
+    """
+    with _HTTP_LOCK:
+        if _HTTP_SERVICES - {service} and settings != _HTTP:
+            raise ValueError(
+                f"HTTP settings {settings} differ from the settings of the process {_HTTP}."
+                " Use the same HTTP settings for the services started at once."
+            )
+        os.environ.update(settings)
+        _HTTP.clear()
+        _HTTP.update(settings)
+        _HTTP_SERVICES.add(service)
+
+
+def _release_http(service: int) -> None:
+    """Release the HTTP settings of the process used by a service.
+
+    Args:
+        service (int): id of the service.
+    """
+    with _HTTP_LOCK:
+        _HTTP_SERVICES.discard(service)
+
+
 # %% SERVICES
 
 
 class MlflowService(Service):
     """Service for Mlflow tracking and registry.
 
+    The HTTP settings apply to the whole process (mlflow reads them from the
+    environment), so the services started at once must use the same settings.
+
     Parameters:
         tracking_uri (str): the URI for the Mlflow tracking server.
         registry_uri (str): the URI for the Mlflow model registry.
@@ -31,6 +357,12 @@ class MlflowService(Service):
         autolog_log_models (bool): If True, enables logging of models during autologging.
         autolog_log_datasets (bool): If True, logs datasets used during autologging.
         autolog_silent (bool): If True, suppresses all Mlflow warnings during autologging.
+        log_queue_size (int): maximum number of entries waiting in the logging queue.
+        log_flush_timeout (float): maximum wait for the logging queue at the end of a run.
+        http_max_retries (int): maximum number of retries of a failed HTTP request.
+        http_backoff_factor (float): exponential backoff factor between the retries (in seconds).
+        http_backoff_jitter (float): maximum random jitter added to the backoff (in seconds).
+        http_timeout (int): timeout of an HTTP request (in seconds).
     """
 
     class RunConfig(pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
@@ -41,12 +373,14 @@ class MlflowService(Service):
             description (str | None): description of the run.
             tags (dict[str, T.Any] | None): tags for the run.
             log_system_metrics (bool | None): enable system metrics logging.
+            run_id (str | None): ID of an existing run to resume (e.g., after a crash).
         """
 
         name: str
         description: str | None = None
         tags: dict[str, T.Any] | None = None
         log_system_metrics: bool | None = True
+        run_id: str | None = None
 
     # server uri
     tracking_uri: str = "{{cookiecutter.tracking_uri}}"
@@ -64,9 +398,27 @@ class MlflowService(Service):
     autolog_log_models: bool = False
     autolog_log_datasets: bool = False
     autolog_silent: bool = False
+    # queue
+    log_queue_size: int = pdt.Field(default=10_000, gt=0)
+    log_flush_timeout: float = 30.0
+    # http
+    http_max_retries: int = pdt.Field(default=7, ge=0)
+    http_backoff_factor: float = pdt.Field(default=2.0, ge=0)
+    http_backoff_jitter: float = pdt.Field(default=1.0, ge=0)
+    http_timeout: int = pdt.Field(default=120, gt=0)
 
     @T.override
     def start(self) -> None:
+        import mlflow
+
+        # http: shared by the clients of the process
+        settings = {
+            "MLFLOW_HTTP_REQUEST_MAX_RETRIES": str(self.http_max_retries),
+            "MLFLOW_HTTP_REQUEST_BACKOFF_FACTOR": str(self.http_backoff_factor),
+            "MLFLOW_HTTP_REQUEST_BACKOFF_JITTER": str(self.http_backoff_jitter),
+            "MLFLOW_HTTP_REQUEST_TIMEOUT": str(self.http_timeout),
+        }
+        _acquire_http(service=id(self), settings=settings)
         # server uri
         mlflow.set_tracking_uri(uri=self.tracking_uri)
         mlflow.set_registry_uri(uri=self.registry_uri)
@@ -95,20 +447,69 @@ class MlflowService(Service):
         Yields:
             T.Generator[mlflow.ActiveRun, None, None]: active run context. Will be closed at the end of context.
         """
+        import mlflow
+
         with mlflow.start_run(
-            run_name=run_config.name,
+            run_id=run_config.run_id,
+            run_name=run_config.name if run_config.run_id is None else None,
             tags=run_config.tags,
             description=run_config.description,
             log_system_metrics=run_config.log_system_metrics,
         ) as run:
-            yield run
+            # send the queued entries before the run ends
+            try:
+                yield run
+            except BaseException:
+                self.flush(strict=False)  # keep the error of the run
+                raise
+            self.flush()
+
+    @T.override
+    def stop(self) -> None:
+        try:
+            self.flush()
+        finally:
+            _release_http(service=id(self))
+
+    def flush(self, strict: bool = True) -> None:
+        """Wait for the entries of the logging queue to be sent, if the queue is started.
+
+        Args:
+            strict (bool): raise if the entries are not sent.
+
+        Raises:
+            TimeoutError: if the entries are not sent within the flush timeout.
+            Exception: first error raised while sending the entries.
+        """
+        queue_ = _QUEUES.get((self.tracking_uri, self.registry_uri))
+        if queue_ is None:
+            return
+        flushed = queue_.flush(timeout=self.log_flush_timeout)
+        if not strict:
+            return
+        if not flushed:
+            raise TimeoutError(
+                f"Logging queue not sent in {self.log_flush_timeout}s: {queue_.stats()}"
+            )
+        queue_.check()
+
+    def queue(self) -> LogQueue:
+        """Return the background logging queue, started on the first call.
+
+        The queue is shared by the services of the process with the same URIs.
+
+        Returns:
+            LogQueue: the logging queue of the service.
+        """
+        key = (self.tracking_uri, self.registry_uri)
+        if key not in _QUEUES:
+            _QUEUES[key] = LogQueue(client=self.client(), max_size=self.log_queue_size)
+        return _QUEUES[key]
 
     def client(self) -> mt.MlflowClient:
-        """Return a new Mlflow client.
+        """Return the Mlflow client of the service, shared by the process.
 
         Returns:
             MlflowClient: the mlflow client.
         """
-        return mt.MlflowClient(
-            tracking_uri=self.tracking_uri, registry_uri=self.registry_uri
-        )
+        return shared_client(tracking_uri=self.tracking_uri, registry_uri=self.registry_uri)
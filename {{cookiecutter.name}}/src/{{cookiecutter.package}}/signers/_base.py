@@ -6,13 +6,16 @@ import abc
 import typing as T
 
 import pydantic as pdt
-from mlflow.models import signature as ms
 
+from ..io import Sampler
 from ..io.schemas import Inputs, Outputs
 
+if T.TYPE_CHECKING:  # mlflow is imported lazily
+    from mlflow.models import signature as ms
+
 # %% TYPES
 
-Signature: T.TypeAlias = ms.ModelSignature
+Signature: T.TypeAlias = "ms.ModelSignature"
 
 # %% SIGNERS
 
@@ -24,10 +27,15 @@ class Signer(abc.ABC, pdt.BaseModel, strict=True, frozen=True, extra="forbid"):
     e.g., automatic inference, manual model signature, ...
 
     https://mlflow.org/docs/latest/models.html#model-signature-and-input-example
+
+    Parameters:
+        sampler (Sampler): sampler of the inputs/outputs to infer the signature from.
     """
 
     KIND: str
 
+    sampler: Sampler = Sampler()
+
     @abc.abstractmethod
     def sign(self, inputs: Inputs, outputs: Outputs) -> Signature:
         """Generate a model signature from its inputs/outputs.
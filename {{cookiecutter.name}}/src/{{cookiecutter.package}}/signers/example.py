@@ -1,5 +1,4 @@
 import typing as T
-import mlflow
 
 from ._base import Signer, Signature
 
@@ -13,4 +12,8 @@ class ExampleSigner(Signer):
 
     @T.override
     def sign(self, inputs: Inputs, outputs: Outputs) -> Signature:
-        return mlflow.models.infer_signature(model_input=inputs, model_output=outputs)
+        import mlflow
+
+        return mlflow.models.infer_signature(
+            model_input=self.sampler.sample(inputs), model_output=self.sampler.sample(outputs)
+        )
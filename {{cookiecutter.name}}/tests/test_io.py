@@ -0,0 +1,85 @@
+# %% IMPORTS
+
+import pathlib
+import typing as T
+
+import pandas as pd
+import pytest
+
+from {{cookiecutter.package}}.io import ExampleReader, Sampler, share_reads
+from {{cookiecutter.package}}.io import _base
+
+# %% FIXTURES
+
+
+@pytest.fixture
+def shared() -> T.Generator[None, None, None]:
+    yield
+    share_reads(enable=False)
+
+
+def write(path: pathlib.Path, rows: int) -> str:
+    pd.DataFrame({"index": range(rows), "A": range(rows)}).to_csv(path, index=False)
+    return str(path)
+
+
+# %% SHARED READS
+
+
+def test_read_shared_reuses_the_datasets(tmp_path: pathlib.Path, shared: None) -> None:
+    # given
+    reader = ExampleReader(path=write(tmp_path / "data.csv", rows=10))
+    share_reads(enable=True)
+    # when
+    first = reader.read_shared()
+    first["A"] = 0  # the jobs can modify their copy
+    second = reader.read_shared()
+    # then
+    assert second["A"].tolist() == list(range(10)), "Shared datasets should be copied!"
+    assert len(_base._SHARED or {}) == 1, "The dataset should be shared once!"
+
+
+def test_read_shared_evicts_the_least_recently_used(tmp_path: pathlib.Path, shared: None) -> None:
+    # given
+    readers = [ExampleReader(path=write(tmp_path / f"{i}.csv", rows=1000)) for i in range(3)]
+    size = int(readers[0].read().memory_usage(deep=True).sum())
+    share_reads(enable=True, max_bytes=2 * size)
+    # when
+    readers[0].read_shared()
+    readers[1].read_shared()
+    readers[0].read_shared()  # most recently used
+    readers[2].read_shared()
+    # then
+    keys = [reader._key() for reader in (readers[0], readers[2])]
+    assert list(_base._SHARED or {}) == keys, "The least recently used should be evicted!"
+
+
+# %% SAMPLERS
+
+
+def test_sampler_methods() -> None:
+    # given
+    data = pd.DataFrame({"group": ["a"] * 80 + ["b"] * 20, "x": range(100)})
+    # when
+    head = Sampler(size=10).sample(data)
+    random = Sampler(size=10, method="random").sample(data)
+    stratified = Sampler(size=10, method="stratified", column="group").sample(data)
+    fallback = Sampler(size=10, method="stratified", column="missing").sample(data)
+    small = Sampler(size=1000).sample(data)
+    # then
+    assert head["x"].tolist() == list(range(10)), "Head should take the first rows!"
+    assert len(random) == 10 and random.equals(Sampler(size=10, method="random").sample(data))
+    assert stratified["group"].value_counts().to_dict() == {"a": 8, "b": 2}, "Keep the strata!"
+    assert fallback.equals(random), "Without its column, stratified should be random!"
+    assert small is data, "A small dataframe should be returned as is!"
+
+
+def test_stratified_sampler_respects_the_size() -> None:
+    # given
+    data = pd.DataFrame({"group": ["a", "b", "c"] * 5, "x": range(15)})
+    # when
+    sample = Sampler(size=8, method="stratified", column="group").sample(data)  # 2.67 per stratum
+    # then
+    assert len(sample) == 8, "The sample should have exactly the size rows!"
+    assert sorted(sample["group"].value_counts()) == [2, 3, 3], "Allocate by largest remainder!"
+    assert sample["x"].is_monotonic_increasing, "The rows should keep their order!"
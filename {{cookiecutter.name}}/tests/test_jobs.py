@@ -0,0 +1,140 @@
+# %% IMPORTS
+
+import asyncio
+import json
+import pathlib
+
+import pandas as pd
+import pytest
+
+from {{cookiecutter.package}}.io import ExampleReader
+from {{cookiecutter.package}}.jobs import Batch, TrainingJob
+from {{cookiecutter.package}}.services import AlertsService, LoggerService, MlflowService
+from {{cookiecutter.package}}.jobs._serving import MicroBatcher, Server
+from {{cookiecutter.package}}.jobs._stages import StageCache, Stages
+
+# %% JOBS
+
+
+@pytest.fixture
+def stops(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    stopped: list[str] = []
+
+    def fail(self: MlflowService) -> None:
+        stopped.append("mlflow")
+        raise TimeoutError("queue not sent")
+
+    monkeypatch.setattr(MlflowService, "stop", fail)
+    monkeypatch.setattr(AlertsService, "stop", lambda self: stopped.append("alerts"))
+    monkeypatch.setattr(LoggerService, "stop", lambda self: stopped.append("logger"))
+    return stopped
+
+
+def job() -> TrainingJob:
+    return TrainingJob(inputs=ExampleReader(path="in.csv"), targets=ExampleReader(path="t.csv"))
+
+
+def test_job_exit_keeps_the_error_of_the_job(stops: list[str]) -> None:
+    # given
+    error = ValueError("job failed")
+    # when
+    propagate = job().__exit__(ValueError, error, None)
+    # then
+    assert propagate is False, "The error of the job should be raised!"
+    assert stops == ["mlflow", "alerts", "logger"], "All the services should be stopped!"
+
+
+def test_job_exit_raises_the_error_of_a_service(stops: list[str]) -> None:
+    # when, then
+    with pytest.raises(TimeoutError, match="queue not sent"):
+        job().__exit__(None, None, None)
+    assert stops == ["mlflow", "alerts", "logger"], "All the services should be stopped!"
+
+
+# %% BATCHES
+
+
+def test_batch_rejects_less_than_one_job() -> None:
+    with pytest.raises(ValueError, match="Max jobs"):
+        Batch(max_jobs=0)
+
+
+# %% STAGES
+
+
+def test_stages_recompute_only_downstream_of_a_change(tmp_path: pathlib.Path) -> None:
+    # given
+    cache = StageCache(path=str(tmp_path))
+    calls: list[str] = []
+
+    def run(digest: str, factor: int) -> tuple[Stages, int]:
+        stages = Stages(cache=cache)
+        stages.source("read", None, digest=digest)
+        base = stages.run("base", lambda: calls.append("base") or 10, upstream=["read"])
+        scaled = stages.run(
+            "scale",
+            lambda: calls.append("scale") or base * factor,
+            config=factor,
+            upstream=["base"],
+        )
+        return stages, scaled
+
+    # when
+    first, first_value = run(digest="v1", factor=2)
+    second, second_value = run(digest="v1", factor=2)
+    third, third_value = run(digest="v1", factor=3)
+    fourth, _ = run(digest="v2", factor=3)
+    # then
+    assert first.hits == {"base": False, "scale": False}, "First run should compute all!"
+    assert second.hits == {"base": True, "scale": True}, "Same inputs should hit the cache!"
+    assert second.keys == first.keys and second_value == first_value == 20
+    assert third.hits == {"base": True, "scale": False}, "A config change is downstream only!"
+    assert third.keys["scale"] != first.keys["scale"] and third_value == 30
+    assert fourth.hits == {"base": False, "scale": False}, "New data should recompute all!"
+    assert calls == ["base", "scale", "scale", "base", "scale"], "Hits should not compute!"
+
+
+def test_stages_without_cache_always_compute() -> None:
+    # given
+    stages = Stages()
+    # when
+    value = stages.run("stage", lambda: 1)
+    stages.run("stage", lambda: 2)
+    # then
+    assert value == 1 and stages.hits == {"stage": False}, "Without cache, nothing is hit!"
+
+
+# %% SERVERS
+
+
+def test_server_rejects_an_invalid_request_without_failing_its_batch() -> None:
+    # given
+    def check(inputs: pd.DataFrame) -> pd.DataFrame:
+        if (inputs["x"] < 0).any():
+            raise ValueError("negative inputs")
+        return inputs
+
+    def predict(inputs: pd.DataFrame) -> pd.DataFrame:
+        check(inputs)  # fails the whole batch if an invalid request joins it
+        return inputs.assign(y=inputs["x"] * 2)
+
+    batcher = MicroBatcher(predict=predict, max_batch_size=64, max_wait=0.1)
+    server = Server(batcher=batcher, check=check)
+    bodies = [pd.DataFrame({"x": [x]}).to_json(orient="split").encode() for x in [1, -1, 2]]
+
+    async def send() -> list[tuple[str, bytes]]:
+        task = asyncio.create_task(batcher.run())
+        try:
+            return await asyncio.gather(
+                *(server.route(method="POST", path="/predict", body=body) for body in bodies)
+            )
+        finally:
+            task.cancel()
+
+    # when
+    responses = asyncio.run(send())
+    # then
+    statuses = [status for status, _ in responses]
+    assert statuses == ["200 OK", "400 Bad Request", "200 OK"], "Only the invalid should fail!"
+    assert json.loads(responses[2][1])["data"] == [[2, 4]], "The valid should be predicted!"
+    assert batcher.batches == 1, "The valid requests should be predicted in one batch!"
@@ -0,0 +1,69 @@
+# %% IMPORTS
+
+import typing as T
+
+import numpy as np
+import pytest
+
+from {{cookiecutter.package}}.io.schemas import Outputs, OutputsSchema, Targets, TargetsSchema
+from {{cookiecutter.package}}.metrics import Bootstrap, Metric
+
+# %% METRICS
+
+
+class MeanError(Metric):
+    """Metric scored with the default `Metric.scores`, i.e., one `score` call per row."""
+
+    KIND: T.Literal["MeanError"] = "MeanError"
+
+    name: str = "mean_error"
+    greater_is_better: bool = False
+
+    @T.override
+    def score(self, targets: Targets, outputs: Outputs) -> float:
+        errors = outputs[OutputsSchema.prediction] - targets[TargetsSchema.target]
+        return float(errors.abs().mean())
+
+
+# %% BOOTSTRAP
+
+
+def naive_intervals(
+    bootstrap: Bootstrap, metric: Metric, targets: np.ndarray, outputs: np.ndarray
+) -> tuple[float, float]:
+    """Score the bootstrap resamples one by one with the `score` method of the metric."""
+    scores = []
+    sizes = [
+        min(bootstrap.chunk_size, bootstrap.n_resamples - start)
+        for start in range(0, bootstrap.n_resamples, bootstrap.chunk_size)
+    ]
+    seeds = np.random.SeedSequence(bootstrap.random_state).spawn(len(sizes))
+    for seed, size in zip(seeds, sizes):
+        rng = np.random.default_rng(seed)
+        for indices in rng.integers(0, len(targets), size=(size, len(targets))):
+            resample_targets = Targets({TargetsSchema.target: targets[indices]})
+            resample_outputs = Outputs({OutputsSchema.prediction: outputs[indices]})
+            scores.append(metric.score(targets=resample_targets, outputs=resample_outputs))
+    alpha = (1 - bootstrap.confidence_level) / 2
+    lower, upper = np.quantile(scores, [alpha, 1 - alpha])
+    return float(lower), float(upper)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_bootstrap_matches_a_naive_loop_over_resamples(n_jobs: int) -> None:
+    # given
+    rng = np.random.default_rng(0)
+    targets = rng.integers(0, 100, size=50)
+    outputs = rng.integers(0, 100, size=50)
+    metric = MeanError()
+    bootstrap = Bootstrap(n_resamples=250, chunk_size=60, n_jobs=n_jobs, random_state=7)
+    # when
+    [interval] = bootstrap.intervals(
+        metrics=[metric],
+        targets=Targets({TargetsSchema.target: targets}),
+        outputs=Outputs({OutputsSchema.prediction: outputs}),
+    )
+    # then
+    expected = naive_intervals(bootstrap, metric, targets=targets, outputs=outputs)
+    assert interval == pytest.approx(expected), "Intervals should match the naive loop!"
+    assert interval[0] < interval[1], "Interval bounds should be ordered!"
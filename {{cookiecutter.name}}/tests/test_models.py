@@ -0,0 +1,55 @@
+# %% IMPORTS
+
+import typing as T
+
+import pandas as pd
+import pydantic as pdt
+
+from {{cookiecutter.package}}.models import Model, PredictionCache
+
+# %% MODELS
+
+
+class MeanModel(Model):
+    KIND: T.Literal["MeanModel"] = "MeanModel"
+
+    _mean: float = pdt.PrivateAttr(default=0.0)
+
+    @T.override
+    def fit(self, inputs: pd.DataFrame, targets: pd.DataFrame) -> "MeanModel":
+        self._mean = float(targets["target"].mean())
+        return self
+
+    @T.override
+    def predict(self, inputs: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame({"prediction": self._mean}, index=inputs.index)
+
+
+def test_fingerprint_changes_with_each_fit() -> None:
+    # given
+    model = MeanModel()
+    inputs = pd.DataFrame({"x": [1, 2]})
+    # when
+    unfitted = model.fingerprint()
+    first = model.fit(inputs, pd.DataFrame({"target": [1, 1]})).fingerprint()
+    second = model.fit(inputs, pd.DataFrame({"target": [2, 2]})).fingerprint()
+    # then
+    assert len({unfitted, first, second}) == 3, "Each fit should change the fingerprint!"
+    assert model.model_copy(deep=True).fingerprint() == second, "Copies share the fitted state!"
+
+
+def test_prediction_cache_predicts_once_per_fit_and_inputs() -> None:
+    # given
+    model = MeanModel()
+    cache = PredictionCache()
+    inputs = pd.DataFrame({"x": [1, 2]})
+    model.fit(inputs, pd.DataFrame({"target": [1, 1]}))
+    # when
+    first = cache.predict(model=model, inputs=inputs)
+    again = cache.predict(model=model, inputs=inputs)
+    model.fit(inputs, pd.DataFrame({"target": [3, 3]}))
+    refit = cache.predict(model=model, inputs=inputs)
+    # then
+    assert again is first, "Outputs should be reused for the same fit and inputs!"
+    assert refit["prediction"].tolist() == [3.0, 3.0], "Outputs should follow the new fit!"
+    assert (cache.hits, cache.misses) == (1, 2), "Cache should hit once and miss twice!"
@@ -0,0 +1,149 @@
+# %% IMPORTS
+
+import concurrent.futures as cf
+import os
+import pathlib
+import threading
+import time
+import typing as T
+
+import pytest
+
+from {{cookiecutter.package}}.registries import ChunkStore, CustomSaver
+from {{cookiecutter.package}}.registries._base import Loader
+from {{cookiecutter.package}}.registries import _base, _store
+
+# %% STORES
+
+
+def write(path: pathlib.Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+def test_chunk_store_round_trip_without_modifying_the_source(tmp_path: pathlib.Path) -> None:
+    # given
+    store = ChunkStore(path=str(tmp_path / "chunks"), chunk_size=1024, min_size=100)
+    model = tmp_path / "model"
+    large, small = os.urandom(5000), b"metadata" * 20
+    write(model / "data" / "model.pkl", large)
+    write(model / "MLmodel", small)
+    # when
+    manifest = store.put(directory=str(model))
+    with _store.download_model(uri=str(model)) as path:
+        rebuilt = (pathlib.Path(path) / "data" / "model.pkl").read_bytes()
+        rebuilt_small = (pathlib.Path(path) / "MLmodel").read_bytes()
+        has_manifest = (pathlib.Path(path) / _store.MANIFEST).exists()
+    # then
+    assert rebuilt == large and rebuilt_small == small, "Files should be reassembled!"
+    assert not has_manifest, "The reassembled model should be a regular model!"
+    assert not os.path.exists(path), "The reassembled model should be removed!"
+    assert (model / _store.MANIFEST).exists(), "The source should keep its manifest!"
+    assert (model / "MLmodel").exists(), "The model metadata should never be chunked!"
+    assert not (model / "data" / "model.pkl").exists(), "The source should stay chunked!"
+    assert manifest["stats"]["chunks"] == 5, "The large file should be chunked!"
+
+
+def test_chunk_store_writes_identical_chunks_once(tmp_path: pathlib.Path) -> None:
+    # given
+    store = ChunkStore(path=str(tmp_path / "chunks"), chunk_size=1024, min_size=0)
+    data = os.urandom(1024) * 4
+    write(tmp_path / "first" / "model.pkl", data)
+    write(tmp_path / "second" / "model.pkl", data)
+    # when
+    first = store.put(directory=str(tmp_path / "first"))
+    second = store.put(directory=str(tmp_path / "second"))
+    # then
+    assert first["stats"]["written"] == 1, "Identical chunks should be written once!"
+    assert second["stats"]["written"] == 0, "Stored chunks should not be written again!"
+    assert second["stats"]["bytes_written"] == 0, "No byte should be written again!"
+
+
+# %% CACHES
+
+
+class SlowLoader(Loader):
+    KIND: T.Literal["SlowLoader"] = "SlowLoader"
+
+    class Adapter(Loader.Adapter):
+        def predict(self, inputs: T.Any) -> T.Any:
+            return inputs
+
+    @T.override
+    def load(self, uri: str) -> "SlowLoader.Adapter":
+        LOADS.append(uri)
+        time.sleep(0.05)
+        return SlowLoader.Adapter()
+
+
+LOADS: list[str] = []
+
+
+@pytest.fixture
+def models() -> T.Generator[_base.ModelCache, None, None]:
+    cache, _base._MODELS = _base._MODELS, _base.ModelCache()
+    LOADS.clear()
+    yield _base._MODELS
+    _base._MODELS = cache
+
+
+def test_load_cached_loads_a_model_once(tmp_path: pathlib.Path, models: _base.ModelCache) -> None:
+    # given
+    loader = SlowLoader()
+    barrier = threading.Barrier(4)
+
+    def load() -> Loader.Adapter:
+        barrier.wait()
+        return loader.load_cached(uri=str(tmp_path))
+
+    # when
+    with cf.ThreadPoolExecutor(max_workers=4) as pool:
+        adapters = list(pool.map(lambda _: load(), range(4)))
+    # then
+    assert len(LOADS) == 1, "The model should be loaded once!"
+    assert all(adapter is adapters[0] for adapter in adapters), "The model should be shared!"
+    assert models.stats()["hits"] == 3, "The other threads should reuse the model!"
+
+
+def test_model_cache_evicts_the_least_recently_used(models: _base.ModelCache) -> None:
+    # given
+    adapters = {key: SlowLoader.Adapter() for key in "abc"}
+    # when
+    models.put(key="a", adapter=adapters["a"], memory=1.0)
+    models.put(key="b", adapter=adapters["b"], memory=1.0)
+    models.get(key="a")  # most recently used
+    models.put(key="c", adapter=adapters["c"], memory=1.0)
+    models.evict(size=2)
+    # then
+    assert list(models.adapters) == ["a", "c"], "The least recently used should be evicted!"
+    models.evict(size=2, memory=1.5)
+    assert list(models.adapters) == ["c"], "Models above the memory limit should be evicted!"
+
+
+def test_resolve_a_stage_without_versions(monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    class Client:
+        def get_latest_versions(self, name: str, stages: list[str]) -> list:
+            return []
+
+    monkeypatch.setattr(_base, "shared_client", Client)
+    # when, then
+    with pytest.raises(ValueError, match="No model version"):
+        _base.resolve(uri="models:/model/Production")
+
+
+# %% SAVERS
+
+
+def test_custom_saver_adapter_is_pickled_by_reference() -> None:
+    # given
+    cloudpickle = pytest.importorskip("cloudpickle")
+    pyfunc = pytest.importorskip("mlflow.pyfunc")
+    # when
+    adapter = CustomSaver.Adapter
+    payload = cloudpickle.dumps(adapter)
+    # then
+    assert adapter is CustomSaver.Adapter, "The adapter should be created once!"
+    assert issubclass(adapter, pyfunc.PythonModel), "The adapter should be a PythonModel!"
+    assert b"CustomSaver.Adapter" in payload, "The adapter should be pickled by reference!"
+    assert cloudpickle.loads(payload) is adapter, "The adapter should be unpickled as is!"
@@ -0,0 +1,92 @@
+# %% IMPORTS
+
+import json
+import os
+import pathlib
+import subprocess
+import sys
+
+import pytest
+
+from {{cookiecutter.package}} import scripts
+
+# %% HELPERS
+
+HEAVY = ["mlflow", "torch", "sklearn", "pandas", "pandera"]
+
+
+def run(code: str, **env: str) -> dict:
+    """Run python code in a fresh interpreter and return the JSON it prints last."""
+    process = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+# %% SCRIPTS
+
+
+def test_scripts_import_within_the_time_budget() -> None:
+    # given
+    code = f"""if True:
+        import json, sys, time
+        start = time.perf_counter()
+        from {scripts.__package__} import scripts
+        duration = time.perf_counter() - start
+        heavy = [name for name in {HEAVY!r} if name in sys.modules]
+        print(json.dumps(dict(duration=duration, heavy=heavy)))
+    """
+    # when
+    result = run(code)
+    # then
+    assert result["heavy"] == [], "The CLI should not import heavy modules on startup!"
+    assert result["duration"] < 1.0, "The CLI should start within the time budget!"
+
+
+def test_schema_is_cached_between_runs(tmp_path: pathlib.Path) -> None:
+    # given
+    code = f"""if True:
+        import contextlib, io, json, sys
+        from {scripts.__package__} import scripts
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            scripts.main(["--schema"])
+        heavy = [name for name in {HEAVY!r} if name in sys.modules]
+        print(json.dumps(dict(schema=json.loads(output.getvalue()), heavy=heavy)))
+    """
+    # when
+    first = run(code, XDG_CACHE_HOME=str(tmp_path))
+    second = run(code, XDG_CACHE_HOME=str(tmp_path))
+    # then
+    assert "pandas" in first["heavy"], "The first run should generate the schema!"
+    assert second["heavy"] == [], "The second run should read the schema from the cache!"
+    assert second["schema"] == first["schema"], "The cached schema should be the same!"
+
+
+def test_resume_forces_the_checkpoints(monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    from {{cookiecutter.package}}.jobs import TrainingJob
+
+    runs: list[TrainingJob] = []
+    monkeypatch.setattr(TrainingJob, "__enter__", lambda self: self)
+    monkeypatch.setattr(TrainingJob, "__exit__", lambda self, *_: False)
+    monkeypatch.setattr(TrainingJob, "run", lambda self: runs.append(self) or {})
+    config = "job: {KIND: TrainingJob, inputs: {KIND: ExampleReader, path: in.csv}, "
+    config += "targets: {KIND: ExampleReader, path: targets.csv}}"
+    # when
+    scripts.main(["--resume", "run-id", "-e", config])
+    # then
+    assert runs[0].checkpoint, "A resumed job should use its checkpoints!"
+    assert runs[0].run_config.run_id == "run-id", "A resumed job should reopen its run!"
+
+
+def test_resume_rejects_jobs_without_checkpoints() -> None:
+    # given
+    config = "job: {KIND: InferenceJob, inputs: {KIND: ExampleReader, path: in.csv}, "
+    config += "outputs: {KIND: ExampleWriter, path: out.csv}}"
+    # when, then
+    with pytest.raises(ValueError, match="no checkpoints"):
+        scripts.main(["--resume", "run-id", "-e", config])
@@ -0,0 +1,270 @@
+# %% IMPORTS
+
+import concurrent.futures as cf
+import math
+import pathlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from {{cookiecutter.package}}.metrics import ExampleMetric
+from {{cookiecutter.package}}.models import ExampleModel
+from {{cookiecutter.package}}.searchers import GridSearcher, HalvingSearcher, TPESearcher
+from {{cookiecutter.package}}.searchers._base import Journal, Pool, Pruner, Task
+from {{cookiecutter.package}}.searchers._queue import QueueExecutor, TrialQueue
+
+# %% POOLS
+
+
+def test_pool_wait_counts_pruned_futures_as_done() -> None:
+    # given
+    pruned: cf.Future = cf.Future()
+    pruned.cancel()  # cancelled by the pruner, never notified by an executor
+    running: cf.Future = cf.Future()
+    running.set_running_or_notify_cancel()
+    threading.Timer(0.05, running.set_result, args=({"candidate": 0},)).start()
+    # when
+    done, pending = Pool.wait([pruned, running], poll=0.01)
+    # then
+    assert done == {pruned, running}, "All the futures should be done!"
+    assert not pending, "No future should be pending!"
+    assert Pool.collect(done) == [{"candidate": 0}], "Only the completed trial should be kept!"
+
+
+def test_pool_wait_first_completed_returns_early() -> None:
+    # given
+    pruned: cf.Future = cf.Future()
+    pruned.cancel()
+    running: cf.Future = cf.Future()
+    # when
+    done, pending = Pool.wait([pruned, running], return_when=cf.FIRST_COMPLETED, poll=0.01)
+    # then
+    assert done == {pruned}, "The pruned future should be done!"
+    assert pending == {running}, "The running future should be pending!"
+
+
+def test_pool_prunes_the_trials_of_a_chain() -> None:
+    # given
+    class PendingExecutor(cf.Executor):
+        def submit(self, fn: object, /, *args: object, **kwargs: object) -> cf.Future:
+            self.batch: cf.Future = cf.Future()  # never started
+            return self.batch
+
+    executor = PendingExecutor()
+    pruner = Pruner(min_candidates=1, min_folds=1)
+    pool = Pool(executor=executor, workers=1, metric=ExampleMetric(), fingerprint="", pruner=pruner)
+    chain = tuple(Task(candidate=index, params={"n": index}, split=1) for index in (1, 2))
+    links = pool.submit_chain(chain)
+    # when
+    for candidate, score in [(0, 1.0), (1, 9.0), (2, 9.0)]:  # worse than candidate 0
+        trial: cf.Future = cf.Future()
+        trial.set_result(dict(test_score=score, fit_time=0.0, score_time=0.0))
+        pool.complete(task=Task(candidate=candidate, params={}, split=0), future=trial)
+    # then
+    assert pool.pruned == {1, 2}, "The worse candidates should be pruned!"
+    assert all(link.cancelled() for link in links), "The trials of the chain should be pruned!"
+    assert executor.batch.cancelled(), "The chain should be cancelled before it starts!"
+
+
+# %% SEARCHERS
+
+
+def test_grid_searcher_reports_the_other_metrics() -> None:
+    # given
+    inputs = pd.DataFrame({"x": range(30)})
+    targets = pd.DataFrame({"target": range(30)})
+    metric = ExampleMetric(name="main")
+    searcher = GridSearcher(
+        param_grid={"params": [1, 2]}, n_jobs=2, metrics=[ExampleMetric(name="other")]
+    )
+    # when
+    results, best_score, _ = searcher.search(
+        model=ExampleModel(), metric=metric, inputs=inputs, targets=targets, cv=3
+    )
+    # then
+    assert len(results) == 2, "Each candidate should have a result!"
+    assert results["mean_test_other"].tolist() == [50.0, 50.0], "Other metric should be kept!"
+    assert best_score == 50.0, "Best score should come from the main metric!"
+
+
+def test_halving_searcher_grows_the_resources_of_the_survivors() -> None:
+    # given
+    inputs = pd.DataFrame({"x": range(90)})
+    targets = pd.DataFrame({"target": range(90)})
+    searcher = HalvingSearcher(param_grid={"params": [1, 2, 3]}, n_jobs=2, min_resources=20)
+    # when
+    results, _, best_params = searcher.search(
+        model=ExampleModel(), metric=ExampleMetric(), inputs=inputs, targets=targets, cv=3
+    )
+    # then
+    assert results["n_resources"].tolist() == [20, 20, 20, 60], "Resources should grow!"
+    assert best_params in searcher.candidates(), "Best params should be a candidate!"
+
+
+def test_searcher_results_without_trials() -> None:
+    # given
+    searcher = GridSearcher(param_grid={"params": [1]})
+    # when
+    results, best_score, best_params = searcher.results(metric=ExampleMetric(), trials=[])
+    # then
+    assert results.empty, "Results should be empty!"
+    assert math.isnan(best_score), "Best score should be NaN!"
+    assert best_params == {}, "Best params should be empty!"
+    assert HalvingSearcher(param_grid={}).promote(metric=ExampleMetric(), trials=[]) == []
+
+
+def test_tpe_searcher_with_duplicate_grid_values() -> None:
+    # given
+    inputs = pd.DataFrame({"x": range(30)})
+    targets = pd.DataFrame({"target": range(30)})
+    searcher = TPESearcher(param_grid={"params": [1, 1, 2]}, n_jobs=2, n_startup_trials=1)
+    # when
+    results, _, _ = searcher.search(
+        model=ExampleModel(), metric=ExampleMetric(), inputs=inputs, targets=targets, cv=3
+    )
+    # then
+    assert sorted(results["param_params"]) == [1, 2], "Each unique value should be tried once!"
+
+
+def test_tpe_searcher_proposes_without_expanding_the_grid() -> None:
+    # given
+    grid = {f"param{i}": list(range(10)) for i in range(10)}  # 10**10 combinations
+    searcher = TPESearcher(param_grid=grid, n_startup_trials=5)
+    rng = np.random.default_rng(0)
+    proposed: set[tuple[int, ...]] = set()
+    observations = []
+    # when
+    for i in range(20):
+        key, params = searcher.propose(
+            metric=ExampleMetric(), observations=observations, proposed=proposed, rng=rng
+        )
+        proposed.add(key)
+        observations.append((params, float(i)))
+    # then
+    assert len(proposed) == 20, "Each proposal should be new!"
+    assert all(params[key] in grid[key] for key in grid), "Proposals should be in the grid!"
+
+
+def test_tpe_searcher_exhausts_a_small_grid() -> None:
+    # given
+    searcher = TPESearcher(param_grid={"a": [1, 2], "b": [3, 4]}, n_startup_trials=10)
+    rng = np.random.default_rng(0)
+    proposed: set[tuple[int, ...]] = set()
+    # when
+    for _ in range(4):
+        key, _ = searcher.propose(
+            metric=ExampleMetric(), observations=[], proposed=proposed, rng=rng
+        )
+        proposed.add(key)
+    # then
+    assert proposed == {(0, 0), (0, 1), (1, 0), (1, 1)}, "All combinations should be proposed!"
+
+
+# %% JOURNALS
+
+
+def test_journal_drops_the_partial_line_of_a_crash(tmp_path: pathlib.Path) -> None:
+    # given
+    path = str(tmp_path / "trials.jsonl")
+    Journal(path=path).append(key="a", trial={"score": 1.0})
+    with open(path, "a") as writer:
+        writer.write('{"key": "b", "tri')  # partial line of a crash
+    # when
+    Journal(path=path).append(key="c", trial={"score": 3.0})
+    journal = Journal(path=path)
+    # then
+    assert list(journal.trials) == ["a", "c"], "The trials after a crash should be kept!"
+
+
+def test_grid_searcher_resumes_from_its_journal(tmp_path: pathlib.Path) -> None:
+    # given
+    inputs = pd.DataFrame({"x": range(30)})
+    targets = pd.DataFrame({"target": range(30)})
+    journal = tmp_path / "trials.jsonl"
+    searcher = GridSearcher(param_grid={"params": [1, 2]}, n_jobs=2, journal=str(journal))
+    first, _, _ = searcher.search(
+        model=ExampleModel(), metric=ExampleMetric(), inputs=inputs, targets=targets, cv=3
+    )
+    lines = journal.read_text().splitlines()
+    # when
+    second, _, _ = searcher.search(
+        model=ExampleModel(), metric=ExampleMetric(), inputs=inputs, targets=targets, cv=3
+    )
+    # then
+    assert len(lines) == 6, "Each trial (2 candidates x 3 folds) should be journaled!"
+    assert len(journal.read_text().splitlines()) == 6, "The journaled trials should be reused!"
+    pd.testing.assert_frame_equal(first, second, obj="Resumed results should be the same!")
+
+
+# %% QUEUES
+
+
+def test_grid_searcher_with_two_queue_workers(tmp_path: pathlib.Path) -> None:
+    # given
+    path = str(tmp_path / "queue.db")
+    inputs = pd.DataFrame({"x": range(30)})
+    targets = pd.DataFrame({"target": range(30)})
+    searcher = GridSearcher(param_grid={"params": [1, 2]}, n_jobs=2, queue=path, queue_lease=5.0)
+    # when
+    results, _, _ = searcher.search(
+        model=ExampleModel(), metric=ExampleMetric(), inputs=inputs, targets=targets, cv=3
+    )
+    # then
+    assert len(results) == 2, "Each candidate should have a result!"
+    with TrialQueue(path=path).connect() as connection:
+        statuses = connection.execute("SELECT DISTINCT status FROM trials").fetchall()
+        workers = connection.execute("SELECT COUNT(DISTINCT worker) FROM trials").fetchone()
+        studies = connection.execute("SELECT status FROM studies").fetchall()
+    assert statuses == [("collected",)], "All the trials should be collected!"
+    assert workers[0] >= 1, "The trials should be run by the queue workers!"
+    assert studies == [("closed",)], "The study should be closed!"
+    assert not list(tmp_path.glob("*.pkl")), "The state file should be removed on close!"
+
+
+def test_trial_queue_skips_the_studies_of_a_dead_coordinator(tmp_path: pathlib.Path) -> None:
+    # given
+    queue = TrialQueue(path=str(tmp_path / "queue.db"), lease=0.1)
+    study = queue.open(state=b"")
+    queue.enqueue(study=study, payload=b"")
+    # when
+    time.sleep(0.2)  # no heartbeat from the coordinator
+    expired = queue.claim(worker="worker")
+    queue.beat(study=study)
+    renewed = queue.claim(worker="worker")
+    # then
+    assert expired is None, "The trials of an expired study should not be claimed!"
+    assert renewed is not None, "The trials of a live study should be claimed!"
+
+
+def test_queue_executor_fails_the_trials_without_live_worker(tmp_path: pathlib.Path) -> None:
+    # given
+    executor = QueueExecutor(path=str(tmp_path / "queue.db"), lease=0.2, poll=0.05)
+    # when
+    future = executor.submit(pow, 2, 3)  # no local or remote worker to run it
+    executor.shutdown(wait=True)
+    # then
+    assert isinstance(future.exception(timeout=0), TimeoutError), "The trial should time out!"
+
+
+def test_queue_executor_fails_the_trials_on_database_errors(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # given
+    executor = QueueExecutor(path=str(tmp_path / "queue.db"), poll=0.05)
+    future = executor.submit(pow, 2, 3)
+    error = sqlite3.OperationalError("disk I/O error")
+
+    def collect(study: str) -> list:
+        raise error
+
+    # when
+    monkeypatch.setattr(executor.queue, "collect", collect)
+    # then
+    assert future.exception(timeout=5) is error, "The trial should fail with the database error!"
+    with pytest.raises(RuntimeError):
+        executor.submit(pow, 2, 3)
+    executor.shutdown(wait=True)
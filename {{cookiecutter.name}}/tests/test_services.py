@@ -0,0 +1,99 @@
+# %% IMPORTS
+
+import os
+import typing as T
+
+import pytest
+
+from {{cookiecutter.package}}.services import MlflowService
+from {{cookiecutter.package}}.services import mlflow_services
+
+# %% CLIENTS
+
+
+class FakeClient:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.batches: list[dict[str, list[T.Any]]] = []
+
+    def log_batch(self, run_id: str, metrics: list, params: list, tags: list) -> None:
+        if self.error is not None:
+            raise self.error
+        self.batches.append({"metrics": metrics, "params": params, "tags": tags})
+
+
+# %% QUEUES
+
+
+def test_log_queue_batches_within_the_limits() -> None:
+    # given
+    client = FakeClient()
+    log_queue = mlflow_services.LogQueue(client=T.cast(T.Any, client))
+    # when
+    log_queue.log_params("run", {f"param{i}": i for i in range(150)})
+    log_queue.set_tags("run", {f"tag{i}": i for i in range(50)})
+    log_queue.log_metrics("run", {f"metric{i}": i for i in range(2500)})
+    flushed = log_queue.flush(timeout=10)
+    log_queue.check()
+    # then
+    sizes = [sum(len(entities) for entities in batch.values()) for batch in client.batches]
+    assert flushed, "The queue should be flushed!"
+    assert max(sizes) <= 1000, "Each batch should have at most 1000 entities!"
+    assert sum(sizes) == 2700, "All the entities should be sent!"
+    assert all(len(batch["params"]) <= 100 for batch in client.batches), "Params limit!"
+    assert log_queue.stats()["entries"] == 2700, "All the entries should be counted!"
+
+
+def test_log_queue_raises_the_errors_of_the_thread() -> None:
+    # given
+    log_queue = mlflow_services.LogQueue(client=T.cast(T.Any, FakeClient(ValueError("down"))))
+    # when
+    log_queue.log_metrics("run", {"metric": 1.0})
+    log_queue.flush(timeout=10)
+    # then
+    with pytest.raises(ValueError, match="down"):
+        log_queue.check()
+    log_queue.check()  # the error is raised once
+    assert log_queue.stats()["errors"] == 1, "The error should be counted!"
+
+
+def test_mlflow_service_flush_raises_the_errors() -> None:
+    # given
+    service = MlflowService(tracking_uri="fake://tracking", registry_uri="fake://registry")
+    key = (service.tracking_uri, service.registry_uri)
+    log_queue = mlflow_services.LogQueue(client=T.cast(T.Any, FakeClient(ValueError("down"))))
+    mlflow_services._QUEUES[key] = log_queue
+    try:
+        # when
+        log_queue.log_metrics("run", {"metric": 1.0})
+        # then
+        with pytest.raises(ValueError, match="down"):
+            service.stop()
+    finally:
+        del mlflow_services._QUEUES[key]
+
+
+# %% HTTP
+
+
+def test_mlflow_services_share_the_http_settings_of_the_process(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # given
+    for name in ["MAX_RETRIES", "BACKOFF_FACTOR", "BACKOFF_JITTER", "TIMEOUT"]:
+        monkeypatch.delenv(f"MLFLOW_HTTP_REQUEST_{name}", raising=False)  # restored after
+    monkeypatch.setattr(mlflow_services, "_HTTP", {})
+    monkeypatch.setattr(mlflow_services, "_HTTP_SERVICES", set())
+    first = {"MLFLOW_HTTP_REQUEST_TIMEOUT": "10"}
+    second = {"MLFLOW_HTTP_REQUEST_TIMEOUT": "20"}
+    # when
+    mlflow_services._acquire_http(service=1, settings=first)
+    mlflow_services._acquire_http(service=2, settings=first)
+    with pytest.raises(ValueError, match="HTTP settings"):
+        mlflow_services._acquire_http(service=3, settings=second)
+    mlflow_services._release_http(service=1)
+    mlflow_services._release_http(service=2)
+    mlflow_services._acquire_http(service=3, settings=second)
+    # then
+    assert mlflow_services._HTTP == second, "The settings should change once released!"
+    assert os.environ["MLFLOW_HTTP_REQUEST_TIMEOUT"] == "20", "The settings should be applied!"